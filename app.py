@@ -21,20 +21,32 @@ Version: 2.0.0 (LLM-Powered)
 # IMPORTS
 # =============================================================================
 import streamlit as st
-import plotly.graph_objects as go
-import PyPDF2
-import re
 import io
 import os
-import json
-from typing import Tuple, List, Dict, Optional
+import re
+import time
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+
+from smartmatch.batch import (
+    DEFAULT_MAX_CONCURRENCY, BatchStats, ResumeFile, count_resume_files, iter_resume_files, rank_results,
+    screen_resumes
+)
+from smartmatch.core import (
+    CASCADE_BAND, analyze_resume_cascade, analyze_resume_with_llm, check_resume_quality,
+    stream_resume_analysis
+)
+from smartmatch.dedup import analyze_with_dedup
+from smartmatch.history import DEFAULT_PAGE_SIZE, HistoryFilter, content_hash, get_history_store
+from smartmatch.jd_profile import get_jd_profile
+from smartmatch.multi_jd import DEFAULT_TOP_K, match_resume_to_jds, split_job_descriptions
+from smartmatch.ocr import OCR_PARTIAL_WARNING, extract_text_with_ocr, get_ocr_pool, ocr_available
+from smartmatch.prescore import DEFAULT_PRESCORE_THRESHOLD
+from smartmatch.revisions import analyze_resume_revision
+from smartmatch.scheduler import PRIORITY_BATCH
+from smartmatch.telemetry import ROLLING_WINDOW, get_telemetry
 
-# Groq API for Llama 3 access
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # =============================================================================
 # GROQ API KEY (Hardcoded)
@@ -55,7 +67,7 @@ st.set_page_config(
 # =============================================================================
 # CUSTOM CSS STYLING
 # =============================================================================
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* ===== Global Styles ===== */
     .stApp {
@@ -222,278 +234,48 @@ st.markdown("""
         margin-left: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
-
+"""
 
-# =============================================================================
-# LLM SYSTEM PROMPT
-# =============================================================================
-SYSTEM_PROMPT = """You are an expert ATS (Applicant Tracking System) and a strict technical recruiter with 15+ years of experience.
-Your task is to evaluate how well a candidate's resume matches a specific job description.
-
-EVALUATION CRITERIA (in order of importance):
-
-1. HARD SKILLS (60% weight):
-   - Penalize heavily for missing required technical skills (programming languages, frameworks, tools, certifications)
-   - Each missing critical skill: -8 to -12 points
-   - Recognize synonyms and abbreviations: "ML" = "Machine Learning", "JS" = "JavaScript", "K8s" = "Kubernetes"
-   
-2. EXPERIENCE (25% weight):
-   - Years of relevant experience in the field
-   - Seniority level match (Junior/Mid/Senior)
-   - Industry alignment (e.g., fintech for fintech role)
-   
-3. SOFT SKILLS & EDUCATION (15% weight):
-   - Leadership, communication, teamwork evidence
-   - Relevant certifications or degrees
-
-SCORING GUIDELINES:
-- 85-100: Excellent match - Strong candidate, interview immediately
-- 70-84: Good match - Solid candidate, worth interviewing  
-- 50-69: Partial match - Some gaps but could be considered
-- 30-49: Weak match - Significant skill gaps
-- 0-29: Poor match - Not suitable for this role
-
-You MUST respond with ONLY a valid JSON object, no markdown, no explanation, no code blocks:
-{
-  "match_percentage": <integer 0-100>,
-  "missing_keywords": [<list of 3-8 critical missing skills/technologies>],
-  "profile_summary": "<2-3 sentence professional assessment of the candidate's fit for this specific role>"
-}"""
 
+@st.cache_resource
+def _minified_css() -> str:
+    """CUSTOM_CSS without comments and indentation, built once per server process."""
+    css = re.sub(r"/\*.*?\*/", "", CUSTOM_CSS, flags=re.DOTALL)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return re.sub(r"\s+", " ", css).strip()
 
-# =============================================================================
-# CORE FUNCTIONS
-# =============================================================================
 
-def get_groq_client(api_key: str) -> Optional[Groq]:
+def inject_styles() -> None:
     """
-    Initialize and return Groq client with provided API key.
-    
-    Args:
-        api_key: The Groq API key
+    Send the custom CSS.
     
-    Returns:
-        Groq client or None if not available
+    Streamlit drops every element a rerun does not emit again, so the style
+    block is sent on each run; it is minified once and is a single element.
     """
-    if not GROQ_AVAILABLE:
-        return None
-    
-    if not api_key or not api_key.strip():
-        return None
-    
-    try:
-        return Groq(api_key=api_key.strip())
-    except Exception:
-        return None
+    st.markdown(_minified_css(), unsafe_allow_html=True)
 
 
-def extract_text_from_pdf(pdf_file) -> Tuple[Optional[str], Optional[str]]:
-    """
-    Extract text content from an uploaded PDF file.
-    
-    Args:
-        pdf_file: Streamlit UploadedFile object containing the PDF
-        
-    Returns:
-        Tuple of (extracted_text, error_message)
-    """
-    try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file.read()))
-        
-        if pdf_reader.is_encrypted:
-            return None, "❌ This PDF is password-protected. Please upload an unencrypted resume."
-        
-        text_content = []
-        for page in pdf_reader.pages:
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
-            except Exception:
-                continue
-        
-        if not text_content:
-            return None, "❌ Could not extract text from this PDF. It might be a scanned image."
-        
-        return " ".join(text_content), None
-        
-    except PyPDF2.errors.PdfReadError:
-        return None, "❌ Invalid or corrupted PDF file. Please check the file and try again."
-    except Exception as e:
-        return None, f"❌ An unexpected error occurred: {str(e)}"
+inject_styles()
 
 
-def analyze_resume_with_llm(resume_text: str, jd_text: str, api_key: str) -> Dict:
-    """
-    Use Llama 3 via Groq to semantically analyze resume against job description.
-    
-    This function sends both texts to the LLM which performs deep semantic analysis,
-    understanding synonyms, context, and relevance - far superior to keyword matching.
-    
-    Args:
-        resume_text: Extracted text from the candidate's resume
-        jd_text: The job description text
-        api_key: The Groq API key
-        
-    Returns:
-        dict with keys: match_percentage, missing_keywords, profile_summary, error
-    """
-    # Default fallback response
-    fallback = {
-        "match_percentage": 0,
-        "missing_keywords": [],
-        "profile_summary": "Unable to analyze. Please check your API key and try again.",
-        "error": None
-    }
-    
-    # Check for Groq availability
-    client = get_groq_client(api_key)
-    if not client:
-        if not GROQ_AVAILABLE:
-            fallback["error"] = "Groq library not installed. Run: pip install groq"
-        else:
-            fallback["error"] = "Please enter your Groq API key in the sidebar."
-        return fallback
-    
-    # Construct the user prompt
-    user_prompt = f"""Analyze this resume against the job description.
-
-=== JOB DESCRIPTION ===
-{jd_text[:4000]}
-
-=== RESUME ===
-{resume_text[:6000]}
-
-Respond with ONLY the JSON object, nothing else."""
-
-    try:
-        # Call Llama 3 via Groq
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.3,  # Lower temperature for consistent, analytical responses
-            max_tokens=500,
-            timeout=30.0
-        )
-        
-        # Extract the response
-        response_text = chat_completion.choices[0].message.content.strip()
-        
-        # Clean up potential markdown code blocks
-        if response_text.startswith("```"):
-            response_text = re.sub(r'^```(?:json)?\s*', '', response_text)
-            response_text = re.sub(r'\s*```$', '', response_text)
-        
-        # Parse JSON response
-        result = json.loads(response_text)
-        
-        # Validate required fields
-        if "match_percentage" not in result:
-            result["match_percentage"] = 50
-        if "missing_keywords" not in result:
-            result["missing_keywords"] = []
-        if "profile_summary" not in result:
-            result["profile_summary"] = "Analysis completed."
-        
-        # Ensure types are correct
-        result["match_percentage"] = int(min(100, max(0, result["match_percentage"])))
-        result["missing_keywords"] = list(result["missing_keywords"])[:10]
-        result["profile_summary"] = str(result["profile_summary"])[:500]
-        result["error"] = None
-        
-        return result
-        
-    except json.JSONDecodeError as e:
-        fallback["error"] = f"LLM returned invalid JSON. Please try again."
-        return fallback
-    except Exception as e:
-        error_msg = str(e)
-        if "rate_limit" in error_msg.lower():
-            fallback["error"] = "Rate limit reached. Please wait a moment and try again."
-        elif "timeout" in error_msg.lower():
-            fallback["error"] = "Request timed out. The service might be busy."
-        else:
-            fallback["error"] = f"API error: {error_msg[:100]}"
-        return fallback
-
-
-def check_resume_quality(resume_text: str) -> Dict[str, dict]:
-    """
-    Perform resume hygiene and quality checks.
-    
-    Args:
-        resume_text: The extracted resume text
-        
-    Returns:
-        Dictionary with quality check results
-    """
-    results = {}
-    
-    # Word Count Analysis
-    word_count = len(resume_text.split())
-    if word_count < 150:
-        results['word_count'] = {
-            'status': 'fail',
-            'message': f'Too brief ({word_count} words). Aim for 300-800 words.',
-            'value': word_count
-        }
-    elif word_count > 1500:
-        results['word_count'] = {
-            'status': 'warning',
-            'message': f'Lengthy ({word_count} words). Consider condensing.',
-            'value': word_count
-        }
-    else:
-        results['word_count'] = {
-            'status': 'pass',
-            'message': f'Good length ({word_count} words).',
-            'value': word_count
-        }
-    
-    # Email Detection
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails_found = re.findall(email_pattern, resume_text)
-    results['email'] = {
-        'status': 'pass' if emails_found else 'fail',
-        'message': f'Email: {emails_found[0]}' if emails_found else 'No email found.',
-        'value': emails_found[0] if emails_found else None
-    }
-    
-    # Phone Detection
-    phone_pattern = r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[0-9]{3,4}[-\s\.]?[0-9]{4,6}'
-    phones_found = re.findall(phone_pattern, resume_text)
-    results['phone'] = {
-        'status': 'pass' if phones_found else 'warning',
-        'message': 'Phone detected.' if phones_found else 'No phone detected.',
-        'value': phones_found[0] if phones_found else None
-    }
-    
-    # Key Sections Detection
-    sections = ['experience', 'education', 'skills', 'projects', 'summary']
-    found_sections = [s for s in sections if s in resume_text.lower()]
-    results['sections'] = {
-        'status': 'pass' if len(found_sections) >= 3 else 'warning',
-        'message': f'Sections: {", ".join(found_sections).title()}' if found_sections else 'Add clear section headers.',
-        'value': found_sections
-    }
-    
-    return results
-
+# =============================================================================
+# VISUALIZATION
+# =============================================================================
 
-def create_gauge_chart(score: float) -> go.Figure:
+def create_gauge_chart(score: float) -> "go.Figure":
     """
     Create an interactive Plotly gauge chart for the match score.
     
+    Plotly is imported here, on the first result, not at app startup.
+    
     Args:
         score: Match score percentage (0-100)
         
     Returns:
         Plotly Figure object
     """
+    import plotly.graph_objects as go
+    
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
         value=score,
@@ -535,6 +317,420 @@ def create_gauge_chart(score: float) -> go.Figure:
     return fig
 
 
+# =============================================================================
+# RESULT RENDERING
+# =============================================================================
+
+def render_match_score(placeholder, score: int, cached: bool = False) -> None:
+    """
+    Render the match score gauge and its interpretation into a placeholder.
+    
+    Args:
+        placeholder: st.empty() slot to fill
+        score: Match score percentage (0-100)
+        cached: Whether the result was served from the cache
+    """
+    with placeholder.container():
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        gauge_chart = create_gauge_chart(score)
+        st.plotly_chart(gauge_chart, use_container_width=True)
+        
+        # Score interpretation
+        if score >= 70:
+            st.success("🌟 Excellent Match! Strong candidate for this position.")
+        elif score >= 50:
+            st.warning("📊 Partial Match. Some skill gaps to address.")
+        else:
+            st.error("⚡ Low Match. Significant improvements needed.")
+        if cached:
+            st.caption("⚡ Served from cache - no API call was made for this resume/JD pair.")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_profile_summary(placeholder, summary: str, streaming: bool = False) -> None:
+    """
+    Render the AI assessment card into a placeholder.
+    
+    Args:
+        placeholder: st.empty() slot to fill
+        summary: Profile summary text (possibly still streaming)
+        streaming: Append a cursor to show that more text is coming
+    """
+    cursor = " ▌" if streaming else ""
+    with placeholder.container():
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown('<div class="card-title">📝 AI Assessment</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="summary-box">{summary}{cursor}</div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_missing_keywords(placeholder, keywords: List[str], streaming: bool = False) -> None:
+    """
+    Render the missing-skills badges into a placeholder.
+    
+    Args:
+        placeholder: st.empty() slot to fill
+        keywords: Missing skills parsed so far
+        streaming: Whether more keywords may still arrive
+    """
+    with placeholder.container():
+        if keywords or streaming:
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown('<div class="card-title">🔴 Missing Skills (High Priority)</div>', unsafe_allow_html=True)
+            st.markdown('<p style="color: #a0a0c0; margin-bottom: 1rem;">These skills appear in the job description but are missing from your resume:</p>', unsafe_allow_html=True)
+            
+            badges_html = '<div class="badge-container">'
+            for keyword in keywords:
+                badges_html += f'<span class="badge-missing">{keyword}</span>'
+            badges_html += '</div>'
+            st.markdown(badges_html, unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown('<div class="card-title">✅ Excellent Skill Coverage</div>', unsafe_allow_html=True)
+            st.markdown('<p style="color: #51cf66;">No critical skills are missing from your resume!</p>', unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_performance_panel() -> None:
+    """Show rolling p50/p95 latency per pipeline stage (see smartmatch.telemetry)."""
+    snapshot = get_telemetry().snapshot()
+    if not snapshot:
+        st.caption("No analyses recorded yet in this server process.")
+        return
+    st.dataframe(
+        [
+            {
+                "Stage": stage,
+                "Count": stats["count"],
+                "p50 ms": stats["p50_ms"],
+                "p95 ms": stats["p95_ms"],
+                "Errors": stats["errors"]
+            }
+            for stage, stats in snapshot.items()
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption(f"Rolling window of the last {ROLLING_WINDOW} samples per stage; refreshed on every rerun.")
+    counters = get_telemetry().counters()
+    if counters.get("llm_answers"):
+        st.caption(
+            f"Answer retries: {counters.get('llm_answer_retries', 0) / counters['llm_answers']:.1%} · "
+            f"repaired: {counters.get('llm_answer_repairs', 0)} · "
+            f"failed after retry: {counters.get('llm_answer_failures', 0)}"
+        )
+
+
+# =============================================================================
+# BATCH SCREENING
+# =============================================================================
+
+def run_batch_screening(job_description: str, uploaded_files: list,
+                        max_concurrency: int, tokens_per_minute: int,
+                        prescore_threshold: float, use_jd_profile: bool = False,
+                        use_cascade: bool = False, reuse_duplicates: bool = True) -> None:
+    """
+    Screen many resumes against one job description and stream a ranked table.
+    
+    Args:
+        job_description: The job description text
+        uploaded_files: Streamlit UploadedFile objects (PDFs and/or ZIP archives)
+        max_concurrency: Maximum number of concurrent LLM calls
+        tokens_per_minute: Token budget shared by all concurrent calls (0 = unlimited)
+        prescore_threshold: Skip the LLM for resumes with a lower local pre-score (0 = never)
+        use_jd_profile: Send the compact JD profile instead of the JD with every
+            resume (the packed JD is still sent if the profile is incomplete)
+        use_cascade: Score with the fast model first and escalate borderline scores
+        reuse_duplicates: Serve resumes already analyzed for this JD (or near
+            copies whose edits miss the JD's terms) from the duplicate index
+            instead of the LLM
+    """
+    # Counted from the ZIP directories; documents are then read one at a time
+    total = count_resume_files(uploaded_files)
+    if not total:
+        st.error("⚠️ No PDF resumes found in the uploaded files.")
+        return
+    resumes = iter_resume_files(uploaded_files)
+    
+    def extract(resume: ResumeFile):
+        # Scanned PDFs wait for an OCR slot on this worker thread, not the script thread
+        return extract_text_with_ocr(resume.data, block=True)
+    
+    def analyze_new(resume_text: str, jd_text: str) -> Dict:
+        if use_cascade:
+            return analyze_resume_cascade(resume_text, jd_text, GROQ_API_KEY,
+                                          priority=PRIORITY_BATCH,
+                                          use_jd_profile=use_jd_profile)
+        return analyze_resume_with_llm(resume_text, jd_text, GROQ_API_KEY,
+                                       priority=PRIORITY_BATCH,
+                                       use_jd_profile=use_jd_profile)
+    
+    def analyze(resume_text: str, jd_text: str) -> Dict:
+        # Duplicates are always flagged; reused only if enabled
+        return analyze_with_dedup(resume_text, jd_text, analyze_new, reuse=reuse_duplicates)
+    
+    st.markdown("---")
+    st.markdown('<div class="card-title">📊 Batch Screening Results</div>', unsafe_allow_html=True)
+    if use_jd_profile:
+        # Extracted once here; every worker then reads it from the cache
+        jd_profile = get_jd_profile(job_description)
+        if jd_profile.complete:
+            with st.expander("Job profile sent with each resume"):
+                st.text(jd_profile.to_prompt())
+        else:
+            st.info("ℹ️ No clear job title or must-have list was found in this job description, "
+                    "so the full description is sent with each resume instead of a compact profile.")
+    progress = st.progress(0.0, text=f"Screening {total} resumes...")
+    metrics_placeholder = st.empty()
+    table_placeholder = st.empty()
+    
+    stats = BatchStats()
+    rows = []
+    for row in screen_resumes(resumes, job_description, extract, analyze,
+                              max_concurrency=max_concurrency,
+                              tokens_per_minute=tokens_per_minute or None,
+                              prescore_threshold=prescore_threshold,
+                              stats=stats):
+        rows.append(row)
+        progress.progress(
+            min(1.0, len(rows) / total),
+            text=f"Screened {len(rows)} of {total} resumes"
+        )
+        
+        with metrics_placeholder.container():
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Completed", f"{stats.completed}/{total}")
+            col2.metric("Failed", stats.failed)
+            if use_cascade:
+                col3.metric("Escalated to 70B", stats.escalated)
+            else:
+                col3.metric("Pre-screened", stats.prescreened)
+            col4.metric("Throughput", f"{stats.resumes_per_minute:.1f} resumes/min")
+            ocr_load = get_ocr_pool().stats() if ocr_available() else None
+            if ocr_load and (ocr_load["running"] or ocr_load["queued"]):
+                st.caption(f"🔍 OCR of scanned resumes: {ocr_load['running']} running, "
+                           f"{ocr_load['queued']} queued")
+        
+        table_placeholder.dataframe(
+            [
+                {
+                    "Candidate": r["candidate"],
+                    "Match %": r["match_percentage"],
+                    "Missing Skills": ", ".join(r["missing_keywords"]),
+                    "Summary": r["profile_summary"] or r["error"],
+                    "Source": (
+                        "Pre-screen" if r["prescreened"] else
+                        "Duplicate" if r["cached"] and r["duplicate_of"] else
+                        "Cache" if r["cached"] else "AI"
+                    ),
+                    "Tier": r["tier"] or "-",
+                    "Duplicate of": r["duplicate_of"] or "-",
+                    "Seconds": r["seconds"]
+                }
+                for r in rank_results(rows)
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    progress.empty()
+    saved = get_history_store().record_many(job_description, rows)
+    st.success(
+        f"✅ Screened {stats.completed} resumes in {stats.elapsed:.1f}s "
+        f"({stats.resumes_per_minute:.1f} resumes/min); {saved} saved to history."
+    )
+
+
+def extract_resume_text(uploaded_file) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract an uploaded resume, OCR'ing scanned PDFs in the background.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile holding the resume PDF
+        
+    Returns:
+        Tuple of (resume_text, error_message)
+    """
+    progress = None
+    partial_job = None
+    
+    def show_ocr_progress(job) -> None:
+        nonlocal progress, partial_job
+        if job.state == "done":
+            partial_job = job if job.partial else None
+            return
+        if progress is None:
+            progress = st.progress(0.0)
+        if job.state == "queued" or not job.page_count:
+            label = "🔍 Scanned resume: waiting for OCR..."
+        else:
+            label = f"🔍 Scanned resume: reading page {min(job.pages_done + 1, job.page_count)} of {job.page_count}..."
+        progress.progress(job.progress, text=label)
+    
+    with st.spinner("📄 Reading your resume..."):
+        resume_text, error = extract_text_with_ocr(uploaded_file, on_progress=show_ocr_progress)
+    if progress is not None:
+        progress.empty()
+    if partial_job is not None:
+        st.warning(OCR_PARTIAL_WARNING.format(pages_done=partial_job.pages_done,
+                                              page_count=partial_job.page_count))
+    return resume_text, error
+
+
+# =============================================================================
+# JOB MATCHING
+# =============================================================================
+
+def run_job_matching(job_descriptions: Dict[str, str], uploaded_file, top_k: int) -> None:
+    """
+    Rank many job descriptions for one resume.
+    
+    Args:
+        job_descriptions: Mapping of requisition id -> JD text
+        uploaded_file: Streamlit UploadedFile holding the resume PDF
+        top_k: Number of JDs kept by the local prefilter and analyzed
+    """
+    resume_text, error = extract_resume_text(uploaded_file)
+    if error:
+        st.error(error)
+        return
+    
+    st.markdown("---")
+    st.markdown('<div class="card-title">🧭 Best Matching Roles</div>', unsafe_allow_html=True)
+    with st.spinner(f"🤖 Matching against the top {min(top_k, len(job_descriptions))} "
+                    f"of {len(job_descriptions)} job descriptions..."):
+        ranked = match_resume_to_jds(resume_text, job_descriptions, GROQ_API_KEY, top_k=top_k)
+    
+    resume_hash = content_hash(resume_text)
+    for r in ranked:
+        get_history_store().record_many(job_descriptions[r["jd_id"]], [
+            dict(r, resume_hash=resume_hash, candidate=uploaded_file.name, jd_title=r["jd_id"])
+        ])
+    
+    errors = [r for r in ranked if r["error"]]
+    if errors and len(errors) == len(ranked):
+        st.error(f"🔴 {errors[0]['error']}")
+        return
+    
+    best = ranked[0]
+    render_match_score(st.empty(), best["match_percentage"], cached=best["cached"])
+    st.markdown(f"**Best match:** {best['jd_id']}")
+    st.dataframe(
+        [
+            {
+                "Role": r["jd_id"],
+                "Match %": r["match_percentage"],
+                "Missing Skills": ", ".join(r["missing_keywords"]),
+                "Summary": r["profile_summary"] or r["error"],
+                "Pre-score": r["prescore"],
+                "Source": "Cache" if r["cached"] else "AI"
+            }
+            for r in ranked
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    if len(job_descriptions) > len(ranked):
+        st.caption(f"{len(job_descriptions) - len(ranked)} job descriptions were ruled out by the "
+                   "local pre-score and not sent for AI analysis.")
+
+
+# =============================================================================
+# HISTORY
+# =============================================================================
+
+def _export_history(history_filter: HistoryFilter, export_format: str) -> bytes:
+    """Serialize the filtered history as CSV or Parquet."""
+    store = get_history_store()
+    if export_format == "CSV":
+        buffer = io.StringIO(newline="")
+        store.export_csv(buffer, history_filter)
+        return buffer.getvalue().encode("utf-8")
+    buffer = io.BytesIO()
+    store.export_parquet(buffer, history_filter)
+    return buffer.getvalue()
+
+
+def render_history() -> None:
+    """Page through stored analyses, filtered by requisition, score and candidate."""
+    store = get_history_store()
+    requisitions = {"All requisitions": None}
+    for requisition in store.requisitions():
+        label = f"{requisition['jd_title'] or 'Untitled'} ({requisition['analyses']})"
+        requisitions[f"{label} · {requisition['jd_hash'][:6]}"] = requisition["jd_hash"]
+    
+    with st.sidebar:
+        st.markdown("### Filters")
+        requisition = st.selectbox("Requisition", options=list(requisitions))
+        min_score, max_score = st.slider("Match %", min_value=0, max_value=100, value=(0, 100))
+        candidate = st.text_input("Candidate name contains")
+        order = st.radio("Sort by", options=["newest", "score"], horizontal=True,
+                         format_func=lambda o: "Newest" if o == "newest" else "Match %")
+        page_size = st.selectbox("Rows per page", options=[25, 50, 100, 200],
+                                 index=[25, 50, 100, 200].index(DEFAULT_PAGE_SIZE))
+    
+    history_filter = HistoryFilter(
+        jd_hash=requisitions[requisition],
+        min_score=min_score or None,
+        max_score=max_score if max_score < 100 else None,
+        candidate=candidate.strip() or None
+    )
+    
+    # Keyset cursors of the pages visited so far; a new query starts over
+    query = (history_filter, order, page_size)
+    if st.session_state.get("history_query") != query:
+        st.session_state.history_query = query
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+    entries, next_cursor = store.page(history_filter, order, page_size, cursors[-1])
+    total = store.count(history_filter)
+    
+    st.markdown('<div class="card-title">📚 Analysis History</div>', unsafe_allow_html=True)
+    if not total:
+        st.info("No analyses stored yet. Results are saved here after every analysis.")
+        return
+    
+    st.caption(f"{total} analyses · page {len(cursors)} of {-(-total // page_size)}")
+    st.dataframe(
+        [
+            {
+                "Analyzed": time.strftime("%Y-%m-%d %H:%M", time.localtime(e.created_at)),
+                "Candidate": e.candidate,
+                "Requisition": e.jd_title,
+                "Match %": e.match_percentage,
+                "Missing Skills": ", ".join(e.missing_keywords),
+                "Summary": e.profile_summary,
+                "Source": {"ai": "AI", "cache": "Cache", "prescreen": "Pre-screen", "duplicate": "Duplicate"}.get(e.source, e.source),
+                "Quality": (f"{sum(status == 'pass' for status in e.quality.values())}/{len(e.quality)} pass"
+                            if e.quality else "-")
+            }
+            for e in entries
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    col1, col2, _ = st.columns([1, 1, 4])
+    col1.button("← Previous", disabled=len(cursors) == 1, on_click=cursors.pop)
+    col2.button("Next →", disabled=next_cursor is None, on_click=cursors.append, args=(next_cursor,))
+    
+    with st.expander("⬇️ Export filtered history"):
+        export_format = st.radio("Format", options=["CSV", "Parquet"], horizontal=True)
+        if st.button("Prepare export"):
+            try:
+                data = _export_history(history_filter, export_format)
+            except ImportError:
+                st.error("Parquet export needs pyarrow. Run: pip install pyarrow")
+            else:
+                extension = "csv" if export_format == "CSV" else "parquet"
+                st.download_button(
+                    f"Download {total} analyses ({len(data) / 1e6:.1f} MB)",
+                    data=data,
+                    file_name=f"smartmatch_history.{extension}",
+                    mime="text/csv" if export_format == "CSV" else "application/octet-stream"
+                )
+
+
 # =============================================================================
 # MAIN APPLICATION
 # =============================================================================
@@ -555,32 +751,109 @@ def main():
         st.markdown("## 📋 Input Section")
         st.markdown("---")
         
-
-        
-        # Job Description Input
-        st.markdown("### Job Description")
-        job_description = st.text_area(
-            label="Paste the job description here",
-            height=200,
-            placeholder="Paste the complete job description including requirements and qualifications...",
+        # Mode Selection
+        mode = st.radio(
+            "Mode",
+            options=["Single Resume", "Batch Screening", "Job Matching", "History"],
+            horizontal=True,
             label_visibility="collapsed"
         )
+        batch_mode = mode == "Batch Screening"
+        job_match_mode = mode == "Job Matching"
+    
+    if mode == "History":
+        render_history()
+        return
+    
+    with st.sidebar:
+        # Job Description Input
+        if job_match_mode:
+            st.markdown("### Job Descriptions")
+            job_description = st.text_area(
+                label="Paste job descriptions separated by a line containing only ---",
+                height=200,
+                placeholder="Senior Data Engineer\n...\n---\nML Engineer\n...",
+                help="Separate job descriptions with a line containing only ---"
+            )
+        else:
+            st.markdown("### Job Description")
+            job_description = st.text_area(
+                label="Paste the job description here",
+                height=200,
+                placeholder="Paste the complete job description including requirements and qualifications...",
+                label_visibility="collapsed"
+            )
         
         st.markdown("---")
         
         # Resume Upload
-        st.markdown("### Resume Upload")
-        uploaded_file = st.file_uploader(
-            label="Upload your resume (PDF)",
-            type=['pdf'],
-            help="Drag and drop your PDF resume here",
-            label_visibility="collapsed"
-        )
+        if batch_mode:
+            st.markdown("### Resume Uploads")
+            uploaded_files = st.file_uploader(
+                label="Upload resumes (PDFs or a ZIP of PDFs)",
+                type=['pdf', 'zip'],
+                accept_multiple_files=True,
+                help="Drag and drop many PDF resumes, or a ZIP archive containing them",
+                label_visibility="collapsed"
+            )
+            max_concurrency = st.slider(
+                "Concurrent analyses", min_value=1, max_value=32,
+                value=DEFAULT_MAX_CONCURRENCY
+            )
+            tokens_per_minute = st.number_input(
+                "Tokens per minute budget (0 = unlimited)", min_value=0,
+                value=0, step=1000
+            )
+            prescore_threshold = st.slider(
+                "Skip AI below local pre-score (0 = never)", min_value=0, max_value=50,
+                value=int(DEFAULT_PRESCORE_THRESHOLD),
+                help="Resumes sharing almost no key terms with the JD get a local result without an LLM call"
+            )
+            use_jd_profile = st.checkbox(
+                "Send compact job profile", value=False,
+                help="Extract skills, seniority and must-haves from the JD once and send "
+                     "that profile instead of the full JD with every resume. Works best "
+                     "for JDs with a title line and requirement headings; others are sent in full"
+            )
+            use_cascade = st.checkbox(
+                "Fast model first (cascade)", value=False,
+                help=f"Score with the small 8B model and re-score only borderline results "
+                     f"({CASCADE_BAND[0]}-{CASCADE_BAND[1]}%) with the 70B model"
+            )
+            reuse_duplicates = st.checkbox(
+                "Reuse results for duplicate resumes", value=True,
+                help="Resumes already screened for this JD reuse the earlier result. "
+                     "Near copies do too, unless the edit adds or removes a term the JD asks for"
+            )
+        else:
+            st.markdown("### Resume Upload")
+            uploaded_file = st.file_uploader(
+                label="Upload your resume (PDF)",
+                type=['pdf'],
+                help="Drag and drop your PDF resume here",
+                label_visibility="collapsed"
+            )
+            if job_match_mode:
+                top_k = st.slider(
+                    "Roles analyzed by AI", min_value=1, max_value=25, value=DEFAULT_TOP_K,
+                    help="Job descriptions are pre-scored locally; only the best matches are sent to the LLM"
+                )
+            else:
+                rescore_changes = st.checkbox(
+                    "♻️ Re-score changes only", value=False,
+                    help="If this candidate (matched by email) was analyzed for this JD before, "
+                         "send only the edited sections with the previous result"
+                )
         
         st.markdown("---")
         
         # Analyze Button
-        analyze_clicked = st.button("🚀 Analyze Resume", type="primary", use_container_width=True)
+        button_label = (
+            "🚀 Screen Resumes" if batch_mode else
+            "🚀 Find Best Roles" if job_match_mode else
+            "🚀 Analyze Resume"
+        )
+        analyze_clicked = st.button(button_label, type="primary", use_container_width=True)
         
         # Info section
         st.markdown("---")
@@ -590,6 +863,11 @@ def main():
         2. **Upload** your PDF resume
         3. **Click** Analyze Resume
         """)
+        
+        # Admin: pipeline timings (this process, all sessions)
+        st.markdown("---")
+        if st.checkbox("⏱️ Show performance panel", value=False):
+            render_performance_panel()
     
     # Main Content Area
     if analyze_clicked:
@@ -598,33 +876,35 @@ def main():
             st.error("⚠️ Please paste a job description in the sidebar.")
             return
         
+        if batch_mode:
+            if not uploaded_files:
+                st.error("⚠️ Please upload resumes (PDFs or a ZIP archive) in the sidebar.")
+                return
+            run_batch_screening(job_description, uploaded_files, max_concurrency,
+                                tokens_per_minute, prescore_threshold, use_jd_profile,
+                                use_cascade, reuse_duplicates)
+            return
+        
         if not uploaded_file:
             st.error("⚠️ Please upload your resume (PDF format) in the sidebar.")
             return
         
-        # Process
-        with st.spinner("🤖 Analyzing with Llama 3 AI... This takes a few seconds."):
-            
-            # Extract text from PDF
-            resume_text, error = extract_text_from_pdf(uploaded_file)
-            
-            if error:
-                st.error(error)
-                return
-            
-            # Analyze with LLM
-            llm_result = analyze_resume_with_llm(resume_text, job_description, GROQ_API_KEY)
-            
-            # Check for errors
-            if llm_result.get("error"):
-                st.error(f"🔴 {llm_result['error']}")
-                return
-            
-            # Quality checks
-            quality_results = check_resume_quality(resume_text)
+        if job_match_mode:
+            run_job_matching(split_job_descriptions(job_description), uploaded_file, top_k)
+            return
+        
+        # Extract text from PDF
+        resume_text, error = extract_resume_text(uploaded_file)
+        
+        if error:
+            st.error(error)
+            return
+        
+        # Quality checks
+        quality_results = check_resume_quality(resume_text)
         
         # =================================================================
-        # RESULTS DISPLAY
+        # RESULTS DISPLAY (filled progressively while the model streams)
         # =================================================================
         
         st.markdown("---")
@@ -632,45 +912,58 @@ def main():
         # Row 1: Match Score Gauge
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-            gauge_chart = create_gauge_chart(llm_result["match_percentage"])
-            st.plotly_chart(gauge_chart, use_container_width=True)
-            
-            # Score interpretation
-            score = llm_result["match_percentage"]
-            if score >= 70:
-                st.success("🌟 Excellent Match! Strong candidate for this position.")
-            elif score >= 50:
-                st.warning("📊 Partial Match. Some skill gaps to address.")
-            else:
-                st.error("⚡ Low Match. Significant improvements needed.")
-            st.markdown('</div>', unsafe_allow_html=True)
+            score_placeholder = st.empty()
+        score_placeholder.info("🤖 Analyzing with Llama 3 AI...")
         
         st.markdown("---")
         
         # Row 2: Profile Summary
-        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">📝 AI Assessment</div>', unsafe_allow_html=True)
-        st.markdown(f'<div class="summary-box">{llm_result["profile_summary"]}</div>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        summary_placeholder = st.empty()
         
         # Row 3: Missing Keywords
-        if llm_result["missing_keywords"]:
-            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-            st.markdown('<div class="card-title">🔴 Missing Skills (High Priority)</div>', unsafe_allow_html=True)
-            st.markdown('<p style="color: #a0a0c0; margin-bottom: 1rem;">These skills appear in the job description but are missing from your resume:</p>', unsafe_allow_html=True)
-            
-            badges_html = '<div class="badge-container">'
-            for keyword in llm_result["missing_keywords"]:
-                badges_html += f'<span class="badge-missing">{keyword}</span>'
-            badges_html += '</div>'
-            st.markdown(badges_html, unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+        keywords_placeholder = st.empty()
+        
+        llm_result = None
+        if rescore_changes:
+            # Diffed against the candidate's last version; usually no streaming needed
+            with st.spinner("♻️ Comparing with the last analyzed version..."):
+                llm_result = analyze_resume_revision(resume_text, job_description, GROQ_API_KEY)
         else:
-            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-            st.markdown('<div class="card-title">✅ Excellent Skill Coverage</div>', unsafe_allow_html=True)
-            st.markdown('<p style="color: #51cf66;">No critical skills are missing from your resume!</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            score_shown = False
+            for update in stream_resume_analysis(resume_text, job_description, GROQ_API_KEY):
+                if update["done"]:
+                    llm_result = update
+                    break
+                
+                if update["match_percentage"] is not None and not score_shown:
+                    render_match_score(score_placeholder, update["match_percentage"])
+                    score_shown = True
+                if update["profile_summary"]:
+                    render_profile_summary(summary_placeholder, update["profile_summary"], streaming=True)
+                if update["missing_keywords"]:
+                    render_missing_keywords(keywords_placeholder, update["missing_keywords"], streaming=True)
+        
+        # Check for errors
+        if llm_result.get("error"):
+            score_placeholder.empty()
+            summary_placeholder.empty()
+            keywords_placeholder.empty()
+            st.error(f"🔴 {llm_result['error']}")
+            return
+        
+        get_history_store().record(job_description, resume_text, llm_result,
+                                   candidate=uploaded_file.name, quality=quality_results)
+        render_match_score(score_placeholder, llm_result["match_percentage"], cached=llm_result.get("cached"))
+        render_profile_summary(summary_placeholder, llm_result["profile_summary"])
+        render_missing_keywords(keywords_placeholder, llm_result["missing_keywords"])
+        if llm_result.get("revision"):
+            changed = ", ".join(llm_result["changed_sections"]) or "none"
+            st.caption({
+                "first": "♻️ First version on file for this candidate - full analysis.",
+                "unchanged": "♻️ No material changes since the last version - previous result reused.",
+                "delta": f"♻️ Re-scored changed sections only: {changed}.",
+                "full": f"♻️ Major rewrite ({changed}) - full analysis.",
+            }[llm_result["revision"]] + f" Version {llm_result['revision_version']}.")
         
         st.markdown("---")
         
@@ -0,0 +1,184 @@
+"""
+Local mock of the Groq chat-completions endpoint for offline benchmarks.
+
+Serves POST /openai/v1/chat/completions over HTTP/1.1 with keep-alive and
+answers with the same deterministic analysis JSON as
+smartmatch.providers.MockProvider (a JSON array with one analysis per label for
+multi-JD prompts containing [JD-1], [JD-2], ...). Latency, 429 injection and
+rate-limit headers are configurable, and `"stream": true` requests receive a
+server-sent-events stream like the real API.
+"""
+
+import http.server
+import json
+import socketserver
+import threading
+import time
+from typing import Optional
+
+from smartmatch.providers import mock_answer
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+
+def mock_response(prompt: str, model: str = "") -> str:
+    """Answer text for a prompt (same answers as the in-process MockProvider)."""
+    return mock_answer(prompt, model)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment; avoids Nagle/delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def log_message(self, format, *args):  # Keep benchmark output clean
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", "0"))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        with server.lock:
+            server.request_count += 1
+            count = server.request_count
+            server.connections.add(self.client_address)
+
+        if server.rate_limit_every and count % server.rate_limit_every == 0:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                {"retry-after": str(server.retry_after)}
+            )
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        prompt = "\n".join(m.get("content", "") for m in request.get("messages", []))
+        content = mock_response(prompt, request.get("model", ""))
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        headers = {
+            "x-ratelimit-limit-requests": str(server.requests_per_minute),
+            "x-ratelimit-remaining-requests": str(max(0, server.requests_per_minute - count)),
+            "x-ratelimit-limit-tokens": str(server.tokens_per_minute),
+            "x-ratelimit-remaining-tokens": str(server.tokens_per_minute),
+        }
+
+        if request.get("stream"):
+            self._stream(request, content, headers)
+            return
+
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }, headers)
+
+    def _stream(self, request: dict, content: str, headers: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        for i in range(0, len(content), 8):
+            chunk = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [{"index": 0, "delta": {"content": content[i:i + 8]}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class MockLLMServer:
+    """
+    Context manager running the mock endpoint on a background thread.
+
+    Usage:
+        with MockLLMServer(latency=0.05) as server:
+            client = Groq(api_key="mock", base_url=server.base_url)
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit_every: int = 0,
+                 retry_after: float = 0.1, port: int = 0,
+                 requests_per_minute: int = 1000, tokens_per_minute: int = 100000):
+        """
+        Args:
+            latency: Seconds to sleep before answering each request
+            rate_limit_every: Answer every Nth request with HTTP 429 (0 = never)
+            retry_after: Value of the retry-after header on injected 429s
+            port: Port to bind (0 picks a free port)
+            requests_per_minute: Limit advertised in x-ratelimit-*-requests
+            tokens_per_minute: Limit advertised in x-ratelimit-*-tokens
+        """
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.latency = latency
+        self._server.rate_limit_every = rate_limit_every
+        self._server.retry_after = retry_after
+        self._server.requests_per_minute = requests_per_minute
+        self._server.tokens_per_minute = tokens_per_minute
+        self._server.request_count = 0
+        self._server.connections = set()
+        self._server.lock = threading.Lock()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return self._server.request_count
+
+    @property
+    def connection_count(self) -> int:
+        """Distinct client sockets seen (a proxy for TCP/TLS handshakes)."""
+        return len(self._server.connections)
+
+    def __enter__(self) -> "MockLLMServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
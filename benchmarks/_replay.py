@@ -0,0 +1,136 @@
+"""
+Recorded LLM responses for offline, deterministic benchmarks.
+
+RecordingProvider wraps a live provider (Groq, or the mock) and keeps every
+answer; save_fixtures() writes them as JSON. ReplayProvider serves them back
+without network or quota, keyed by a hash of the exact request (model,
+sampling settings and messages). A key recorded several times replays its
+samples in turn, so run-to-run variance of the live model is reproduced.
+
+A request that was never recorded (the system prompt, truncation budgets or
+corpus changed) is a "miss": it fails with a 404 ProviderError, or is
+answered by a fallback provider when one is given.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from smartmatch.cache import make_cache_key
+from smartmatch.providers import Completion, LLMProvider, ProviderError
+from smartmatch.truncation import count_tokens
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "llm_responses.json")
+
+
+def fixture_key(messages: List[Dict[str, str]], model: str, temperature: float,
+                max_tokens: int, json_mode: bool) -> str:
+    """Content hash identifying one completion request."""
+    return make_cache_key(model, temperature, max_tokens, json_mode,
+                          json.dumps(messages, sort_keys=True, ensure_ascii=False))
+
+
+def load_fixtures(path: str = FIXTURES_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save_fixtures(path: str, responses: Dict[str, List[Dict[str, Any]]], **meta: Any) -> None:
+    """Write recorded responses (sorted, so re-recordings diff cleanly)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document = dict(meta, responses={key: responses[key] for key in sorted(responses)})
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=1, ensure_ascii=False, sort_keys=True)
+        handle.write("\n")
+
+
+class _Counting(LLMProvider):
+    """Prompt/completion token totals of every call made through a provider."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _count(self, messages: List[Dict[str, str]], completion: Completion) -> None:
+        prompt_tokens = count_tokens("\n".join(message["content"] for message in messages))
+        with self.lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion.usage.get("completion_tokens", 0)
+
+
+class RecordingProvider(_Counting):
+    """Passes calls to a live provider and keeps each answer for save_fixtures()."""
+
+    def __init__(self, inner: LLMProvider):
+        super().__init__()
+        self.inner = inner
+        self.name = inner.name
+        self.responses: Dict[str, List[Dict[str, Any]]] = {}
+
+    def check(self) -> Optional[str]:
+        return self.inner.check()
+
+    def complete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> Completion:
+        started = time.perf_counter()
+        completion = self.inner.complete(messages, model, temperature, max_tokens, timeout, json_mode)
+        sample = {
+            "content": completion.content,
+            "model": completion.model,
+            "usage": dict(completion.usage),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        key = fixture_key(messages, model, temperature, max_tokens, json_mode)
+        with self.lock:
+            self.responses.setdefault(key, []).append(sample)
+        self._count(messages, completion)
+        return completion
+
+
+class ReplayProvider(_Counting):
+    """Answers from recorded fixtures; see the module docstring."""
+
+    name = "replay"
+
+    def __init__(self, responses: Dict[str, List[Dict[str, Any]]],
+                 latency: Optional[float] = None,
+                 fallback: Optional[LLMProvider] = None):
+        """
+        Args:
+            responses: Recorded samples by fixture_key() (the "responses" of a
+                fixtures file)
+            latency: Seconds each call takes; None sleeps for the recorded latency
+            fallback: Provider answering requests that were never recorded
+                (default: fail them with a 404 ProviderError)
+        """
+        super().__init__()
+        self.responses = responses
+        self.latency = latency
+        self.fallback = fallback
+        self.misses = 0
+        self._turns: Dict[str, int] = {}
+
+    def complete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> Completion:
+        key = fixture_key(messages, model, temperature, max_tokens, json_mode)
+        samples = self.responses.get(key)
+        if not samples:
+            with self.lock:
+                self.misses += 1
+            if self.fallback is None:
+                raise ProviderError(f"No recorded response for request {key[:12]}", 404)
+            completion = self.fallback.complete(messages, model, temperature, max_tokens, timeout, json_mode)
+            self._count(messages, completion)
+            return completion
+
+        with self.lock:
+            turn = self._turns.get(key, 0)
+            self._turns[key] = turn + 1
+        sample = samples[turn % len(samples)]
+        time.sleep(sample["latency_ms"] / 1000 if self.latency is None else self.latency)
+        completion = Completion(sample["content"], sample["model"], sample["usage"], None)
+        self._count(messages, completion)
+        return completion
@@ -0,0 +1,152 @@
+"""
+Synthetic resume and job-description fixtures for the benchmarks.
+
+PDFs are written by hand (plain text content streams, Helvetica), so the
+benchmarks need nothing beyond the app's own dependencies.
+"""
+
+import random
+from typing import List
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "Django", "Flask",
+    "FastAPI", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka", "Docker",
+    "Kubernetes", "AWS", "GCP", "Azure", "Terraform", "CI/CD", "Machine Learning",
+    "PyTorch", "TensorFlow", "Pandas", "NumPy", "Spark", "Airflow", "GraphQL",
+    "REST APIs", "Go", "Java", "Spring Boot", "Scala", "Rust", "Linux", "Git",
+]
+
+SECTION_LINES = [
+    "Designed and shipped {skill} services handling millions of requests per day.",
+    "Led a team of {n} engineers migrating legacy systems to {skill}.",
+    "Reduced infrastructure cost by {n}0% by re-architecting pipelines on {skill}.",
+    "Mentored junior developers and ran code reviews for the {skill} platform.",
+    "Built monitoring and alerting for production {skill} workloads.",
+    "Collaborated with product managers to deliver {skill} features on schedule.",
+]
+
+JD_TEMPLATE = """Senior Software Engineer
+
+We are looking for a Senior Software Engineer with {years}+ years of experience.
+
+Requirements:
+{requirements}
+
+Nice to have:
+{nice}
+
+We are an equal opportunity employer and value diversity at our company.
+Benefits include health insurance, 401(k) matching and flexible working hours.
+"""
+
+
+def make_resume_lines(rng: random.Random, line_count: int) -> List[str]:
+    """Generate plausible resume lines with a header and standard sections."""
+    name = rng.choice(["Alex", "Sam", "Jordan", "Taylor", "Morgan"]) + " " + \
+        rng.choice(["Lee", "Patel", "Garcia", "Kim", "Smith"])
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{name.split()[1].lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "SUMMARY",
+        f"Software engineer with {rng.randint(2, 12)} years of experience.",
+        "EXPERIENCE",
+    ]
+    while len(lines) < line_count - 6:
+        template = rng.choice(SECTION_LINES)
+        lines.append(template.format(skill=rng.choice(SKILLS), n=rng.randint(2, 9)))
+    lines += [
+        "EDUCATION",
+        "B.S. Computer Science, State University",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 10)),
+        "PROJECTS",
+        f"Open-source contributor to {rng.choice(SKILLS)} tooling.",
+    ]
+    return lines
+
+
+def make_resume_text(seed: int = 0, line_count: int = 40) -> str:
+    """Generate a synthetic resume as plain text."""
+    return "\n".join(make_resume_lines(random.Random(seed), line_count))
+
+
+def make_jd_text(seed: int = 0) -> str:
+    """Generate a synthetic job description."""
+    rng = random.Random(seed)
+    required = rng.sample(SKILLS, 8)
+    nice = rng.sample([s for s in SKILLS if s not in required], 4)
+    return JD_TEMPLATE.format(
+        years=rng.randint(3, 8),
+        requirements="\n".join(f"- {skill}" for skill in required),
+        nice="\n".join(f"- {skill}" for skill in nice),
+    )
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: List[List[str]], padding: int = 0) -> bytes:
+    """
+    Build a minimal PDF with one text page per entry in `pages`.
+
+    Args:
+        pages: Lines of text for each page
+        padding: Bytes of incompressible filler in an unreferenced stream
+            object, standing in for an embedded photo or scan
+
+    Returns:
+        PDF file contents
+    """
+    objects = []
+    page_count = len(pages)
+    font_id = 3
+    first_page_id = 4
+    kids = " ".join(f"{first_page_id + 2 * i} 0 R" for i in range(page_count))
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for i, lines in enumerate(pages):
+        content_id = first_page_id + 2 * i + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        stream = ["BT", "/F1 10 Tf", "12 TL", "50 750 Td"]
+        for line in lines:
+            stream.append(f"({_escape(line)}) Tj T*")
+        stream.append("ET")
+        body = "\n".join(stream).encode("latin-1", "replace")
+        objects.append(
+            b"<< /Length " + str(len(body)).encode() + b" >>\nstream\n" + body + b"\nendstream"
+        )
+
+    if padding:
+        filler = random.Random(padding).getrandbits(8 * padding).to_bytes(padding, "little")
+        objects.append(b"<< /Length " + str(padding).encode() + b" >>\nstream\n" + filler + b"\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n".encode()
+    output += b"0000000000 65535 f \n"
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(output)
+
+
+def make_resume_pdf(page_count: int, seed: int = 0, lines_per_page: int = 55, padding: int = 0) -> bytes:
+    """Generate a synthetic multi-page resume PDF (padding: see make_pdf)."""
+    rng = random.Random(seed)
+    pages = [make_resume_lines(rng, lines_per_page) for _ in range(page_count)]
+    return make_pdf(pages, padding)
@@ -0,0 +1,124 @@
+"""
+Benchmark: tiered model cascade vs. the 70B model for every resume.
+
+Usage:
+    python -m benchmarks.bench_cascade [--resumes 200] [--band 40-75]
+        [--fast-latency 0.15] [--accurate-latency 0.6] [--concurrency 16]
+
+Runs offline on the in-process MockProvider (per-model latency; the mock's
+fast model scores with a wider deterministic spread than the accurate one).
+Reports wall time, mean latency per resume, calls and tokens per model, an
+estimated cost from PRICES, how many resumes were escalated, and how far the
+cascade's final scores are from accurate-only scores.
+"""
+
+import argparse
+import concurrent.futures
+import statistics
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks._synthetic import make_jd_text, make_resume_text
+from smartmatch.core import FAST_MODEL_NAME, MODEL_NAME, analyze_resume_cascade, analyze_resume_with_llm
+from smartmatch.providers import LLMProvider, MockProvider, set_default_provider
+
+# USD per million (input, output) tokens; Groq list prices, adjust as needed
+PRICES = {
+    FAST_MODEL_NAME: (0.05, 0.08),
+    MODEL_NAME: (0.59, 0.79),
+}
+
+
+class CountingProvider(LLMProvider):
+    """Wraps a provider and records calls and token usage per model."""
+
+    name = "mock"
+
+    def __init__(self, inner: LLMProvider):
+        self.inner = inner
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.tokens: Dict[str, List[int]] = {}
+
+    def complete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False):
+        completion = self.inner.complete(messages, model, temperature, max_tokens, timeout, json_mode)
+        with self.lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+            usage = self.tokens.setdefault(model, [0, 0])
+            usage[0] += completion.usage.get("prompt_tokens", 0)
+            usage[1] += completion.usage.get("completion_tokens", 0)
+        return completion
+
+    def cost(self) -> float:
+        return sum(
+            (prompt * PRICES.get(model, (0, 0))[0] + completion * PRICES.get(model, (0, 0))[1]) / 1e6
+            for model, (prompt, completion) in self.tokens.items()
+        )
+
+
+def _run(label: str, analyze, resumes: List[str], jd_text: str, concurrency: int,
+         fast_latency: float, accurate_latency: float) -> Dict:
+    provider = CountingProvider(MockProvider(latency={FAST_MODEL_NAME: fast_latency,
+                                                      MODEL_NAME: accurate_latency}))
+    set_default_provider(provider)
+    latencies: List[float] = []
+
+    def one(resume_text: str) -> Dict:
+        started = time.perf_counter()
+        result = analyze(resume_text, jd_text)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, resumes))
+    wall = time.perf_counter() - started
+    set_default_provider(None)
+
+    calls = ", ".join(f"{model}={count}" for model, count in sorted(provider.calls.items()))
+    print(f"{label:14s} wall={wall:6.2f}s  mean={statistics.mean(latencies) * 1000:5.0f}ms/resume  "
+          f"cost=${provider.cost():.4f}  calls: {calls}")
+    return {"results": results, "wall": wall, "cost": provider.cost()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--band", default="40-75", help="Uncertainty band, e.g. 40-75")
+    parser.add_argument("--fast-latency", type=float, default=0.15, help="Seconds per 8B call")
+    parser.add_argument("--accurate-latency", type=float, default=0.6, help="Seconds per 70B call")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    band = tuple(int(bound) for bound in args.band.split("-"))
+    jd_text = make_jd_text(7)
+    # Vary resume length so scores spread across the whole range
+    resumes = [make_resume_text(seed, 10 + seed % 70) for seed in range(args.resumes)]
+
+    def accurate_only(resume_text: str, jd: str) -> Dict:
+        return analyze_resume_with_llm(resume_text, jd, "", use_cache=False, model="accurate")
+
+    def cascade(resume_text: str, jd: str) -> Dict:
+        return analyze_resume_cascade(resume_text, jd, "", band=band, use_cache=False)
+
+    print(f"{args.resumes} resumes, band={band[0]}-{band[1]}, latency 8B={args.fast_latency}s "
+          f"70B={args.accurate_latency}s, concurrency={args.concurrency}")
+    baseline = _run("70B only", accurate_only, resumes, jd_text, args.concurrency,
+                    args.fast_latency, args.accurate_latency)
+    tiered = _run("cascade", cascade, resumes, jd_text, args.concurrency,
+                  args.fast_latency, args.accurate_latency)
+
+    tiers: Dict[str, int] = {}
+    for result in tiered["results"]:
+        tiers[result["tier"]] = tiers.get(result["tier"], 0) + 1
+    differences = [abs(a["match_percentage"] - b["match_percentage"])
+                   for a, b in zip(baseline["results"], tiered["results"])]
+    print(f"tiers: {tiers}  (escalated {tiers.get('accurate', 0) / len(resumes):.0%})")
+    print(f"speedup={baseline['wall'] / tiered['wall']:.2f}x  "
+          f"cost reduction={1 - tiered['cost'] / baseline['cost']:.0%}  "
+          f"score |diff| vs 70B: mean={statistics.mean(differences):.1f} max={max(differences)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: a new Groq client per request vs. the shared pooled client.
+
+Usage:
+    python -m benchmarks.bench_client_pool [--requests 200] [--latency 0.0]
+
+Runs the same chat completions against a local mock server and reports
+per-request latency and how many TCP connections each strategy opened.
+Against the real API every extra connection also costs a TLS handshake, so
+the saving there is larger than measured locally.
+"""
+
+import argparse
+import statistics
+import time
+
+from groq import Groq
+
+from benchmarks._mock_llm import MockLLMServer
+from smartmatch.client import GroqClientManager
+
+MESSAGES = [
+    {"role": "system", "content": "You are an ATS."},
+    {"role": "user", "content": "Analyze this resume against the job description."},
+]
+
+
+def _call(client) -> None:
+    client.chat.completions.create(
+        messages=MESSAGES, model="llama-3.3-70b-versatile", max_tokens=500
+    )
+
+
+def _run(label: str, get_client, server: MockLLMServer, requests: int) -> None:
+    connections_before = server.connection_count
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        _call(get_client())
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(
+        f"{label:<22} mean={statistics.mean(samples):7.2f}ms "
+        f"p50={samples[len(samples) // 2]:7.2f}ms "
+        f"p95={samples[int(len(samples) * 0.95) - 1]:7.2f}ms "
+        f"connections={server.connection_count - connections_before}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated model latency in seconds")
+    args = parser.parse_args()
+
+    with MockLLMServer(latency=args.latency) as server:
+        manager = GroqClientManager()
+        # Warm both paths once so imports and first-connection costs are excluded
+        _call(Groq(api_key="mock", base_url=server.base_url))
+        _call(manager.get_client("mock", base_url=server.base_url))
+
+        print(f"requests={args.requests} latency={args.latency}s http2={manager.http2}")
+        _run("client per request", lambda: Groq(api_key="mock", base_url=server.base_url),
+             server, args.requests)
+        _run("pooled client", lambda: manager.get_client("mock", base_url=server.base_url),
+             server, args.requests)
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
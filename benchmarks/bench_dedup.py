@@ -0,0 +1,101 @@
+"""
+Benchmark: duplicate resume detection (smartmatch.dedup).
+
+Usage:
+    python -m benchmarks.bench_dedup [--sizes 1000,4000,16000] [--queries 200]
+
+For each corpus size it indexes synthetic resumes, then looks up:
+- near-duplicates: indexed resumes with a line reworded and a line added
+- new resumes: unseen seeds (different candidates from the same templates)
+
+and reports fingerprint time, LSH lookup latency (p50/p95) next to a
+brute-force comparison against every stored signature, the recall on
+near-duplicates and the false-match rate on new resumes. Lookup latency
+should stay roughly flat as the corpus grows; the scan grows linearly.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from benchmarks._synthetic import make_resume_text
+from smartmatch.dedup import DuplicateIndex, fingerprint
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _near_duplicate(text: str, rng: random.Random) -> str:
+    lines = text.splitlines()
+    target = rng.randrange(len(lines))
+    lines[target] = lines[target].replace(" ", "  ").replace("and", "&")
+    lines.insert(rng.randrange(len(lines)), "Volunteer mentor at a local coding club.")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,4000,16000", help="Comma-separated corpus sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Lookups of each kind per size")
+    parser.add_argument("--lines", type=int, default=40, help="Lines per synthetic resume")
+    parser.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    rng = random.Random(0)
+    print(f"threshold={args.threshold} queries={args.queries} per kind (times in ms)")
+    print(f"{'corpus':>7} {'fp ms':>6} {'lsh p50':>8} {'lsh p95':>8} {'scan p50':>9} "
+          f"{'recall':>7} {'false':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = DuplicateIndex(os.path.join(tmp, "duplicates.sqlite3"), threshold=args.threshold)
+        signatures = []
+        fingerprint_times = []
+        for size in sizes:
+            for seed in range(len(index), size):
+                text = make_resume_text(seed, args.lines)
+                started = time.perf_counter()
+                resume_print = fingerprint(text)
+                fingerprint_times.append(time.perf_counter() - started)
+                index.add(resume_print, f"resume-{seed}")
+                signatures.append(resume_print.signature)
+            matrix = np.stack(signatures)
+
+            lookup_times, scan_times = [], []
+            found = false_matches = 0
+            for query in range(args.queries):
+                seed = rng.randrange(size)
+                near = fingerprint(_near_duplicate(make_resume_text(seed, args.lines), rng))
+                new = fingerprint(make_resume_text(10 ** 7 + size * args.queries + query, args.lines))
+                for resume_print, is_duplicate in ((near, True), (new, False)):
+                    started = time.perf_counter()
+                    match = index.match(resume_print)
+                    lookup_times.append(time.perf_counter() - started)
+                    if is_duplicate:
+                        found += match is not None and match.label == f"resume-{seed}"
+                    else:
+                        false_matches += match is not None
+
+                    started = time.perf_counter()
+                    similarities = (matrix == resume_print.signature).mean(axis=1)
+                    int(np.argmax(similarities))
+                    scan_times.append(time.perf_counter() - started)
+
+            print(
+                f"{size:>7} {np.median(fingerprint_times) * 1000:>6.2f} "
+                f"{_percentile(lookup_times, 50) * 1000:>8.2f} {_percentile(lookup_times, 95) * 1000:>8.2f} "
+                f"{_percentile(scan_times, 50) * 1000:>9.2f} "
+                f"{found / args.queries:>7.1%} {false_matches / args.queries:>6.1%}"
+            )
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
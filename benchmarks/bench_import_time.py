@@ -0,0 +1,118 @@
+"""
+Benchmark: cold-start import time of the SmartMatch core and dashboard.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs 5] [--top 10]
+
+Each target runs in a fresh interpreter. Reports the best wall-clock time per
+target, the slowest modules from `python -X importtime`, and whether heavy
+dependencies (Streamlit, Plotly, groq, PyPDF2, numpy) were pulled in. Exits
+non-zero if importing the core loads Streamlit, Plotly or numpy, or if
+rendering the dashboard's start page (app.py in Streamlit bare mode) loads
+Plotly, groq, PyPDF2 or numpy, which should only load with the first
+upload/result. Modules that
+`import streamlit` loads by itself (recent versions import Plotly for their
+chart theme) are reported but not counted against the app.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+# Runs the dashboard script once outside `streamlit run` (bare mode: no UI, same imports)
+APP_STATEMENT = (
+    f"logging, runpy; logging.disable(logging.WARNING); runpy.run_path({APP_PATH!r}, run_name='__main__')"
+)
+
+# (label, import statement); "core + groq" is what the first analysis call adds
+TARGETS = [
+    ("smartmatch", "smartmatch"),
+    ("smartmatch.core", "smartmatch.core"),
+    ("smartmatch.core + groq", "smartmatch.core, groq"),
+    ("app.py start page", APP_STATEMENT),
+]
+HEAVY_MODULES = ["streamlit", "plotly", "groq", "httpx", "PyPDF2", "numpy"]
+# Target -> modules it must not load
+FORBIDDEN_MODULES: Dict[str, List[str]] = {
+    "smartmatch.core": ["streamlit", "plotly", "numpy"],
+    APP_STATEMENT: ["plotly", "groq", "PyPDF2", "numpy"],
+}
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    # Bare-mode Streamlit warns on stderr; keep the output readable
+    return subprocess.run([sys.executable] + args, check=True, capture_output=True, text=True)
+
+
+def _time_import(statement: str) -> float:
+    started = time.perf_counter()
+    _run(["-c", f"import {statement}"])
+    return time.perf_counter() - started
+
+
+def _loaded_heavy_modules(statement: str) -> List[str]:
+    probe = (
+        f"import sys; import {statement}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    lines = _run(["-c", probe]).stdout.strip().splitlines()
+    output = lines[-1] if lines else ""
+    return [name for name in output.split(",") if name]
+
+
+def _slowest_modules(statement: str, top: int) -> List[Tuple[int, str]]:
+    """Modules with the largest self time (microseconds) while importing `statement`."""
+    stderr = _run(["-X", "importtime", "-c", f"import {statement}"]).stderr
+    rows = []
+    started = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        # Skip interpreter startup (site, encodings) imported before the -c code
+        started = started or name.strip() == "site"
+        if started and name.strip() != "site":
+            rows.append((int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = min(_time_import("sys") for _ in range(args.runs))
+    print(f"{'interpreter startup':<58} {baseline * 1000:7.1f} ms")
+
+    failures = []
+    for label, statement in TARGETS:
+        best = min(_time_import(statement) for _ in range(args.runs))
+        heavy = _loaded_heavy_modules(statement)
+        print(f"import {label:<51} {max(0.0, best - baseline) * 1000:7.1f} ms  "
+              f"(heavy: {', '.join(heavy) or 'none'})")
+        forbidden = FORBIDDEN_MODULES.get(statement, [])
+        if statement == APP_STATEMENT:
+            by_streamlit = [name for name in forbidden if name in _loaded_heavy_modules("streamlit")]
+            if by_streamlit:
+                print(f"  (loaded by streamlit itself, not counted: {', '.join(by_streamlit)})")
+            forbidden = [name for name in forbidden if name not in by_streamlit]
+        unexpected = [name for name in forbidden if name in heavy]
+        if unexpected:
+            failures.append(f"{label} loads {', '.join(unexpected)}")
+
+    for label, statement in (("smartmatch.core", "smartmatch.core"), ("app.py start page", APP_STATEMENT)):
+        print(f"\nslowest modules imported by {label} (-X importtime, self time):")
+        for self_us, name in _slowest_modules(statement, args.top):
+            print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    print("PASS" if not failures else f"FAIL ({'; '.join(failures)})")
+    sys.exit(0 if not failures else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: peak memory of batch intake, whole-archive reads vs. streaming.
+
+Usage:
+    python -m benchmarks.bench_ingest_memory [--sizes 25,100,400] [--pad-kb 256]
+
+Builds ZIP archives of synthetic resumes (each padded to roughly --pad-kb,
+like a CV with an embedded photo) and screens each archive in a fresh
+process with a no-op analysis, so only intake and extraction are measured:
+- legacy:    the previous path, which read the archive into memory, unpacked
+             every member with archive.read() and listed them before screening
+- streaming: iter_resume_files() over the open archive file, one member
+             spooled at a time, extracted by the engine from the spooled file
+
+Reports the peak RSS above the post-import baseline. The streaming column
+should stay flat as the batch grows; the legacy column grows with the
+archive. (In the dashboard, Streamlit itself keeps the uploaded archive in
+memory; the streaming path adds nothing on top of it.)
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Dict, Iterator, List
+
+from benchmarks._synthetic import make_resume_pdf
+
+MODES = ["legacy", "streaming"]
+# Streaming peak may grow by this much from the smallest to the largest batch
+FLAT_TOLERANCE_MB = 16.0
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _write_archive(path: str, count: int, pad_bytes: int) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for seed in range(count):
+            archive.writestr(f"resumes/candidate_{seed:04d}.pdf",
+                             make_resume_pdf(2, seed=seed, padding=pad_bytes))
+
+
+def _legacy_resume_files(path: str) -> List:
+    """The intake path before streaming ingestion, kept for comparison."""
+    from smartmatch.batch import ResumeFile
+
+    with open(path, "rb") as handle:
+        data = handle.read()
+    resumes = []
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                resumes.append(ResumeFile(os.path.basename(info.filename), archive.read(info)))
+    return resumes
+
+
+def _child(mode: str, path: str) -> None:
+    """Screen one archive and print the measurements as JSON."""
+    from smartmatch.batch import count_resume_files, iter_resume_files, screen_resumes
+    from smartmatch.cache import ResultCache
+    from smartmatch.pdf_engine import PdfExtractionEngine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = PdfExtractionEngine(max_workers=1, cache=ResultCache(os.path.join(tmp, "text.sqlite3")))
+        engine.extract(make_resume_pdf(2, seed=10 ** 6))  # Load PyPDF2 before the baseline
+        baseline = _peak_rss_mb()
+        started = time.perf_counter()
+
+        def extract(resume):
+            return engine.extract(resume.data)
+
+        def analyze(resume_text: str, jd_text: str) -> Dict:
+            return {"match_percentage": 50, "missing_keywords": [], "profile_summary": "", "error": None}
+
+        with open(path, "rb") as handle:
+            if mode == "legacy":
+                resumes: Iterator = iter(_legacy_resume_files(path))
+                expected = None
+            else:
+                expected = count_resume_files([handle])
+                resumes = iter_resume_files([handle])
+            rows = list(screen_resumes(resumes, "Python engineer", extract, analyze, max_concurrency=8))
+
+    failed = sum(1 for row in rows if row["error"])
+    print(json.dumps({
+        "resumes": len(rows), "failed": failed, "counted": expected,
+        "peak_mb": _peak_rss_mb() - baseline, "seconds": time.perf_counter() - started
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="25,100,400", help="Comma-separated resumes per archive")
+    parser.add_argument("--pad-kb", type=int, default=256, help="Approximate size of each resume")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "ARCHIVE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"resumes of ~{args.pad_kb} KB; peak RSS above baseline (MB)")
+    print(f"{'resumes':>8} {'archive MB':>11} {'legacy':>9} {'streaming':>10} {'stream s':>9}")
+    streaming_peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"batch_{size}.zip")
+            _write_archive(path, size, args.pad_kb * 1024)
+            results = {}
+            for mode in MODES:
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_ingest_memory", "--child", mode, path],
+                    check=True, capture_output=True, text=True
+                ).stdout
+                results[mode] = json.loads(output.strip().splitlines()[-1])
+                if results[mode]["resumes"] != size or results[mode]["failed"]:
+                    sys.exit(f"{mode}: {results[mode]} for {size} resumes")
+            streaming_peaks.append(results["streaming"]["peak_mb"])
+            print(
+                f"{size:>8} {os.path.getsize(path) / (1024 * 1024):>11.1f} "
+                f"{results['legacy']['peak_mb']:>9.1f} {results['streaming']['peak_mb']:>10.1f} "
+                f"{results['streaming']['seconds']:>9.2f}"
+            )
+            os.remove(path)
+
+    growth = max(streaming_peaks) - min(streaming_peaks)
+    verdict = "PASS" if growth <= FLAT_TOLERANCE_MB else "FAIL"
+    print(f"streaming peak growth across batch sizes: {growth:.1f} MB "
+          f"(tolerance {FLAT_TOLERANCE_MB:g} MB) {verdict}")
+    if verdict == "FAIL":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
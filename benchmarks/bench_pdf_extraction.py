@@ -0,0 +1,70 @@
+"""
+Benchmark: serial PDF extraction vs. the parallel, cached extraction engine.
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction [--repeat 5] [--workers N]
+
+For 1-, 5- and 20-page synthetic resumes it reports:
+- serial:  the original single-threaded PyPDF2 loop
+- engine:  parallel page extraction with a cold text cache
+- cached:  a repeat extraction of the same file (SHA-256 cache hit)
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks._synthetic import make_resume_pdf
+from smartmatch.cache import ResultCache
+from smartmatch.pdf_engine import PdfExtractionEngine, extract_text_serial
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = PdfExtractionEngine(
+            max_workers=args.workers,
+            min_pages_for_pool=1,
+            cache=ResultCache(os.path.join(tmp, "bench.sqlite3"))
+        )
+        # Warm the pool so process start-up is not billed to the first document
+        engine.extract(make_resume_pdf(2, seed=999))
+
+        print(f"workers={engine.max_workers} repeat={args.repeat} (median ms)")
+        print(f"{'pages':>5} {'serial':>10} {'engine':>10} {'cached':>10} {'speedup':>8}")
+        for page_count in (1, 5, 20):
+            documents = [make_resume_pdf(page_count, seed=seed) for seed in range(args.repeat)]
+
+            serial_ms = _time_ms(lambda: extract_text_serial(documents[0]), args.repeat)
+
+            # Fresh documents each round so the text cache is always cold
+            remaining = iter(documents)
+            engine_ms = _time_ms(lambda: engine.extract(next(remaining)), args.repeat)
+
+            cached_ms = _time_ms(lambda: engine.extract(documents[0]), args.repeat)
+
+            print(
+                f"{page_count:>5} {serial_ms:>10.1f} {engine_ms:>10.1f} "
+                f"{cached_ms:>10.2f} {serial_ms / engine_ms:>7.1f}x"
+            )
+
+        engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Benchmark: offline regression suite for scoring latency, throughput and stability.
+
+Usage:
+    python -m benchmarks.bench_regression [--workers 1,4,16] [--repeats 3] [--out PATH]
+    python -m benchmarks.bench_regression --record [--provider groq|mock]
+    python -m benchmarks.compare_reports BASE.json NEW.json
+
+Scores a fixed corpus (synthetic resume PDFs x job descriptions) with
+extract_text_from_pdf and analyze_resume_with_llm, replaying the model's
+answers from benchmarks/fixtures/llm_responses.json, and writes a JSON report
+(default benchmarks/reports/<commit>.json):
+- stages:     p50/p95/mean of each telemetry stage (pdf_extract, prepare,
+              queue_wait, llm_call, parse, analysis), one analysis at a time
+- throughput: analyses per second with N concurrent workers
+- stability:  each pair is scored --repeats times; score spread and
+              missing-keyword agreement across repeats
+- scores:     per-pair scores, for drift between reports
+- tokens:     mean prompt/completion tokens per call
+
+The suite runs in a child process with an empty cache directory, so no
+extraction or analysis is served from a cache.
+
+Changing SYSTEM_PROMPT, the truncation budgets or the corpus changes the
+requests, which then have no recording ("fixture misses"). Re-record with
+--record (GROQ_API_KEY must be set for --provider groq), or pass
+--on-miss mock to answer misses with the mock provider. The checked-in
+fixtures were recorded from the mock provider with a simulated 250 ms
+latency; record against Groq with --repeats 3 to capture real latency and
+score variance.
+"""
+
+import argparse
+import concurrent.futures
+import datetime
+import hashlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks._replay import FIXTURES_PATH, RecordingProvider, ReplayProvider, load_fixtures, save_fixtures
+from benchmarks._synthetic import make_jd_text, make_resume_pdf
+from smartmatch.core import (
+    JD_TOKEN_BUDGET, RESUME_TOKEN_BUDGET, SYSTEM_PROMPT, TEMPERATURE,
+    analyze_resume_with_llm, extract_text_from_pdf, resolve_model
+)
+from smartmatch.providers import GroqProvider, MockProvider, set_default_provider
+from smartmatch.telemetry import get_telemetry
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORTS_DIR = os.path.join(REPO_DIR, "benchmarks", "reports")
+REPORT_VERSION = 1
+RECORD_MOCK_LATENCY = 0.25  # Seconds per call when recording from the mock provider
+
+
+def _corpus(resume_count: int, jd_count: int) -> Tuple[List[Tuple[str, bytes]], List[Tuple[str, str]]]:
+    """Resume PDFs of 1-3 pages and varied density (longer ones exceed the token budget)."""
+    resumes = [(f"resume-{seed:02d}", make_resume_pdf(1 + seed % 3, seed=seed, lines_per_page=20 + seed * 7 % 35))
+               for seed in range(resume_count)]
+    jds = [(f"jd-{index}", make_jd_text(100 + index)) for index in range(jd_count)]
+    return resumes, jds
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+def _keyword_agreement(keyword_sets: List[set]) -> float:
+    """Keywords reported in every repeat / keywords reported in any (1.0 if none)."""
+    union = set().union(*keyword_sets)
+    return len(set.intersection(*keyword_sets)) / len(union) if union else 1.0
+
+
+def _stability(scores: Dict[str, List[int]], keywords: Dict[str, List[set]], repeats: int) -> Dict:
+    scored = {pair: values for pair, values in scores.items() if values}
+    spreads = [max(values) - min(values) for values in scored.values()]
+    agreements = [_keyword_agreement(sets) for sets in keywords.values() if sets]
+    return {
+        "repeats": repeats,
+        "pairs": len(scored),
+        "unstable_pairs": sum(1 for spread in spreads if spread),
+        "mean_stdev": round(statistics.mean(statistics.pstdev(values) for values in scored.values()), 2)
+        if scored else 0.0,
+        "max_spread": max(spreads, default=0),
+        "keyword_agreement": round(statistics.mean(agreements), 3) if agreements else 1.0,
+    }
+
+
+def _throughput(pairs: List[Tuple[str, str]], workers: int, model: str) -> Dict:
+    telemetry = get_telemetry()
+    telemetry.reset()
+
+    def one(pair: Tuple[str, str]) -> Dict:
+        return analyze_resume_with_llm(pair[0], pair[1], "", use_cache=False, model=model)
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(one, pairs))
+    seconds = time.perf_counter() - started
+    analysis = telemetry.snapshot().get("analysis", {})
+    return {
+        "workers": workers,
+        "analyses": len(pairs),
+        "seconds": round(seconds, 3),
+        "per_second": round(len(pairs) / seconds, 2),
+        "p50_ms": analysis.get("p50_ms"),
+        "p95_ms": analysis.get("p95_ms"),
+        "errors": sum(1 for result in results if result["error"]),
+    }
+
+
+def _child(args: argparse.Namespace) -> None:
+    """Run the suite (cache directory already isolated) and print the report as JSON."""
+    if args.record:
+        live = MockProvider(latency=RECORD_MOCK_LATENCY) if args.provider == "mock" \
+            else GroqProvider(os.environ.get("GROQ_API_KEY", ""))
+        problem = live.check()
+        if problem:
+            sys.exit(problem)
+        provider = RecordingProvider(live)
+    else:
+        fixtures = load_fixtures(args.fixtures)
+        provider = ReplayProvider(fixtures["responses"], latency=args.latency,
+                                  fallback=MockProvider(latency=0) if args.on_miss == "mock" else None)
+    set_default_provider(provider)
+    telemetry = get_telemetry()
+    telemetry.reset()
+    model = resolve_model(args.model)
+
+    resumes, jds = _corpus(args.resumes, args.jds)
+    texts = {}
+    for name, pdf in resumes:
+        text, error = extract_text_from_pdf(pdf)
+        if error:
+            sys.exit(f"{name}: {error}")
+        texts[name] = text
+
+    scores: Dict[str, List[int]] = {}
+    keywords: Dict[str, List[set]] = {}
+    errors = 0
+    for repeat in range(args.repeats):
+        print(f"pass {repeat + 1}/{args.repeats}", file=sys.stderr)
+        for resume_name, text in texts.items():
+            for jd_name, jd_text in jds:
+                pair = f"{resume_name}/{jd_name}"
+                result = analyze_resume_with_llm(text, jd_text, "", use_cache=False, model=model)
+                scores.setdefault(pair, [])
+                keywords.setdefault(pair, [])
+                if result["error"]:
+                    errors += 1
+                    continue
+                scores[pair].append(result["match_percentage"])
+                keywords[pair].append({keyword.lower() for keyword in result["missing_keywords"]})
+    stages = telemetry.snapshot()
+    calls = max(provider.calls, 1)
+    tokens = {
+        "prompt_mean": round(provider.prompt_tokens / calls, 1),
+        "completion_mean": round(provider.completion_tokens / calls, 1),
+    }
+
+    throughput = []
+    if args.record:
+        save_fixtures(
+            args.fixtures, provider.responses,
+            recorded_with=args.provider, recorded_at=_now(), model=model,
+            repeats=args.repeats, resumes=args.resumes, jds=args.jds
+        )
+    else:
+        pairs = [(text, jd_text) for text in texts.values() for _, jd_text in jds]
+        for workers in args.workers:
+            print(f"throughput with {workers} workers", file=sys.stderr)
+            throughput.append(_throughput(pairs, workers, model))
+
+    print(json.dumps({
+        "config": {
+            "provider": f"{args.provider} (recording)" if args.record else "replay",
+            "model": model,
+            "temperature": TEMPERATURE,
+            "jd_token_budget": JD_TOKEN_BUDGET,
+            "resume_token_budget": RESUME_TOKEN_BUDGET,
+            "system_prompt_sha256": hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16],
+            "resumes": args.resumes,
+            "jds": args.jds,
+            "latency": args.latency,
+            "on_miss": args.on_miss,
+        },
+        "stages": stages,
+        "throughput": throughput,
+        "stability": _stability(scores, keywords, args.repeats),
+        "tokens": tokens,
+        "errors": errors,
+        "fixture_misses": getattr(provider, "misses", 0),
+        "scores": scores,
+    }))
+
+
+def _print_summary(report: Dict) -> None:
+    print(f"{'stage':<12} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<12} {stats['count']:>6} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+              f"{stats['mean_ms']:>8.1f}")
+    for run in report["throughput"]:
+        print(f"workers={run['workers']:<3} {run['per_second']:>7.2f} analyses/s  "
+              f"p95={run['p95_ms']}ms  errors={run['errors']}")
+    stability = report["stability"]
+    print(f"stability: {stability['unstable_pairs']}/{stability['pairs']} pairs changed score across "
+          f"{stability['repeats']} repeats (max spread {stability['max_spread']}, mean stdev "
+          f"{stability['mean_stdev']}), keyword agreement {stability['keyword_agreement']:.0%}")
+    print(f"tokens/call: prompt={report['tokens']['prompt_mean']} "
+          f"completion={report['tokens']['completion_mean']}  errors={report['errors']}")
+    if report["fixture_misses"]:
+        print(f"{report['fixture_misses']} requests had no recorded response; re-record the fixtures "
+              f"with --record or pass --on-miss mock")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="1,4,16", help="Comma-separated worker counts for throughput")
+    parser.add_argument("--repeats", type=int, default=3, help="Scoring passes over the corpus")
+    parser.add_argument("--resumes", type=int, default=16)
+    parser.add_argument("--jds", type=int, default=3)
+    parser.add_argument("--model", default="accurate", help="Route name or model id")
+    parser.add_argument("--latency", type=float, default=None,
+                        help="Seconds per replayed call (default: the recorded latency)")
+    parser.add_argument("--on-miss", choices=["error", "mock"], default="error")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    parser.add_argument("--out", help="Report path (default benchmarks/reports/<commit>.json)")
+    parser.add_argument("--record", action="store_true", help="Call a live provider and rewrite --fixtures")
+    parser.add_argument("--provider", choices=["groq", "mock"], default="groq", help="Provider to record from")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.workers = [int(workers) for workers in args.workers.split(",")]
+
+    if args.child:
+        _child(args)
+        return
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SMARTMATCH_CACHE_DIR=tmp)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_regression", "--child", *sys.argv[1:]],
+            check=True, stdout=subprocess.PIPE, text=True, env=env
+        ).stdout
+    report = json.loads(output.strip().splitlines()[-1])
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    recording = {key: value for key, value in load_fixtures(args.fixtures).items() if key != "responses"}
+    report = dict({"version": REPORT_VERSION, "meta": {
+        "commit": commit,
+        "dirty": dirty,
+        "created": _now(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seconds": round(time.perf_counter() - started, 1),
+        "fixtures": os.path.relpath(args.fixtures, REPO_DIR),
+        "recording": recording,
+    }}, **report)
+
+    _print_summary(report)
+    out = args.out or os.path.join(REPORTS_DIR, f"{commit or 'report'}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=1)
+        handle.write("\n")
+    print(f"report: {os.path.relpath(out)}")
+    if args.record:
+        print(f"fixtures: {os.path.relpath(args.fixtures)}")
+
+
+if __name__ == "__main__":
+    main()
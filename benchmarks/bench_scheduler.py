@@ -0,0 +1,98 @@
+"""
+Stress test: the rate-limit scheduler against a stub server that injects 429s.
+
+Usage:
+    python -m benchmarks.bench_scheduler [--batch 40] [--interactive 5] [--rpm 8] [--window 1]
+
+A burst of batch requests is queued first, then interactive requests arrive.
+The request budget (--rpm requests per --window seconds) is far below the
+burst, so the interactive requests find a backlog of batch requests already
+waiting: with working priority lanes they are admitted in the next window,
+in FIFO order they would wait behind the whole backlog. The stub answers
+every Nth request with HTTP 429 + retry-after. The run passes when every
+request eventually succeeds, the backlog was real, and interactive requests
+wait less than half as long as batch requests on average.
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+
+from groq import Groq
+
+from benchmarks._mock_llm import MockLLMServer
+from smartmatch.scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, RateLimitScheduler
+
+MESSAGES = [{"role": "user", "content": "Analyze this resume against the job description."}]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch", type=int, default=40)
+    parser.add_argument("--interactive", type=int, default=5)
+    parser.add_argument("--rpm", type=int, default=8, help="Requests admitted per budget window")
+    parser.add_argument("--window", type=float, default=1.0, help="Budget window in seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=4)
+    args = parser.parse_args()
+
+    with MockLLMServer(latency=0.02, rate_limit_every=args.rate_limit_every, retry_after=0.2) as server:
+        client = Groq(api_key="mock", base_url=server.base_url, max_retries=0)
+        scheduler = RateLimitScheduler(requests_per_minute=args.rpm, base_delay=0.1, max_delay=2.0,
+                                       window=args.window)
+        latencies = {PRIORITY_BATCH: [], PRIORITY_INTERACTIVE: []}
+        errors = []
+        lock = threading.Lock()
+
+        def call(priority: int) -> None:
+            started = time.perf_counter()
+            try:
+                scheduler.run(
+                    lambda: client.chat.completions.with_raw_response.create(
+                        messages=MESSAGES, model="llama-3.3-70b-versatile", max_tokens=100
+                    ),
+                    tokens=150,
+                    priority=priority
+                ).parse()
+            except Exception as error:
+                with lock:
+                    errors.append(error)
+                return
+            with lock:
+                latencies[priority].append(time.perf_counter() - started)
+
+        threads = [threading.Thread(target=call, args=(PRIORITY_BATCH,)) for _ in range(args.batch)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)  # Let the batch backlog build up
+        backlog = scheduler.stats()["queued"]
+        interactive = [threading.Thread(target=call, args=(PRIORITY_INTERACTIVE,))
+                       for _ in range(args.interactive)]
+        for thread in interactive:
+            thread.start()
+        for thread in threads + interactive:
+            thread.join()
+
+        stats = scheduler.stats()
+        print(f"server requests={server.request_count} (429 every {args.rate_limit_every})")
+        print(f"scheduler: {stats}")
+        print(f"batch requests queued when the interactive ones arrived: {backlog}")
+        for label, priority in (("batch", PRIORITY_BATCH), ("interactive", PRIORITY_INTERACTIVE)):
+            samples = latencies[priority]
+            if samples:
+                print(f"{label:<12} n={len(samples):3d} mean={statistics.mean(samples):6.2f}s "
+                      f"max={max(samples):6.2f}s")
+
+        ok = (
+            not errors
+            and stats["rate_limited"] > 0
+            and backlog >= 2 * args.rpm
+            and statistics.mean(latencies[PRIORITY_INTERACTIVE]) < statistics.mean(latencies[PRIORITY_BATCH]) / 2
+        )
+        print("PASS" if ok else f"FAIL ({len(errors)} errors)")
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: semantic resume index (smartmatch.semantic_index).
+
+Usage:
+    python -m benchmarks.bench_semantic_index [--docs 100000] [--queries 50] [--top 20]
+
+Builds an index of synthetic resumes in a temporary directory, then reports
+add throughput, query latency (p50/p95) at full size, the latency of an
+incremental add, and a recall sanity check: a JD built from one resume's own
+skills should rank that resume in the top N.
+"""
+
+import argparse
+import tempfile
+import time
+from typing import List
+
+from benchmarks._synthetic import make_jd_text, make_resume_text
+from smartmatch.semantic_index import HashingEmbedder, SemanticIndex
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=30, help="Lines per synthetic resume")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = SemanticIndex(index_dir, embedder=HashingEmbedder())
+
+        started = time.perf_counter()
+        index.add_many((f"resume-{n}", make_resume_text(n, args.lines)) for n in range(args.docs))
+        build_seconds = time.perf_counter() - started
+        print(f"indexed {len(index)} resumes in {build_seconds:.1f}s "
+              f"({len(index) / build_seconds:.0f} docs/s, dim={index.dim})")
+
+        query_times = []
+        for seed in range(args.queries):
+            jd_text = make_jd_text(seed)
+            started = time.perf_counter()
+            index.search(jd_text, args.top)
+            query_times.append(time.perf_counter() - started)
+        print(f"search top-{args.top} over {len(index)}: "
+              f"p50={_percentile(query_times, 50) * 1000:.1f}ms "
+              f"p95={_percentile(query_times, 95) * 1000:.1f}ms")
+
+        started = time.perf_counter()
+        index.add("resume-new", make_resume_text(args.docs + 1, args.lines))
+        print(f"incremental add: {(time.perf_counter() - started) * 1000:.1f}ms")
+        index.close()
+
+        # Reopening maps the existing file instead of rebuilding anything
+        started = time.perf_counter()
+        reopened = SemanticIndex(index_dir, embedder=HashingEmbedder())
+        print(f"reopen: {(time.perf_counter() - started) * 1000:.0f}ms ({len(reopened)} resumes)")
+
+        hits = 0
+        probes = min(20, args.docs)
+        for n in range(probes):
+            resume_text = make_resume_text(n, args.lines)
+            ids = [hit.doc_id for hit in reopened.search(resume_text, args.top)]
+            hits += f"resume-{n}" in ids
+        print(f"self-retrieval: {hits}/{probes} resumes found in their own top-{args.top}")
+        reopened.close()
+
+
+if __name__ == "__main__":
+    main()
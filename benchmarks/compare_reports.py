@@ -0,0 +1,142 @@
+"""
+Compare two bench_regression reports and flag regressions.
+
+Usage:
+    python -m benchmarks.compare_reports BASE.json NEW.json
+        [--max-slowdown 1.25] [--max-score-drift 2.0]
+
+Prints, old -> new:
+- per-stage p50/p95 (a stage regresses when its p50 grows by more than
+  --max-slowdown and by at least NOISE_FLOOR_MS)
+- throughput per worker count (regresses when it drops by the same factor)
+- score drift on the pairs both reports scored: mean and max absolute change
+  of each pair's mean score, and the Spearman rank correlation
+- stability (pairs whose score changed across repeats), errors and fixture misses
+
+Exits with status 1 if anything regressed. Timings are only comparable
+between reports from the same machine; score drift is comparable anywhere.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from typing import Dict, List
+
+NOISE_FLOOR_MS = 2.0  # Smaller p50 changes are timing noise
+
+
+def _load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _ranks(values: List[float]) -> List[float]:
+    """Ranks from 1, ties sharing their average rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for position in range(start, end + 1):
+            ranks[order[position]] = (start + end) / 2 + 1
+        start = end + 1
+    return ranks
+
+
+def spearman(first: List[float], second: List[float]) -> float:
+    """Spearman rank correlation (1.0 when either side is constant)."""
+    first_ranks, second_ranks = _ranks(first), _ranks(second)
+    first_mean, second_mean = statistics.mean(first_ranks), statistics.mean(second_ranks)
+    covariance = sum((a - first_mean) * (b - second_mean) for a, b in zip(first_ranks, second_ranks))
+    spread = (sum((a - first_mean) ** 2 for a in first_ranks)
+              * sum((b - second_mean) ** 2 for b in second_ranks)) ** 0.5
+    return covariance / spread if spread else 1.0
+
+
+def _label(report: Dict) -> str:
+    meta = report.get("meta", {})
+    return f"{meta.get('commit') or '?'}{'-dirty' if meta.get('dirty') else ''}"
+
+
+def compare(base: Dict, new: Dict, max_slowdown: float, max_score_drift: float) -> List[str]:
+    """
+    Print the comparison of two reports.
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    regressions = []
+    print(f"{_label(base)} -> {_label(new)}")
+    if base["config"] != new["config"]:
+        changed = sorted(key for key in set(base["config"]) | set(new["config"])
+                         if base["config"].get(key) != new["config"].get(key))
+        print(f"config changed: {', '.join(changed)}")
+
+    print(f"{'stage':<12} {'p50 ms':>17} {'p95 ms':>17}")
+    for stage in sorted(set(base["stages"]) & set(new["stages"])):
+        old, current = base["stages"][stage], new["stages"][stage]
+        print(f"{stage:<12} {old['p50_ms']:>7.1f} -> {current['p50_ms']:<7.1f} "
+              f"{old['p95_ms']:>7.1f} -> {current['p95_ms']:.1f}")
+        if (current["p50_ms"] > old["p50_ms"] * max_slowdown
+                and current["p50_ms"] - old["p50_ms"] >= NOISE_FLOOR_MS):
+            regressions.append(f"{stage} p50 {old['p50_ms']:.1f} -> {current['p50_ms']:.1f} ms")
+
+    old_runs = {run["workers"]: run for run in base["throughput"]}
+    for run in new["throughput"]:
+        old = old_runs.get(run["workers"])
+        if old is None:
+            continue
+        print(f"workers={run['workers']:<3} {old['per_second']:>7.2f} -> {run['per_second']:<7.2f} analyses/s")
+        if run["per_second"] * max_slowdown < old["per_second"]:
+            regressions.append(f"throughput with {run['workers']} workers "
+                               f"{old['per_second']:.2f} -> {run['per_second']:.2f}/s")
+
+    pairs = sorted(pair for pair in set(base["scores"]) & set(new["scores"])
+                   if base["scores"][pair] and new["scores"][pair])
+    if pairs:
+        old_means = [statistics.mean(base["scores"][pair]) for pair in pairs]
+        new_means = [statistics.mean(new["scores"][pair]) for pair in pairs]
+        drifts = [abs(a - b) for a, b in zip(old_means, new_means)]
+        mean_drift = statistics.mean(drifts)
+        print(f"scores ({len(pairs)} pairs): mean |drift| {mean_drift:.2f}, max {max(drifts):.1f}, "
+              f"{sum(1 for drift in drifts if drift)} changed, "
+              f"rank correlation {spearman(old_means, new_means):.3f}")
+        if mean_drift > max_score_drift:
+            regressions.append(f"mean score drift {mean_drift:.2f} > {max_score_drift:g}")
+
+    old_stability, stability = base["stability"], new["stability"]
+    print(f"unstable pairs {old_stability['unstable_pairs']} -> {stability['unstable_pairs']}, "
+          f"mean stdev {old_stability['mean_stdev']} -> {stability['mean_stdev']}, "
+          f"keyword agreement {old_stability['keyword_agreement']:.0%} -> {stability['keyword_agreement']:.0%}")
+    if stability["unstable_pairs"] > old_stability["unstable_pairs"]:
+        regressions.append(f"unstable pairs {old_stability['unstable_pairs']} -> {stability['unstable_pairs']}")
+    print(f"tokens/call prompt {base['tokens']['prompt_mean']} -> {new['tokens']['prompt_mean']}, "
+          f"completion {base['tokens']['completion_mean']} -> {new['tokens']['completion_mean']}")
+
+    for key in ("errors", "fixture_misses"):
+        print(f"{key} {base[key]} -> {new[key]}")
+        if new[key] > base[key]:
+            regressions.append(f"{key} {base[key]} -> {new[key]}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--max-slowdown", type=float, default=1.25, help="Allowed p50/throughput factor")
+    parser.add_argument("--max-score-drift", type=float, default=2.0, help="Allowed mean score change")
+    args = parser.parse_args()
+
+    regressions = compare(_load(args.base), _load(args.new), args.max_slowdown, args.max_score_drift)
+    if regressions:
+        print("REGRESSION: " + "; ".join(regressions))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Load test: the headless service (smartmatch.service) against a mock LLM.
+
+Usage:
+    python -m benchmarks.loadtest_service [--requests 400] [--concurrency 32]
+        [--mode sync|jobs] [--workers 2] [--latency 0.3] [--pdf]
+
+Starts a local mock of the Groq API, launches `python -m smartmatch.service`
+pointed at it (GROQ_BASE_URL) with a throwaway cache/queue directory, then
+drives it from client threads over keep-alive connections.
+
+- sync: every request is a POST /v1/analyze; latency is the response time
+- jobs: every request is a POST /v1/jobs followed by polling GET /v1/jobs/<id>;
+  latency is submit-to-done
+
+A warm-up round (--warmup requests, untimed) runs first so worker start-up
+and first-use imports are not counted. Reports p50/p95/p99 latency, throughput and error counts. The result cache is
+disabled per request so every analysis reaches the (mock) LLM. The mock
+advertises generous rate limits (--tpm) so the run measures the service rather
+than the scheduler's pacing.
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks._mock_llm import MockLLMServer
+from benchmarks._synthetic import make_jd_text, make_resume_pdf, make_resume_text
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(conn: http.client.HTTPConnection, method: str, path: str,
+             body: Optional[Dict] = None) -> Tuple[int, Dict]:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    headers = {"Content-Type": "application/json"} if data is not None else {}
+    conn.request(method, path, body=data, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def _wait_until_healthy(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            status, _ = _request(conn, "GET", "/healthz")
+            conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("service did not become healthy")
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _make_payloads(count: int, pdf: bool) -> List[Dict]:
+    jd_text = make_jd_text(7)
+    payloads = []
+    for index in range(count):
+        payload = {"jd_text": jd_text, "candidate": f"candidate-{index}", "use_cache": False}
+        if pdf:
+            data = make_resume_pdf(page_count=2, seed=index)
+            payload["resume_pdf_base64"] = base64.b64encode(data).decode("ascii")
+        else:
+            payload["resume_text"] = make_resume_text(index, 60)
+        payloads.append(payload)
+    return payloads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mode", choices=["sync", "jobs"], default="sync")
+    parser.add_argument("--workers", type=int, default=2, help="Service worker processes (jobs mode)")
+    parser.add_argument("--threads-per-worker", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.3, help="Mock LLM latency in seconds")
+    parser.add_argument("--tpm", type=int, default=100_000_000,
+                        help="Tokens-per-minute limit the mock advertises")
+    parser.add_argument("--warmup", type=int, default=64, help="Untimed requests sent first")
+    parser.add_argument("--pdf", action="store_true", help="Send base64 PDFs instead of text")
+    args = parser.parse_args()
+
+    payloads = _make_payloads(args.warmup + args.requests, args.pdf)
+    port = _free_port()
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    with MockLLMServer(latency=args.latency, requests_per_minute=10 ** 9,
+                       tokens_per_minute=args.tpm) as llm, tempfile.TemporaryDirectory() as state_dir:
+        env = dict(os.environ, GROQ_API_KEY="mock", GROQ_BASE_URL=llm.base_url,
+                   SMARTMATCH_CACHE_DIR=state_dir, SMARTMATCH_HTTP_POOL_SIZE=str(args.concurrency * 2))
+        service = subprocess.Popen(
+            [sys.executable, "-m", "smartmatch.service", "--port", str(port),
+             "--workers", str(args.workers if args.mode == "jobs" else 0),
+             "--threads-per-worker", str(args.threads_per_worker), "--log-level", "WARNING"],
+            env=env
+        )
+        try:
+            _wait_until_healthy(port)
+
+            def client(next_index, record: bool) -> None:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                while True:
+                    with lock:
+                        index = next(next_index, None)
+                    if index is None:
+                        break
+                    started = time.perf_counter()
+                    try:
+                        if args.mode == "sync":
+                            status, body = _request(conn, "POST", "/v1/analyze", payloads[index])
+                            error = None if status == 200 else body.get("error", str(status))
+                            if error is None and body["analysis"].get("error"):
+                                error = body["analysis"]["error"]
+                        else:
+                            status, body = _request(conn, "POST", "/v1/jobs", payloads[index])
+                            job_url = body["url"]
+                            while True:
+                                status, job = _request(conn, "GET", job_url)
+                                if job["status"] in ("done", "failed"):
+                                    break
+                                time.sleep(0.02)
+                            error = job["error"] or job["result"]["analysis"].get("error")
+                    except Exception as e:
+                        conn.close()
+                        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                        error = type(e).__name__
+                    elapsed = time.perf_counter() - started
+                    if not record:
+                        continue
+                    with lock:
+                        if error:
+                            errors[error] = errors.get(error, 0) + 1
+                        else:
+                            latencies.append(elapsed)
+                conn.close()
+
+            def run_phase(indices: range, record: bool) -> float:
+                next_index = iter(indices)
+                started = time.perf_counter()
+                threads = [threading.Thread(target=client, args=(next_index, record))
+                           for _ in range(args.concurrency)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                return time.perf_counter() - started
+
+            run_phase(range(args.warmup), record=False)
+            wall = run_phase(range(args.warmup, len(payloads)), record=True)
+        finally:
+            service.terminate()
+            service.wait(timeout=30)
+
+        print(f"mode={args.mode} requests={args.requests} concurrency={args.concurrency} "
+              f"mock_latency={args.latency}s pdf={args.pdf} llm_calls={llm.request_count} "
+              f"(incl. {args.warmup} warm-up)")
+
+    if latencies:
+        print(f"ok={len(latencies)} errors={sum(errors.values())} wall={wall:.2f}s "
+              f"throughput={len(latencies) / wall:.1f} req/s")
+        print(f"latency p50={_percentile(latencies, 50) * 1000:.0f}ms "
+              f"p95={_percentile(latencies, 95) * 1000:.0f}ms "
+              f"p99={_percentile(latencies, 99) * 1000:.0f}ms "
+              f"mean={statistics.mean(latencies) * 1000:.0f}ms")
+    for message, count in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"  {count:5d} x {message}")
+    sys.exit(0 if latencies and not errors else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+================================================================================
+SmartMatch AI - Core Package
+================================================================================
+
+Streamlit-free building blocks used by the SmartMatch AI dashboard (`app.py`).
+
+Modules:
+- cache: Persistent, content-addressed cache for LLM analysis results
+- core: Analysis API (sync, streaming and asyncio) with no Streamlit dependency
+- dedup: Duplicate and near-duplicate resume detection (MinHash + LSH)
+- client: Process-wide pooled Groq client (keep-alive, HTTP/2)
+- providers: Pluggable LLM backends (Groq, offline mock) behind one interface
+- quality: Resume hygiene checks, single and columnar batch
+- ratelimit: Client-side per-minute request/token budgets
+- revisions: Incremental re-analysis of revised resumes from section diffs
+- batch: Concurrent screening of many resumes against one job description
+- history: Persistent, indexed analysis history with paging and CSV/Parquet export
+- jobs: SQLite-backed job queue for the headless service
+- jd_profile: Compact, cached job description profiles shared across candidates
+- multi_jd: One resume against many job descriptions, ranked
+- ocr: Background OCR fallback (Tesseract) for scanned PDFs
+- pdf_engine: Parallel, cached, page-level PDF text extraction
+- prescore: Local BM25 pre-scorer that short-circuits obvious mismatches
+- scheduler: Rate-limit aware request queue with retry, backoff and priority lanes
+- semantic_index: Offline vector index of resumes for instant candidate search
+- service: Headless HTTP service (`python -m smartmatch.service`)
+- streaming: Incremental JSON parsing of streamed model output
+- structured: Tolerant JSON parsing and schema validation of model answers
+- telemetry: Per-stage latency spans, JSON span logs and Prometheus metrics
+- truncation: Token-aware, relevance-ranked packing of JD/resume text
+
+Submodules are imported lazily (PEP 562): `from smartmatch import X` loads
+only the module that defines X, which keeps cold-start import time low.
+================================================================================
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> defining submodule
+_EXPORTS: Dict[str, str] = {
+    "BatchStats": "batch",
+    "ResumeFile": "batch",
+    "count_resume_files": "batch",
+    "iter_resume_files": "batch",
+    "rank_results": "batch",
+    "screen_resumes": "batch",
+    "analyze_resume_async": "core",
+    "analyze_resume_cascade": "core",
+    "analyze_resume_cascade_async": "core",
+    "analyze_resume_with_llm": "core",
+    "extract_text_from_pdf": "core",
+    "extract_text_from_pdf_async": "core",
+    "resolve_model": "core",
+    "stream_resume_analysis": "core",
+    "DuplicateIndex": "dedup",
+    "DuplicateMatch": "dedup",
+    "analyze_with_dedup": "dedup",
+    "fingerprint": "dedup",
+    "get_duplicate_index": "dedup",
+    "ResultCache": "cache",
+    "get_default_cache": "cache",
+    "make_cache_key": "cache",
+    "GroqClientManager": "client",
+    "get_client_manager": "client",
+    "HistoryEntry": "history",
+    "HistoryFilter": "history",
+    "HistoryStore": "history",
+    "content_hash": "history",
+    "get_history_store": "history",
+    "JDProfile": "jd_profile",
+    "build_jd_profile": "jd_profile",
+    "get_jd_profile": "jd_profile",
+    "JobQueue": "jobs",
+    "match_resume_to_jds": "multi_jd",
+    "prefilter_jds": "multi_jd",
+    "split_job_descriptions": "multi_jd",
+    "OcrJob": "ocr",
+    "OcrPool": "ocr",
+    "extract_text_with_ocr": "ocr",
+    "get_ocr_pool": "ocr",
+    "ocr_available": "ocr",
+    "PdfExtractionEngine": "pdf_engine",
+    "extract_text_serial": "pdf_engine",
+    "get_pdf_engine": "pdf_engine",
+    "JDTermModel": "prescore",
+    "PreScore": "prescore",
+    "get_jd_term_model": "prescore",
+    "local_result": "prescore",
+    "prescore_resume": "prescore",
+    "QualitySignals": "quality",
+    "check_quality_batch": "quality",
+    "check_resume_quality": "quality",
+    "scan_resume": "quality",
+    "Completion": "providers",
+    "GroqProvider": "providers",
+    "LLMProvider": "providers",
+    "MockProvider": "providers",
+    "ProviderError": "providers",
+    "get_provider": "providers",
+    "set_default_provider": "providers",
+    "SlidingWindowBudget": "ratelimit",
+    "estimate_tokens": "ratelimit",
+    "RevisionDiff": "revisions",
+    "analyze_resume_revision": "revisions",
+    "candidate_key": "revisions",
+    "diff_sections": "revisions",
+    "PRIORITY_BATCH": "scheduler",
+    "PRIORITY_INTERACTIVE": "scheduler",
+    "RateLimitScheduler": "scheduler",
+    "get_scheduler": "scheduler",
+    "HashingEmbedder": "semantic_index",
+    "SearchHit": "semantic_index",
+    "SemanticIndex": "semantic_index",
+    "get_embedder": "semantic_index",
+    "IncrementalJSONParser": "streaming",
+    "ANALYSIS_SCHEMA": "structured",
+    "StructuredOutputError": "structured",
+    "parse_analysis": "structured",
+    "parse_json_lenient": "structured",
+    "validate_analysis": "structured",
+    "Telemetry": "telemetry",
+    "configure_json_logging": "telemetry",
+    "get_telemetry": "telemetry",
+    "count_tokens": "truncation",
+    "pack_jd": "truncation",
+    "pack_resume": "truncation",
+    "prepare_prompt_texts": "truncation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,359 @@
+"""
+================================================================================
+SmartMatch AI - Batch Screening
+================================================================================
+
+Screen one job description against many resumes with a bounded pool of
+concurrent LLM calls.
+
+- Accepts PDFs and ZIP archives of PDFs; archives are read one member at a
+  time through spooled temp files, so memory stays flat however many
+  resumes a batch holds
+- At most `max_concurrency` analyses run at once
+- Optional tokens-per-minute budget keeps the batch under the provider quota;
+  only actual model calls are charged, not cache or duplicate hits
+- Optional local pre-screen skips the LLM (and the budget) for obvious mismatches
+- A resume whose analysis raises gets an error row; the batch carries on
+- Results are yielded as soon as each resume finishes, so the UI can stream a
+  ranked table instead of waiting for the whole batch
+================================================================================
+"""
+
+import concurrent.futures
+import os
+import tempfile
+import time
+import zipfile
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from smartmatch.history import content_hash
+from smartmatch.pdf_engine import DEFAULT_MAX_FILE_BYTES, file_too_large_error
+from smartmatch.prescore import local_result, prescore_resume
+from smartmatch.ratelimit import SlidingWindowBudget, call_budget
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_MAX_CONCURRENCY = 8
+# Spooled archive members stay in memory up to this size, then move to disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+COPY_CHUNK_BYTES = 256 * 1024
+
+
+class ResumeFile(NamedTuple):
+    """A single resume document queued for screening."""
+    name: str
+    # Raw bytes, the uploaded file itself, or a spooled copy of an archive member
+    data: Union[bytes, BinaryIO]
+    error: Optional[str] = None  # Set instead of data when the file was rejected
+
+    def close(self) -> None:
+        """Release a spooled archive member (uploads are left to their owner)."""
+        if isinstance(self.data, tempfile.SpooledTemporaryFile):
+            self.data.close()
+
+
+# =============================================================================
+# INPUT COLLECTION
+# =============================================================================
+
+def _spool(stream: BinaryIO, max_bytes: int) -> Optional[BinaryIO]:
+    """
+    Copy a stream into a spooled temp file in chunks.
+
+    Returns:
+        The spooled file positioned at the start, or None if the stream is
+        larger than max_bytes (0 = no limit)
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    size = 0
+    for chunk in iter(lambda: stream.read(COPY_CHUNK_BYTES), b""):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            spooled.close()
+            return None
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def _is_resume_member(info: zipfile.ZipInfo) -> bool:
+    member = info.filename
+    return not info.is_dir() and not member.startswith("__MACOSX/") and member.lower().endswith(".pdf")
+
+
+def _seekable(upload) -> bool:
+    return getattr(upload, "seekable", lambda: False)()
+
+
+def iter_resume_files(uploads: Iterable, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> Iterator[ResumeFile]:
+    """
+    Expand uploaded files into individual PDF resumes, one document at a time.
+
+    Seekable uploads are passed on without being read. ZIP archives are
+    unpacked lazily: each PDF member is decompressed into a spooled temp file
+    only when the consumer asks for it; other members (and macOS resource
+    forks) are ignored. Files above max_bytes are yielded with an error
+    instead of data (the declared size is checked first, then the bytes
+    actually decompressed, so a forged header cannot bypass the limit).
+
+    Args:
+        uploads: File-like objects with .name and .read() (e.g. Streamlit UploadedFile)
+        max_bytes: Per-file size limit (0 = no limit)
+
+    Yields:
+        ResumeFile for each PDF found; call .close() once it is processed
+    """
+    for upload in uploads:
+        name = getattr(upload, "name", "resume.pdf")
+        if not _seekable(upload):
+            # ZipFile and PyPDF2 need to seek; spool the upload first
+            upload = _spool(upload, 0)
+
+        if not name.lower().endswith(".zip"):
+            upload.seek(0)
+            if max_bytes and upload.seek(0, os.SEEK_END) > max_bytes:
+                yield ResumeFile(name, b"", file_too_large_error(max_bytes))
+            else:
+                upload.seek(0)
+                yield ResumeFile(name, upload)
+            continue
+
+        with zipfile.ZipFile(upload) as archive:
+            for info in archive.infolist():
+                if not _is_resume_member(info):
+                    continue
+                member_name = os.path.basename(info.filename)
+                data = None
+                if not max_bytes or info.file_size <= max_bytes:
+                    with archive.open(info) as member:
+                        data = _spool(member, max_bytes)
+                if data is None:
+                    yield ResumeFile(member_name, b"", file_too_large_error(max_bytes))
+                else:
+                    yield ResumeFile(member_name, data)
+
+
+def count_resume_files(uploads: Iterable) -> int:
+    """
+    Count the resumes iter_resume_files() will yield, without reading them.
+
+    Only ZIP central directories are read, so this is cheap for any batch
+    size. Archives that cannot seek (read-once streams) are not counted.
+
+    Args:
+        uploads: The same uploads later passed to iter_resume_files()
+
+    Returns:
+        Number of PDF resumes
+    """
+    count = 0
+    for upload in uploads:
+        if not getattr(upload, "name", "resume.pdf").lower().endswith(".zip"):
+            count += 1
+        elif _seekable(upload):
+            with zipfile.ZipFile(upload) as archive:
+                count += sum(1 for info in archive.infolist() if _is_resume_member(info))
+            upload.seek(0)
+    return count
+
+
+# =============================================================================
+# PROGRESS TRACKING
+# =============================================================================
+
+class BatchStats:
+    """Running counters for a batch, used to report progress and throughput."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.prescreened = 0
+        self.escalated = 0  # Cascade results re-scored by the accurate model
+
+    def record(self, row: Dict) -> None:
+        """Count a finished resume."""
+        self.completed += 1
+        if row.get("error"):
+            self.failed += 1
+        if row.get("prescreened"):
+            self.prescreened += 1
+        if row.get("tier") == "accurate":
+            self.escalated += 1
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the batch started."""
+        return time.monotonic() - self.started_at
+
+    @property
+    def resumes_per_minute(self) -> float:
+        """Observed throughput so far."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.completed * 60.0 / self.elapsed
+
+
+# =============================================================================
+# SCREENING
+# =============================================================================
+
+def _new_row(candidate: str) -> Dict:
+    """An empty result row for one resume."""
+    return {
+        "candidate": candidate,
+        "match_percentage": None,
+        "missing_keywords": [],
+        "profile_summary": "",
+        "error": None,
+        "cached": False,
+        "prescreened": False,
+        "tier": None,
+        "duplicate_of": None,
+        "resume_hash": None,
+        "seconds": 0.0
+    }
+
+
+def _screen_one(
+    resume: ResumeFile,
+    jd_text: str,
+    extract_fn: Callable[[ResumeFile], Tuple[Optional[str], Optional[str]]],
+    analyze_fn: Callable[[str, str], Dict],
+    budget: Optional[SlidingWindowBudget],
+    prescore_threshold: Optional[float]
+) -> Dict:
+    """Extract and analyze a single resume, returning one result row."""
+    try:
+        return _screen_document(resume, jd_text, extract_fn, analyze_fn, budget, prescore_threshold)
+    except Exception as error:
+        # One failing resume must not abort the batch and lose the finished rows
+        row = _new_row(resume.name)
+        row["error"] = f"❌ Screening failed: {error}"
+        return row
+    finally:
+        resume.close()
+
+
+def _screen_document(
+    resume: ResumeFile,
+    jd_text: str,
+    extract_fn: Callable[[ResumeFile], Tuple[Optional[str], Optional[str]]],
+    analyze_fn: Callable[[str, str], Dict],
+    budget: Optional[SlidingWindowBudget],
+    prescore_threshold: Optional[float]
+) -> Dict:
+    started = time.perf_counter()
+    row = _new_row(resume.name)
+
+    resume_text, error = (None, resume.error) if resume.error else extract_fn(resume)
+    if error:
+        row["error"] = error
+    else:
+        row["resume_hash"] = content_hash(resume_text)
+        result = None
+        if prescore_threshold:
+            prescore = prescore_resume(resume_text, jd_text)
+            if prescore.score < prescore_threshold:
+                result = local_result(prescore)
+
+        if result is None:
+            # The scheduler charges the budget only if a model call is made
+            with call_budget(budget):
+                result = analyze_fn(resume_text, jd_text)
+
+        row["error"] = result.get("error")
+        if not row["error"]:
+            row["match_percentage"] = result["match_percentage"]
+            row["missing_keywords"] = result["missing_keywords"]
+            row["profile_summary"] = result["profile_summary"]
+            row["cached"] = bool(result.get("cached"))
+            row["prescreened"] = bool(result.get("prescreened"))
+            row["tier"] = result.get("tier")
+            row["duplicate_of"] = result.get("duplicate_of")
+
+    row["seconds"] = round(time.perf_counter() - started, 2)
+    return row
+
+
+def screen_resumes(
+    resumes: Iterable[ResumeFile],
+    jd_text: str,
+    extract_fn: Callable[[ResumeFile], Tuple[Optional[str], Optional[str]]],
+    analyze_fn: Callable[[str, str], Dict],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    tokens_per_minute: Optional[int] = None,
+    prescore_threshold: Optional[float] = None,
+    stats: Optional[BatchStats] = None
+) -> Iterator[Dict]:
+    """
+    Analyze many resumes against one job description concurrently.
+
+    Resumes are pulled lazily from `resumes`, and only a small window of
+    pending work is submitted at a time, so huge batches do not pile up in
+    memory. Rows are yielded in completion order.
+
+    Args:
+        resumes: ResumeFile objects to screen
+        jd_text: The job description text
+        extract_fn: Returns (resume_text, error_message) for a ResumeFile
+        analyze_fn: Returns an analysis dict for (resume_text, jd_text)
+        max_concurrency: Maximum number of analyses in flight
+        tokens_per_minute: Optional token budget shared by all workers
+        prescore_threshold: Resumes with a lower local pre-score get a local
+            result without an LLM call (None or 0 disables the pre-screen)
+        stats: Optional BatchStats updated as rows complete
+
+    Yields:
+        dict with keys: candidate, match_percentage, missing_keywords,
+        profile_summary, error, cached, prescreened, tier, duplicate_of, seconds
+    """
+    max_concurrency = max(1, int(max_concurrency))
+    budget = SlidingWindowBudget(tokens_per_minute) if tokens_per_minute else None
+    pending_limit = max_concurrency * 2
+    resume_iter = iter(resumes)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = set()
+        exhausted = False
+
+        while pending or not exhausted:
+            while not exhausted and len(pending) < pending_limit:
+                resume = next(resume_iter, None)
+                if resume is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(
+                    _screen_one, resume, jd_text, extract_fn, analyze_fn, budget,
+                    prescore_threshold
+                ))
+
+            if not pending:
+                break
+
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                row = future.result()
+                if stats is not None:
+                    stats.record(row)
+                yield row
+
+
+def rank_results(rows: List[Dict]) -> List[Dict]:
+    """
+    Order screening rows best match first, with failed resumes last.
+
+    Args:
+        rows: Rows produced by screen_resumes()
+
+    Returns:
+        New list sorted by match percentage (descending)
+    """
+    return sorted(
+        rows,
+        key=lambda row: (row["error"] is None, row["match_percentage"] or 0),
+        reverse=True
+    )
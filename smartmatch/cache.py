@@ -0,0 +1,230 @@
+"""
+================================================================================
+SmartMatch AI - Result Cache
+================================================================================
+
+Content-addressed, on-disk cache for LLM analysis results.
+
+Entries are keyed on a SHA-256 hash of everything that influences the model's
+answer (prompt texts, model name, temperature, system prompt), so an identical
+resume/JD pair is served from SQLite in milliseconds instead of paying for a
+second Groq round trip.
+
+Features:
+- SQLite backend (WAL mode, safe to share between threads)
+- Time-to-live expiry
+- Size-based LRU eviction
+- Hit/miss counters
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+# Directory for all of SmartMatch's local state (overridable for deployments)
+DEFAULT_CACHE_DIR = os.environ.get("SMARTMATCH_CACHE_DIR", ".smartmatch_cache")
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60  # One week
+DEFAULT_MAX_ENTRIES = 5000
+
+
+# =============================================================================
+# KEY DERIVATION
+# =============================================================================
+
+def make_cache_key(*parts) -> str:
+    """
+    Build a content-addressed key from the inputs of an analysis.
+
+    Each part is length-prefixed before hashing so that ("ab", "c") and
+    ("a", "bc") never collide.
+
+    Args:
+        *parts: Values that influence the result (converted with str())
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = str(part).encode("utf-8")
+        digest.update(str(len(encoded)).encode("ascii"))
+        digest.update(b":")
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+# =============================================================================
+# CACHE BACKEND
+# =============================================================================
+
+class ResultCache:
+    """
+    Persistent key/value store for analysis result dictionaries.
+
+    Entries older than `ttl_seconds` are treated as misses and removed. When
+    the number of entries exceeds `max_entries`, the least recently used ones
+    are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Open (or create) a cache database.
+
+        Args:
+            path: SQLite file path, defaults to <cache dir>/results.sqlite3
+            ttl_seconds: Maximum age of an entry before it expires
+            max_entries: Maximum number of entries kept on disk
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, "results.sqlite3")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Key produced by make_cache_key()
+
+        Returns:
+            The cached dictionary, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict) -> None:
+        """
+        Store a result, evicting expired and least recently used entries.
+
+        Args:
+            key: Key produced by make_cache_key()
+            value: JSON-serializable result dictionary
+        """
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Report cache effectiveness.
+
+        Returns:
+            dict with keys: hits, misses, hit_rate, entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": entries
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[ResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResultCache:
+    """
+    Return the process-wide result cache, creating it on first use.
+
+    Returns:
+        Shared ResultCache instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
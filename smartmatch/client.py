@@ -0,0 +1,210 @@
+"""
+================================================================================
+SmartMatch AI - Shared Groq Client
+================================================================================
+
+Process-wide manager for a pooled Groq client.
+
+Building `Groq(...)` per analysis creates a new HTTP connection pool (and a new
+TLS handshake) every time. The manager keeps one client per API key, backed by
+an httpx connection pool with keep-alive and, when the `h2` package is
+installed, HTTP/2 multiplexing. Because it lives in an imported module it
+survives Streamlit reruns and is shared by every session and batch worker
+thread in the process.
+
+Async callers get one pooled `AsyncGroq` client per event loop.
+
+`groq` and `httpx` are imported on first use, so importing this module is
+cheap.
+================================================================================
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Optional, Tuple
+
+GROQ_AVAILABLE = importlib.util.find_spec("groq") is not None
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None  # Enables HTTP/2 in httpx
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_POOL_SIZE = int(os.environ.get("SMARTMATCH_HTTP_POOL_SIZE", "20"))
+DEFAULT_KEEPALIVE_EXPIRY = 60.0  # Seconds an idle connection is kept open
+
+
+class GroqClientManager:
+    """
+    Thread-safe holder of a single pooled Groq client.
+
+    The client is rebuilt only when the API key or base URL changes. The
+    replaced client is not closed, because other threads may still hold it
+    for an in-flight request; it is garbage collected once they release it.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        http2: Optional[bool] = None,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        max_retries: int = 2
+    ):
+        """
+        Args:
+            pool_size: Maximum concurrent connections (and keep-alive connections)
+            http2: Use HTTP/2; defaults to True when the `h2` package is installed
+            keepalive_expiry: Seconds an idle pooled connection stays open
+            max_retries: Retries performed by the Groq SDK itself
+        """
+        self.pool_size = pool_size
+        self.http2 = HTTP2_AVAILABLE if http2 is None else (http2 and HTTP2_AVAILABLE)
+        self.keepalive_expiry = keepalive_expiry
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[Tuple[str, Optional[str]]] = None
+        self._client = None
+        self._http_client = None
+        # event loop -> (fingerprint, AsyncGroq client, httpx.AsyncClient)
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _http_options(self) -> dict:
+        import httpx
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            "http2": self.http2,
+            "timeout": httpx.Timeout(60.0, connect=5.0),
+            "follow_redirects": True,
+        }
+
+    def _build(self, api_key: str, base_url: Optional[str]):
+        import httpx
+        from groq import Groq
+
+        http_client = httpx.Client(**self._http_options())
+        client = Groq(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=self.max_retries
+        )
+        return client, http_client
+
+    def _build_async(self, api_key: str, base_url: Optional[str]):
+        import httpx
+        from groq import AsyncGroq
+
+        http_client = httpx.AsyncClient(**self._http_options())
+        client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=self.max_retries
+        )
+        return client, http_client
+
+    def get_client(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Return the pooled client for `api_key`, rebuilding it if the key changed.
+
+        Args:
+            api_key: The Groq API key
+            base_url: Optional API base URL (e.g. a local mock server)
+
+        Returns:
+            Groq client, or None if the library is missing or the key is empty
+        """
+        if not GROQ_AVAILABLE or not api_key or not api_key.strip():
+            return None
+
+        api_key = api_key.strip()
+        fingerprint = (hashlib.sha256(api_key.encode("utf-8")).hexdigest(), base_url)
+
+        with self._lock:
+            if self._client is not None and self._fingerprint == fingerprint:
+                return self._client
+
+            # The previous client is not closed here: another thread may still
+            # be mid-request on it. Its pool is released once the last holder
+            # drops its reference.
+            try:
+                self._client, self._http_client = self._build(api_key, base_url)
+            except Exception:
+                self._client, self._http_client, self._fingerprint = None, None, None
+                return None
+            self._fingerprint = fingerprint
+            return self._client
+
+    def get_async_client(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Return the pooled AsyncGroq client for the running event loop.
+
+        httpx async pools are bound to the loop they were created on, so each
+        loop gets its own client; it is dropped when the loop is garbage
+        collected and rebuilt when the key changes.
+
+        Args:
+            api_key: The Groq API key
+            base_url: Optional API base URL (e.g. a local mock server)
+
+        Returns:
+            AsyncGroq client, or None if the library is missing or the key is empty
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        if not GROQ_AVAILABLE or not api_key or not api_key.strip():
+            return None
+
+        loop = asyncio.get_running_loop()
+        api_key = api_key.strip()
+        fingerprint = (hashlib.sha256(api_key.encode("utf-8")).hexdigest(), base_url)
+
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is not None and entry[0] == fingerprint:
+                return entry[1]
+            try:
+                client, http_client = self._build_async(api_key, base_url)
+            except Exception:
+                self._async_clients.pop(loop, None)
+                return None
+            # As in get_client, a replaced client may still be awaited by
+            # other tasks on this loop, so it is left to garbage collection.
+            self._async_clients[loop] = (fingerprint, client, http_client)
+        return client
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._client, self._http_client, self._fingerprint = None, None, None
+
+
+_default_manager: Optional[GroqClientManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_client_manager() -> GroqClientManager:
+    """
+    Return the process-wide client manager, creating it on first use.
+
+    Returns:
+        Shared GroqClientManager instance
+    """
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            # Retries are owned by the RateLimitScheduler, not the SDK
+            _default_manager = GroqClientManager(max_retries=0)
+        return _default_manager
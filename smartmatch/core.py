@@ -0,0 +1,711 @@
+"""
+================================================================================
+SmartMatch AI - Core Analysis API
+================================================================================
+
+Streamlit-free entry points for resume analysis, usable from scripts, services
+and asyncio workers as well as the dashboard (`app.py`):
+
+- extract_text_from_pdf / extract_text_from_pdf_async
+- analyze_resume_with_llm / analyze_resume_async / stream_resume_analysis
+- analyze_resume_cascade / analyze_resume_cascade_async (fast model first)
+- check_resume_quality (defined in smartmatch.quality)
+
+Model calls go through the provider layer (smartmatch.providers): Groq by
+default, or the offline mock with SMARTMATCH_PROVIDER=mock. `model` selects a
+route ("accurate" = 70B, "fast" = 8B) or any model id.
+
+Importing this module does not import Streamlit, Plotly, groq or PyPDF2; the
+latter two are loaded on first use (see benchmarks/bench_import_time.py).
+================================================================================
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from smartmatch.cache import get_default_cache, make_cache_key
+from smartmatch.client import GROQ_AVAILABLE, get_client_manager
+from smartmatch.jd_profile import get_jd_profile
+from smartmatch.pdf_engine import get_pdf_engine, source_size
+from smartmatch.prescore import local_result, prescore_resume
+from smartmatch.providers import Completion, get_provider
+from smartmatch.quality import check_resume_quality
+from smartmatch.scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, get_scheduler
+from smartmatch.streaming import IncrementalJSONParser
+from smartmatch.structured import StructuredOutputError, parse_analysis
+from smartmatch.telemetry import CallTimer, get_telemetry
+from smartmatch.truncation import count_tokens, pack_jd, pack_resume
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq, Groq
+
+__all__ = [
+    "SYSTEM_PROMPT", "MODEL_NAME", "FAST_MODEL_NAME", "MODEL_ROUTES", "TEMPERATURE", "MAX_TOKENS", "JD_TOKEN_BUDGET", "RESUME_TOKEN_BUDGET",
+    "get_groq_client", "get_async_groq_client", "extract_text_from_pdf", "extract_text_from_pdf_async",
+    "analyze_resume_with_llm", "analyze_resume_async", "stream_resume_analysis", "check_resume_quality",
+    "resolve_model", "analyze_resume_cascade", "analyze_resume_cascade_async", "CASCADE_BAND",
+]
+
+# =============================================================================
+# LLM SYSTEM PROMPT
+# =============================================================================
+SYSTEM_PROMPT = """You are an expert ATS (Applicant Tracking System) and a strict technical recruiter with 15+ years of experience.
+Your task is to evaluate how well a candidate's resume matches a specific job description.
+
+EVALUATION CRITERIA (in order of importance):
+
+1. HARD SKILLS (60% weight):
+   - Penalize heavily for missing required technical skills (programming languages, frameworks, tools, certifications)
+   - Each missing critical skill: -8 to -12 points
+   - Recognize synonyms and abbreviations: "ML" = "Machine Learning", "JS" = "JavaScript", "K8s" = "Kubernetes"
+   
+2. EXPERIENCE (25% weight):
+   - Years of relevant experience in the field
+   - Seniority level match (Junior/Mid/Senior)
+   - Industry alignment (e.g., fintech for fintech role)
+   
+3. SOFT SKILLS & EDUCATION (15% weight):
+   - Leadership, communication, teamwork evidence
+   - Relevant certifications or degrees
+
+SCORING GUIDELINES:
+- 85-100: Excellent match - Strong candidate, interview immediately
+- 70-84: Good match - Solid candidate, worth interviewing  
+- 50-69: Partial match - Some gaps but could be considered
+- 30-49: Weak match - Significant skill gaps
+- 0-29: Poor match - Not suitable for this role
+
+You MUST respond with ONLY a valid JSON object, no markdown, no explanation, no code blocks:
+{
+  "match_percentage": <integer 0-100>,
+  "missing_keywords": [<list of 3-8 critical missing skills/technologies>],
+  "profile_summary": "<2-3 sentence professional assessment of the candidate's fit for this specific role>"
+}"""
+
+# =============================================================================
+# LLM SETTINGS
+# =============================================================================
+MODEL_NAME = "llama-3.3-70b-versatile"
+FAST_MODEL_NAME = "llama-3.1-8b-instant"
+# Model routing: callers pass a route name ("accurate", "fast") or a model id
+MODEL_ROUTES = {"accurate": MODEL_NAME, "fast": FAST_MODEL_NAME}
+DEFAULT_MODEL = os.environ.get("SMARTMATCH_MODEL", "accurate")
+# Cascade: fast-model scores inside this band (inclusive) are re-scored by the accurate model
+CASCADE_BAND = tuple(int(bound) for bound in os.environ.get("SMARTMATCH_CASCADE_BAND", "40-75").split("-"))
+TEMPERATURE = 0.3  # Lower temperature for consistent, analytical responses
+MAX_TOKENS = 500
+# Prompt budgets (approximate Llama 3 tokens); content is packed by relevance
+JD_TOKEN_BUDGET = 1000
+RESUME_TOKEN_BUDGET = 1500
+# Ask the provider to constrain answers to a JSON object where supported
+JSON_MODE = os.environ.get("SMARTMATCH_JSON_MODE", "1") != "0"
+# One targeted retry when an answer cannot be parsed or validated
+RETRY_PROMPT = """Your previous answer could not be used: {problems}.
+Respond again with ONLY the corrected JSON object with the keys match_percentage (integer 0-100), missing_keywords (list of strings) and profile_summary (string)."""
+RETRY_ECHO_CHARS = 2000  # Rejected answer text sent back with the retry
+
+
+# =============================================================================
+# CORE FUNCTIONS
+# =============================================================================
+
+def get_groq_client(api_key: str) -> Optional["Groq"]:
+    """
+    Return the shared, pooled Groq client for the provided API key.
+    
+    The client (and its keep-alive connection pool) is created once per process
+    and reused across reruns, sessions and batch workers; it is rebuilt only
+    when the key changes.
+    
+    Args:
+        api_key: The Groq API key
+    
+    Returns:
+        Groq client or None if not available
+    """
+    if not GROQ_AVAILABLE:
+        return None
+    
+    if not api_key or not api_key.strip():
+        return None
+    
+    try:
+        return get_client_manager().get_client(api_key)
+    except Exception:
+        return None
+
+
+def get_async_groq_client(api_key: str) -> Optional["AsyncGroq"]:
+    """
+    Return the pooled AsyncGroq client for the running event loop.
+    
+    Args:
+        api_key: The Groq API key
+    
+    Returns:
+        AsyncGroq client or None if not available
+    """
+    if not GROQ_AVAILABLE:
+        return None
+    
+    if not api_key or not api_key.strip():
+        return None
+    
+    try:
+        return get_client_manager().get_async_client(api_key)
+    except Exception:
+        return None
+
+
+def extract_text_from_pdf(pdf_file: Union[bytes, BinaryIO]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract text content from an uploaded PDF file.
+    
+    Pages are extracted in parallel worker processes and the text is cached by
+    the file's SHA-256, so re-uploading the same PDF skips parsing entirely.
+    File objects are read in place rather than copied into memory; files over
+    the engine's size or page limits are rejected with an error message.
+    
+    Args:
+        pdf_file: Raw PDF bytes or a seekable binary file-like object (e.g. a
+            Streamlit UploadedFile)
+        
+    Returns:
+        Tuple of (extracted_text, error_message)
+    """
+    with get_telemetry().span("pdf_extract") as span:
+        try:
+            if not isinstance(pdf_file, (bytes, bytearray)) and not pdf_file.seekable():
+                pdf_file = pdf_file.read()  # Read-once stream: PyPDF2 needs to seek
+            span["bytes"] = source_size(pdf_file)
+            text, error = get_pdf_engine().extract(pdf_file)
+        except Exception as e:
+            text, error = None, f"❌ An unexpected error occurred: {str(e)}"
+        span["ok"] = error is None
+        return text, error
+
+
+async def extract_text_from_pdf_async(pdf_file: Union[bytes, BinaryIO]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Async wrapper around extract_text_from_pdf (runs in the default executor).
+    
+    Args:
+        pdf_file: Raw PDF bytes or a binary file-like object
+        
+    Returns:
+        Tuple of (extracted_text, error_message)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, extract_text_from_pdf, pdf_file)
+
+
+def _fallback_result() -> Dict:
+    """Default response returned when the analysis cannot be completed."""
+    return {
+        "match_percentage": 0,
+        "missing_keywords": [],
+        "profile_summary": "Unable to analyze. Please check your API key and try again.",
+        "error": None,
+        "cached": False
+    }
+
+
+def _build_user_prompt(jd_excerpt: str, resume_excerpt: str,
+                       jd_heading: str = "JOB DESCRIPTION") -> str:
+    """Construct the user prompt sent alongside SYSTEM_PROMPT."""
+    return f"""Analyze this resume against the job description.
+
+=== {jd_heading} ===
+{jd_excerpt}
+
+=== RESUME ===
+{resume_excerpt}
+
+Respond with ONLY the JSON object, nothing else."""
+
+
+def _parse_llm_response(response_text: str, retried: bool = False) -> Dict:
+    """
+    Parse and validate the model's JSON answer (see smartmatch.structured).
+    
+    Counts answers, repairs, retries and final failures as telemetry counters
+    (llm_answers, llm_answer_repairs, llm_answer_retries, llm_answer_failures);
+    a first answer that fails is always retried once by the caller.
+    
+    Args:
+        response_text: Raw model output
+        retried: Whether this is the answer to the targeted retry
+    
+    Raises:
+        StructuredOutputError: If the answer is unusable
+    """
+    telemetry = get_telemetry()
+    if not retried:
+        telemetry.increment("llm_answers")
+    with telemetry.span("parse", retry=retried):
+        try:
+            result, repaired = parse_analysis(response_text)
+        except StructuredOutputError:
+            telemetry.increment("llm_answer_failures" if retried else "llm_answer_retries")
+            raise
+    if repaired:
+        telemetry.increment("llm_answer_repairs")
+    return result
+
+
+def _retry_messages(messages: List[Dict], response_text: str, error: StructuredOutputError) -> List[Dict]:
+    """The original conversation plus the rejected answer and what to fix."""
+    return messages + [
+        {"role": "assistant", "content": response_text[:RETRY_ECHO_CHARS]},
+        {"role": "user", "content": RETRY_PROMPT.format(problems="; ".join(error.problems))}
+    ]
+
+
+def _describe_api_error(error: Exception) -> str:
+    """Turn an API exception into a user-facing message."""
+    error_msg = str(error)
+    if "rate_limit" in error_msg.lower():
+        return "Rate limit reached. Please wait a moment and try again."
+    elif "timeout" in error_msg.lower():
+        return "Request timed out. The service might be busy."
+    return f"API error: {error_msg[:100]}"
+
+
+def _estimate_request_tokens(messages: List[Dict]) -> int:
+    """Tokens a chat request will consume: prompt estimate plus the completion budget."""
+    return sum(count_tokens(message["content"]) for message in messages) + MAX_TOKENS
+
+
+def _jd_prompt(jd_text: str, use_jd_profile: bool = True) -> Tuple[str, str]:
+    """
+    The JD block of a prompt: the compact cached profile if requested and
+    complete, otherwise the packed JD (so no title or must-have is lost).
+
+    Returns:
+        Tuple of (heading, excerpt)
+    """
+    jd_profile = get_jd_profile(jd_text) if use_jd_profile else None
+    if jd_profile is not None and jd_profile.complete:
+        return "JOB PROFILE (condensed from the job description)", jd_profile.to_prompt()
+    # Drop boilerplate and pack the most relevant content into the token budget
+    return "JOB DESCRIPTION", pack_jd(jd_text, JD_TOKEN_BUDGET)
+
+
+def _cache_result(cache, cache_key: str, result: Dict) -> None:
+    """Store the user-visible fields of a successful analysis."""
+    if cache is not None:
+        cache.set(cache_key, {
+            "match_percentage": result["match_percentage"],
+            "missing_keywords": result["missing_keywords"],
+            "profile_summary": result["profile_summary"]
+        })
+
+
+def resolve_model(model: Optional[str] = None) -> str:
+    """
+    Map a route name ("accurate", "fast") or model id to a model id.
+    
+    Args:
+        model: Route name or model id; defaults to SMARTMATCH_MODEL ("accurate")
+    
+    Returns:
+        Model id to send to the provider
+    """
+    model = model or DEFAULT_MODEL
+    return MODEL_ROUTES.get(model, model)
+
+
+def _outcome(result: Dict) -> str:
+    """Short label of how an analysis finished, for telemetry."""
+    if result.get("prescreened"):
+        return "prescreened"
+    if result.get("cached"):
+        return "cached"
+    return "error" if result.get("error") else "ok"
+
+
+def _record_completion(timer: CallTimer, completion: Completion, model: str) -> None:
+    """Record the call timing and token usage of one model completion."""
+    prompt_tokens = completion.usage.get("prompt_tokens", 0)
+    completion_tokens = completion.usage.get("completion_tokens", 0)
+    timer.finish(model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    timer.telemetry.add_tokens(model, prompt_tokens, completion_tokens)
+
+
+def _call_model(provider, messages: List[Dict], model: str, priority: int) -> Completion:
+    """One scheduled, timed completion call."""
+    timer = CallTimer(get_telemetry())
+    try:
+        completion = get_scheduler().run(
+            timer.wrap(lambda: provider.complete(messages, model, TEMPERATURE, MAX_TOKENS,
+                                                 timeout=30.0, json_mode=JSON_MODE)),
+            tokens=_estimate_request_tokens(messages),
+            priority=priority
+        )
+    except Exception:
+        timer.finish(error=True, model=model)
+        raise
+    _record_completion(timer, completion, model)
+    return completion
+
+
+async def _call_model_async(provider, messages: List[Dict], model: str, priority: int) -> Completion:
+    """Async counterpart of _call_model()."""
+    timer = CallTimer(get_telemetry())
+    try:
+        completion = await get_scheduler().run_async(
+            timer.wrap(lambda: provider.acomplete(messages, model, TEMPERATURE, MAX_TOKENS,
+                                                  timeout=30.0, json_mode=JSON_MODE)),
+            tokens=_estimate_request_tokens(messages),
+            priority=priority
+        )
+    except Exception:
+        timer.finish(error=True, model=model)
+        raise
+    _record_completion(timer, completion, model)
+    return completion
+
+
+def _prepare_analysis(resume_text: str, jd_text: str, api_key: str, use_cache: bool,
+                      prescore_threshold: Optional[float] = None,
+                      use_jd_profile: bool = False,
+                      model: Optional[str] = None):
+    """
+    Resolve everything an analysis needs before calling the model.
+    
+    Args:
+        model: Route name or model id (see resolve_model)
+    
+    Returns:
+        Tuple of (finished_result, provider, messages, model, cache, cache_key).
+        When finished_result is set (local pre-screen, cache hit or
+        configuration error) no API call is needed.
+    """
+    # Short-circuit obvious mismatches with the local pre-scorer
+    if prescore_threshold:
+        prescore = prescore_resume(resume_text, jd_text)
+        if prescore.score < prescore_threshold:
+            return local_result(prescore), None, None, None, None, None
+    
+    jd_heading, jd_excerpt = _jd_prompt(jd_text, use_jd_profile)
+    resume_excerpt = pack_resume(resume_text, jd_text, RESUME_TOKEN_BUDGET)
+    
+    # Serve identical requests from the cache (answers are kept per provider and model)
+    provider = get_provider(api_key)
+    model = resolve_model(model)
+    cache = get_default_cache() if use_cache else None
+    cache_key = make_cache_key(jd_excerpt, resume_excerpt, provider.name, model, TEMPERATURE, SYSTEM_PROMPT)
+    if cache is not None:
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            cached_result["error"] = None
+            cached_result["cached"] = True
+            return cached_result, None, None, model, cache, cache_key
+    
+    # Check that the provider is usable (library installed, API key set)
+    problem = provider.check()
+    if problem:
+        fallback = _fallback_result()
+        fallback["error"] = problem
+        return fallback, None, None, model, cache, cache_key
+    
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _build_user_prompt(jd_excerpt, resume_excerpt, jd_heading)}
+    ]
+    return None, provider, messages, model, cache, cache_key
+
+
+def analyze_resume_with_llm(resume_text: str, jd_text: str, api_key: str,
+                            use_cache: bool = True,
+                            prescore_threshold: Optional[float] = None,
+                            priority: int = PRIORITY_INTERACTIVE,
+                            use_jd_profile: bool = False,
+                            model: Optional[str] = None) -> Dict:
+    """
+    Use Llama 3 (via the configured provider, Groq by default) to semantically analyze resume against job description.
+    
+    This function sends both texts to the LLM which performs deep semantic analysis,
+    understanding synonyms, context, and relevance - far superior to keyword matching.
+    Successful results are stored in the persistent result cache, so an identical
+    resume/JD pair is answered without another API call.
+    
+    Args:
+        resume_text: Extracted text from the candidate's resume
+        jd_text: The job description text
+        api_key: The Groq API key
+        use_cache: Serve and store results through the persistent result cache
+        prescore_threshold: If set, resumes whose local pre-score is below this
+            value get a local result and are not sent to the LLM
+        priority: Scheduler lane (PRIORITY_INTERACTIVE or PRIORITY_BATCH)
+        use_jd_profile: Send the compact cached JD profile (see
+            smartmatch.jd_profile) instead of the packed JD text, unless the
+            profile is incomplete (no title or no must-haves)
+        model: Route name ("accurate", "fast") or model id; defaults to
+            SMARTMATCH_MODEL
+        
+    Returns:
+        dict with keys: match_percentage, missing_keywords, profile_summary, error, cached
+        (plus prescreened=True for local results)
+    """
+    telemetry = get_telemetry()
+    with telemetry.span("analysis") as span:
+        with telemetry.span("prepare"):
+            finished, provider, messages, model, cache, cache_key = _prepare_analysis(
+                resume_text, jd_text, api_key, use_cache, prescore_threshold, use_jd_profile, model
+            )
+        span["model"] = model
+        if finished is not None:
+            span["outcome"] = _outcome(finished)
+            return finished
+        
+        try:
+            # Call the model, queued behind the rate-limit scheduler
+            completion = _call_model(provider, messages, model, priority)
+            try:
+                result = _parse_llm_response(completion.content)
+            except StructuredOutputError as error:
+                retry_messages = _retry_messages(messages, completion.content, error)
+                completion = _call_model(provider, retry_messages, model, priority)
+                result = _parse_llm_response(completion.content, retried=True)
+            _cache_result(cache, cache_key, result)
+            
+        except StructuredOutputError:
+            result = _fallback_result()
+            result["error"] = "LLM returned invalid JSON. Please try again."
+        except Exception as e:
+            result = _fallback_result()
+            result["error"] = _describe_api_error(e)
+        span["outcome"] = _outcome(result)
+        return result
+
+
+async def analyze_resume_async(resume_text: str, jd_text: str, api_key: str,
+                               use_cache: bool = True,
+                               prescore_threshold: Optional[float] = None,
+                               priority: int = PRIORITY_BATCH,
+                               use_jd_profile: bool = False,
+                               model: Optional[str] = None) -> Dict:
+    """
+    Async counterpart of analyze_resume_with_llm (AsyncGroq with the Groq provider).
+    
+    Calls share the process-wide rate-limit scheduler (and its budgets) with
+    threaded callers, so thousands of concurrent tasks can be started and the
+    scheduler paces them. Defaults to the batch lane.
+    
+    Args:
+        resume_text: Extracted text from the candidate's resume
+        jd_text: The job description text
+        api_key: The Groq API key
+        use_cache: Serve and store results through the persistent result cache
+        prescore_threshold: If set, resumes whose local pre-score is below this
+            value get a local result and are not sent to the LLM
+        priority: Scheduler lane (PRIORITY_INTERACTIVE or PRIORITY_BATCH)
+        use_jd_profile: Send the compact cached JD profile instead of the JD text
+        model: Route name ("accurate", "fast") or model id
+        
+    Returns:
+        Same dict as analyze_resume_with_llm()
+    """
+    telemetry = get_telemetry()
+    with telemetry.span("analysis") as span:
+        with telemetry.span("prepare"):
+            finished, provider, messages, model, cache, cache_key = _prepare_analysis(
+                resume_text, jd_text, api_key, use_cache, prescore_threshold, use_jd_profile, model
+            )
+        span["model"] = model
+        if finished is not None:
+            span["outcome"] = _outcome(finished)
+            return finished
+        
+        try:
+            completion = await _call_model_async(provider, messages, model, priority)
+            try:
+                result = _parse_llm_response(completion.content)
+            except StructuredOutputError as error:
+                retry_messages = _retry_messages(messages, completion.content, error)
+                completion = await _call_model_async(provider, retry_messages, model, priority)
+                result = _parse_llm_response(completion.content, retried=True)
+            _cache_result(cache, cache_key, result)
+            
+        except StructuredOutputError:
+            result = _fallback_result()
+            result["error"] = "LLM returned invalid JSON. Please try again."
+        except Exception as e:
+            result = _fallback_result()
+            result["error"] = _describe_api_error(e)
+        span["outcome"] = _outcome(result)
+        return result
+
+
+def _needs_escalation(result: Dict, band: Tuple[int, int]) -> bool:
+    """True if a fast-tier result is failed or borderline and must be re-scored."""
+    if result.get("prescreened"):
+        return False
+    return bool(result.get("error")) or band[0] <= result["match_percentage"] <= band[1]
+
+
+def _tag_tier(result: Dict, tier: str, model: str, fast_result: Optional[Dict] = None) -> Dict:
+    """Record which tier produced a cascade result."""
+    result["tier"] = "local" if result.get("prescreened") else tier
+    result["model"] = None if result.get("prescreened") else resolve_model(model)
+    if fast_result is not None and not fast_result.get("error"):
+        result["fast_match_percentage"] = fast_result["match_percentage"]
+    return result
+
+
+def analyze_resume_cascade(resume_text: str, jd_text: str, api_key: str,
+                           band: Tuple[int, int] = CASCADE_BAND,
+                           fast_model: str = "fast",
+                           accurate_model: str = "accurate",
+                           use_cache: bool = True,
+                           prescore_threshold: Optional[float] = None,
+                           priority: int = PRIORITY_INTERACTIVE,
+                           use_jd_profile: bool = False) -> Dict:
+    """
+    Score with the fast model first; re-score only borderline results with the accurate model.
+    
+    Clear passes and clear rejects (outside `band`) keep the fast model's
+    answer. Scores inside the band, and fast-tier failures, are escalated.
+    
+    Args:
+        resume_text: Extracted text from the candidate's resume
+        jd_text: The job description text
+        api_key: The Groq API key
+        band: Inclusive (low, high) uncertainty band, default SMARTMATCH_CASCADE_BAND
+        fast_model: Route or model id of the first tier
+        accurate_model: Route or model id used for escalations
+        use_cache: Serve and store results through the persistent result cache
+        prescore_threshold: If set, resumes whose local pre-score is below this
+            value get a local result and are not sent to the LLM
+        priority: Scheduler lane (PRIORITY_INTERACTIVE or PRIORITY_BATCH)
+        use_jd_profile: Send the compact cached JD profile instead of the JD text
+        
+    Returns:
+        Same dict as analyze_resume_with_llm(), plus tier ("local", "fast" or
+        "accurate"), model, and fast_match_percentage when escalated
+    """
+    options = dict(use_cache=use_cache, prescore_threshold=prescore_threshold,
+                   priority=priority, use_jd_profile=use_jd_profile)
+    fast_result = analyze_resume_with_llm(resume_text, jd_text, api_key, model=fast_model, **options)
+    if not _needs_escalation(fast_result, band):
+        return _tag_tier(fast_result, "fast", fast_model)
+    result = analyze_resume_with_llm(resume_text, jd_text, api_key, model=accurate_model, **options)
+    return _tag_tier(result, "accurate", accurate_model, fast_result)
+
+
+async def analyze_resume_cascade_async(resume_text: str, jd_text: str, api_key: str,
+                                       band: Tuple[int, int] = CASCADE_BAND,
+                                       fast_model: str = "fast",
+                                       accurate_model: str = "accurate",
+                                       use_cache: bool = True,
+                                       prescore_threshold: Optional[float] = None,
+                                       priority: int = PRIORITY_BATCH,
+                                       use_jd_profile: bool = False) -> Dict:
+    """
+    Async counterpart of analyze_resume_cascade (defaults to the batch lane).
+    
+    Returns:
+        Same dict as analyze_resume_cascade()
+    """
+    options = dict(use_cache=use_cache, prescore_threshold=prescore_threshold,
+                   priority=priority, use_jd_profile=use_jd_profile)
+    fast_result = await analyze_resume_async(resume_text, jd_text, api_key, model=fast_model, **options)
+    if not _needs_escalation(fast_result, band):
+        return _tag_tier(fast_result, "fast", fast_model)
+    result = await analyze_resume_async(resume_text, jd_text, api_key, model=accurate_model, **options)
+    return _tag_tier(result, "accurate", accurate_model, fast_result)
+
+
+def stream_resume_analysis(resume_text: str, jd_text: str, api_key: str,
+                           use_cache: bool = True,
+                           model: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream the analysis, yielding partial results as the JSON answer arrives.
+    
+    Uses the provider's streaming mode with an incremental JSON parser, so the score can
+    be shown as soon as `match_percentage` is parsed, and keywords and summary
+    can be rendered while the model is still generating.
+    
+    Args:
+        resume_text: Extracted text from the candidate's resume
+        jd_text: The job description text
+        api_key: The Groq API key
+        use_cache: Serve and store results through the persistent result cache
+        model: Route name ("accurate", "fast") or model id
+        
+    Yields:
+        Partial dicts with keys: match_percentage (None until parsed),
+        missing_keywords, profile_summary, done=False. The last item is the
+        full analyze_resume_with_llm() result with done=True.
+    """
+    telemetry = get_telemetry()
+    started = time.perf_counter()
+    with telemetry.span("prepare"):
+        finished, provider, messages, model, cache, cache_key = _prepare_analysis(
+            resume_text, jd_text, api_key, use_cache, model=model
+        )
+    if finished is not None:
+        telemetry.record("analysis", time.perf_counter() - started, model=model,
+                         outcome=_outcome(finished), stream=True)
+        finished["done"] = True
+        yield finished
+        return
+    
+    parser = IncrementalJSONParser()
+    chunks = []
+    timer = CallTimer(telemetry)
+    try:
+        # Interactive lane: jumps ahead of queued batch work
+        stream = get_scheduler().run(
+            timer.wrap(lambda: provider.stream(messages, model, TEMPERATURE, MAX_TOKENS,
+                                               timeout=30.0, json_mode=JSON_MODE)),
+            tokens=_estimate_request_tokens(messages),
+            priority=PRIORITY_INTERACTIVE
+        )
+        
+        for delta in stream:
+            if not chunks:
+                telemetry.record("ttfb", time.perf_counter() - timer.started, model=model)
+            chunks.append(delta)
+            if parser.feed(delta):
+                score = parser.fields.get("match_percentage")
+                yield {
+                    "match_percentage": score if isinstance(score, (int, float)) else None,
+                    "missing_keywords": [str(k) for k in parser.get("missing_keywords", [])],
+                    "profile_summary": str(parser.get("profile_summary", "")),
+                    "done": False
+                }
+        
+        # Streams carry no usage block here, so token counts are estimates
+        content = "".join(chunks)
+        _record_completion(timer, Completion(content, model, {
+            "prompt_tokens": sum(count_tokens(message["content"]) for message in messages),
+            "completion_tokens": count_tokens(content),
+        }, None), model)
+        try:
+            result = _parse_llm_response(content)
+        except StructuredOutputError as error:
+            # The retry is not streamed: it only fixes the rejected answer
+            completion = _call_model(provider, _retry_messages(messages, content, error), model,
+                                     PRIORITY_INTERACTIVE)
+            result = _parse_llm_response(completion.content, retried=True)
+        _cache_result(cache, cache_key, result)
+        
+    except StructuredOutputError:
+        result = _fallback_result()
+        result["error"] = "LLM returned invalid JSON. Please try again."
+    except Exception as e:
+        timer.finish(error=True, model=model)
+        result = _fallback_result()
+        result["error"] = _describe_api_error(e)
+    
+    telemetry.record("analysis", time.perf_counter() - started, model=model,
+                     outcome=_outcome(result), stream=True)
+    result["done"] = True
+    yield result
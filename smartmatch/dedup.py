@@ -0,0 +1,400 @@
+"""
+================================================================================
+SmartMatch AI - Duplicate Resume Detection
+================================================================================
+
+Applicants send the same resume to several postings, or re-apply with trivial
+edits. Each copy used to cost its own LLM call; this module recognizes them
+before analysis:
+
+- Fingerprints: a MinHash signature (128 permutations) over word 3-shingles
+  of the extracted text, plus an exact hash of the normalized text (case,
+  punctuation and layout ignored)
+- Index: locality-sensitive hashing in SQLite. The signature is cut into 16
+  bands of 8 rows; documents sharing any band bucket are candidates, found
+  with indexed lookups instead of a scan, then verified by their estimated
+  Jaccard similarity against the threshold (SMARTMATCH_DUPLICATE_THRESHOLD)
+- Reuse: results are stored per canonical document and JD, with the text
+  they were computed from. An exact duplicate screened against the same JD
+  gets the stored result; a near-duplicate gets it only if the edit is
+  immaterial for that JD (same check as re-scoring revisions: no JD key term
+  added or removed and fewer than a handful of changed words). Others are
+  analyzed and flagged with the resume they duplicate
+
+The banding is tuned for thresholds of 0.85 and up: a pair at Jaccard 0.85
+becomes a candidate 99.4% of the time (0.9: 99.99%), while unrelated resumes
+built from the same template (Jaccard around 0.3) almost never collide, so
+lookups stay cheap as the corpus grows. At 0.8 recall drops to about 95%.
+
+Requires numpy (imported on first fingerprint, not with the module).
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from smartmatch.cache import DEFAULT_CACHE_DIR
+from smartmatch.history import content_hash
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_THRESHOLD = float(os.environ.get("SMARTMATCH_DUPLICATE_THRESHOLD", "0.85"))
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_WORDS = 3
+MIN_WORDS = 20  # Shorter texts (failed extractions, cover notes) are never matched
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_permutations: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+
+
+class Fingerprint(NamedTuple):
+    """Duplicate-detection fingerprint of one resume text."""
+    exact_hash: str  # SHA-256 of the normalized text
+    signature: "np.ndarray"  # MinHash values, uint32[NUM_PERMUTATIONS]
+
+
+class StoredResult(NamedTuple):
+    """Analysis of an indexed resume against one JD."""
+    result: Dict
+    resume_text: Optional[str]  # Text the result was computed from (None in old indexes)
+
+
+class DuplicateMatch(NamedTuple):
+    """A previously indexed resume the new one duplicates."""
+    doc_id: int
+    label: str
+    similarity: float  # Estimated Jaccard similarity of the shingle sets
+    exact: bool
+
+
+# =============================================================================
+# FINGERPRINTING
+# =============================================================================
+
+def _get_permutations() -> Tuple["np.ndarray", "np.ndarray"]:
+    """MinHash permutation coefficients (a, b), created with numpy on first use."""
+    import numpy as np  # Deferred: keeps app start-up from loading numpy
+
+    global _permutations
+    if _permutations is None:
+        # Fixed seed: signatures must stay comparable across processes and releases
+        a, b = np.random.RandomState(1).randint(1, _MERSENNE_PRIME, size=(2, NUM_PERMUTATIONS), dtype=np.uint64)
+        _permutations = (a, b)
+    return _permutations
+
+
+def fingerprint(text: str) -> Optional[Fingerprint]:
+    """
+    Fingerprint a resume text.
+
+    Args:
+        text: Extracted resume text
+
+    Returns:
+        Fingerprint, or None if the text is too short to compare
+    """
+    import numpy as np
+
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+         for shingle in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    # (a * h + b) mod p per permutation; the uint64 product may wrap, which
+    # keeps it a fixed pseudo-random permutation family
+    permutation_a, permutation_b = _get_permutations()
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * permutation_a + permutation_b) % np.uint64(_MERSENNE_PRIME) \
+            & np.uint64(_MAX_HASH)
+    signature = permuted.min(axis=0).astype(np.uint32)
+    exact_hash = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+    return Fingerprint(exact_hash, signature)
+
+
+def estimate_similarity(first: "np.ndarray", second: "np.ndarray") -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float((first == second).sum()) / len(first)
+
+
+def _band_keys(signature: "np.ndarray") -> List[int]:
+    """One signed 64-bit bucket key per LSH band (band number included)."""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class DuplicateIndex:
+    """
+    SQLite-backed LSH index of resume fingerprints and their results per JD.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Open (or create) a duplicate index.
+
+        Args:
+            path: SQLite file path, defaults to <cache dir>/duplicates.sqlite3
+            threshold: Minimum estimated similarity for a near-duplicate (0-1)
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, "duplicates.sqlite3")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                exact_hash TEXT NOT NULL UNIQUE,
+                label TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets_bucket ON buckets (bucket);
+            CREATE TABLE IF NOT EXISTS results (
+                doc_id INTEGER NOT NULL,
+                jd_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                resume_text TEXT,
+                PRIMARY KEY (doc_id, jd_hash)
+            );
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if "resume_text" not in columns:
+            # Indexes created before near-duplicates were diffed
+            self._conn.execute("ALTER TABLE results ADD COLUMN resume_text TEXT")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def match(self, resume_print: Fingerprint) -> Optional[DuplicateMatch]:
+        """
+        Find the most similar indexed resume at or above the threshold.
+
+        Args:
+            resume_print: Fingerprint of the new resume
+
+        Returns:
+            DuplicateMatch, or None if the resume is new
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_id, label FROM documents WHERE exact_hash = ?", (resume_print.exact_hash,)
+            ).fetchone()
+            if row is not None:
+                return DuplicateMatch(row[0], row[1], 1.0, True)
+
+            keys = _band_keys(resume_print.signature)
+            candidates = self._conn.execute(
+                f"SELECT doc_id, label, signature FROM documents WHERE doc_id IN ("
+                f"SELECT doc_id FROM buckets WHERE bucket IN ({', '.join('?' * len(keys))}))",
+                keys
+            ).fetchall()
+
+        import numpy as np
+
+        best = None
+        for doc_id, label, blob in candidates:
+            similarity = estimate_similarity(resume_print.signature, np.frombuffer(blob, dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DuplicateMatch(doc_id, label, similarity, False)
+        return best
+
+    def add(self, resume_print: Fingerprint, label: str) -> int:
+        """
+        Index a resume (a no-op for an exact duplicate of an indexed one).
+
+        Args:
+            resume_print: Fingerprint of the resume
+            label: Name shown when later uploads duplicate it
+
+        Returns:
+            doc_id of the indexed (or already indexed) resume
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO documents (exact_hash, label, signature, created_at) VALUES (?, ?, ?, ?)",
+                (resume_print.exact_hash, label, resume_print.signature.astype("uint32").tobytes(), now)
+            )
+            if cursor.rowcount:
+                doc_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO buckets (bucket, doc_id) VALUES (?, ?)",
+                    [(key, doc_id) for key in _band_keys(resume_print.signature)]
+                )
+            else:
+                doc_id = self._conn.execute(
+                    "SELECT doc_id FROM documents WHERE exact_hash = ?", (resume_print.exact_hash,)
+                ).fetchone()[0]
+            self._conn.commit()
+        return doc_id
+
+    def get_result(self, doc_id: int, jd_text: str) -> Optional[StoredResult]:
+        """
+        Stored analysis of an indexed resume against a JD.
+
+        Returns:
+            StoredResult, or None if it was never analyzed against this JD
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, resume_text FROM results WHERE doc_id = ? AND jd_hash = ?",
+                (doc_id, content_hash(jd_text))
+            ).fetchone()
+        return StoredResult(json.loads(row[0]), row[1]) if row else None
+
+    def set_result(self, doc_id: int, jd_text: str, result: Dict, resume_text: Optional[str] = None) -> None:
+        """
+        Store the analysis of an indexed resume against a JD.
+
+        Args:
+            resume_text: The text that was analyzed; near-duplicates are
+                diffed against it before the result is reused
+        """
+        stored = {key: result[key] for key in ("match_percentage", "missing_keywords", "profile_summary")}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (doc_id, jd_hash, result, created_at, resume_text) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (doc_id, content_hash(jd_text), json.dumps(stored), time.time(), resume_text)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every document and stored result."""
+        with self._lock:
+            self._conn.executescript("DELETE FROM buckets; DELETE FROM results; DELETE FROM documents;")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_index: Optional[DuplicateIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> DuplicateIndex:
+    """
+    Return the process-wide duplicate index, creating it on first use.
+
+    Returns:
+        Shared DuplicateIndex instance
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = DuplicateIndex()
+        return _default_index
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+def _reusable(match: DuplicateMatch, stored: StoredResult, resume_text: str, jd_text: str) -> bool:
+    """Whether a duplicate's stored result still holds for this resume text and JD."""
+    if match.exact:
+        return True
+    if stored.resume_text is None:
+        return False
+    from smartmatch.revisions import diff_sections
+    from smartmatch.truncation import split_sections
+
+    diff = diff_sections(split_sections(stored.resume_text), split_sections(resume_text), jd_text)
+    return not diff.material
+
+
+def analyze_with_dedup(resume_text: str, jd_text: str,
+                       analyze_fn: Callable[[str, str], Dict],
+                       label: Optional[str] = None,
+                       reuse: bool = True,
+                       index: Optional[DuplicateIndex] = None) -> Dict:
+    """
+    Analyze a resume unless a duplicate was already analyzed against this JD.
+
+    Exact duplicates reuse the stored result. Near-duplicates reuse it only
+    when the edit is immaterial for the JD (revisions.diff_sections): adding
+    "Kubernetes" to a resume whose result lists it as missing is analyzed.
+
+    Args:
+        resume_text: Extracted resume text
+        jd_text: The job description text
+        analyze_fn: Returns an analysis dict for (resume_text, jd_text), e.g.
+            analyze_resume_with_llm with its options bound
+        label: Name for the resume in later matches; defaults to the
+            candidate's email or phone (see revisions.candidate_key)
+        reuse: Return the stored result of a duplicate (see above); if
+            False, analyze anyway and only flag the duplicate
+        index: Defaults to get_duplicate_index()
+
+    Returns:
+        The analysis dict plus duplicate_of (label of the matched resume or
+        None) and duplicate_similarity. A reused result has cached=True.
+    """
+    from smartmatch.revisions import candidate_key
+
+    if index is None:
+        index = get_duplicate_index()
+    resume_print = fingerprint(resume_text)
+    match = index.match(resume_print) if resume_print is not None else None
+
+    if match is not None and reuse:
+        stored = index.get_result(match.doc_id, jd_text)
+        if stored is not None and _reusable(match, stored, resume_text, jd_text):
+            return dict(stored.result, error=None, cached=True, duplicate_of=match.label,
+                        duplicate_similarity=round(match.similarity, 3))
+
+    result = analyze_fn(resume_text, jd_text)
+    if resume_print is not None and not result.get("error") and not result.get("prescreened"):
+        # Near-duplicates share the first version's entry; the latest analyzed text is kept with it
+        doc_id = match.doc_id if match is not None else index.add(
+            resume_print, label or candidate_key(resume_text) or resume_print.exact_hash[:12]
+        )
+        index.set_result(doc_id, jd_text, result, resume_text)
+    result["duplicate_of"] = match.label if match is not None else None
+    result["duplicate_similarity"] = round(match.similarity, 3) if match is not None else None
+    return result
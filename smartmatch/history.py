@@ -0,0 +1,418 @@
+"""
+================================================================================
+SmartMatch AI - Analysis History
+================================================================================
+
+Persistent, queryable log of every analysis shown in the dashboard, so a
+candidate can be looked up again (or compared across requisitions) without
+re-running the model.
+
+- One SQLite table, indexed on JD hash, resume hash, score and timestamp
+- page() uses keyset pagination (no OFFSET), so any page of a large history
+  costs one index range scan and only that page is loaded into memory
+- export_csv() / export_parquet() stream matching rows in fixed-size batches
+  (Parquet needs the optional `pyarrow` package)
+
+Unlike the result cache, entries never expire and are keyed by content hash
+(not by prompt), so the same resume is found under any model or prompt.
+================================================================================
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from smartmatch.cache import DEFAULT_CACHE_DIR
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_PAGE_SIZE = 50
+EXPORT_BATCH_SIZE = 5000  # Rows fetched (and written as one Parquet row group) at a time
+ORDERS = {"newest": "created_at", "score": "match_percentage"}
+
+_COLUMNS = ("id", "created_at", "jd_hash", "resume_hash", "jd_title", "candidate", "match_percentage",
+            "missing_keywords", "profile_summary", "source", "model", "quality")
+
+
+class HistoryEntry(NamedTuple):
+    """One recorded analysis."""
+    id: int
+    created_at: float
+    jd_hash: str
+    resume_hash: str
+    jd_title: str
+    candidate: str
+    match_percentage: int
+    missing_keywords: List[str]
+    profile_summary: str
+    source: str  # ai | cache | prescreen | duplicate
+    model: Optional[str]
+    quality: Optional[Dict[str, str]]  # check name -> status
+
+
+class HistoryFilter(NamedTuple):
+    """Restricts a query; None fields match everything."""
+    jd_hash: Optional[str] = None
+    resume_hash: Optional[str] = None
+    min_score: Optional[int] = None
+    max_score: Optional[int] = None
+    candidate: Optional[str] = None  # Substring of the candidate name
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash a resume or JD text, ignoring surrounding whitespace.
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def _jd_title(jd_text: str) -> str:
+    """First non-empty line of a job description, shortened."""
+    for line in jd_text.splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return ""
+
+
+def _source(result: Dict) -> str:
+    if result.get("prescreened"):
+        return "prescreen"
+    if result.get("cached") and result.get("duplicate_of"):
+        return "duplicate"
+    return "cache" if result.get("cached") else "ai"
+
+
+def _entry(row: Tuple) -> HistoryEntry:
+    values = list(row)
+    values[7] = json.loads(values[7])
+    values[11] = json.loads(values[11]) if values[11] else None
+    return HistoryEntry(*values)
+
+
+class HistoryStore:
+    """
+    SQLite-backed analysis history, safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) a history database.
+
+        Args:
+            path: SQLite file path, defaults to <cache dir>/history.sqlite3
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, "history.sqlite3")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at REAL NOT NULL,
+                jd_hash TEXT NOT NULL,
+                resume_hash TEXT NOT NULL,
+                jd_title TEXT NOT NULL,
+                candidate TEXT NOT NULL,
+                match_percentage INTEGER NOT NULL,
+                missing_keywords TEXT NOT NULL,
+                profile_summary TEXT NOT NULL,
+                source TEXT NOT NULL,
+                model TEXT,
+                quality TEXT
+            )
+        """)
+        # Every index ends in the sort key used by page(), so filtered pages are range scans
+        for name, columns in (
+            ("idx_analyses_created", "created_at"),
+            ("idx_analyses_score", "match_percentage, created_at"),
+            ("idx_analyses_jd", "jd_hash, created_at"),
+            ("idx_analyses_jd_score", "jd_hash, match_percentage"),
+            ("idx_analyses_resume", "resume_hash, created_at"),
+        ):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON analyses ({columns})")
+        self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def record_many(self, jd_text: str, results: Iterable[Dict]) -> int:
+        """
+        Store analyses of several resumes against one job description.
+
+        Each result is an analysis dict (match_percentage, missing_keywords,
+        profile_summary, cached, prescreened, model) plus:
+        resume_hash (or resume_text), and optionally candidate, jd_title and
+        quality (check_resume_quality() output). Results with an error are skipped.
+
+        Args:
+            jd_text: The job description text
+            results: Analysis dicts
+
+        Returns:
+            Number of rows stored
+        """
+        jd_hash = content_hash(jd_text)
+        now = time.time()
+        rows = []
+        for result in results:
+            if result.get("error") or result.get("match_percentage") is None:
+                continue
+            resume_hash = result.get("resume_hash") or content_hash(result.get("resume_text", ""))
+            quality = result.get("quality")
+            rows.append((
+                now, jd_hash, resume_hash,
+                result.get("jd_title") or _jd_title(jd_text),
+                result.get("candidate") or "",
+                int(result["match_percentage"]),
+                json.dumps(list(result.get("missing_keywords") or [])),
+                result.get("profile_summary") or "",
+                _source(result),
+                result.get("model"),
+                json.dumps({name: check["status"] for name, check in quality.items()}) if quality else None
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO analyses ({', '.join(_COLUMNS[1:])}) VALUES ({', '.join('?' * 11)})", rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def record(self, jd_text: str, resume_text: str, result: Dict, candidate: str = "",
+               quality: Optional[Dict[str, dict]] = None) -> int:
+        """
+        Store one analysis.
+
+        Args:
+            jd_text: The job description text
+            resume_text: The extracted resume text
+            result: analyze_resume_with_llm() result
+            candidate: Display name (e.g. the PDF file name)
+            quality: check_resume_quality() result
+
+        Returns:
+            Number of rows stored (0 for failed analyses)
+        """
+        return self.record_many(jd_text, [dict(
+            result, resume_hash=content_hash(resume_text), candidate=candidate, quality=quality
+        )])
+
+    def clear(self) -> None:
+        """Delete the whole history."""
+        with self._lock:
+            self._conn.execute("DELETE FROM analyses")
+            self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Querying
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _where(history_filter: HistoryFilter) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        if history_filter.jd_hash:
+            clauses.append("jd_hash = ?")
+            params.append(history_filter.jd_hash)
+        if history_filter.resume_hash:
+            clauses.append("resume_hash = ?")
+            params.append(history_filter.resume_hash)
+        if history_filter.min_score is not None:
+            clauses.append("match_percentage >= ?")
+            params.append(history_filter.min_score)
+        if history_filter.max_score is not None:
+            clauses.append("match_percentage <= ?")
+            params.append(history_filter.max_score)
+        if history_filter.candidate:
+            clauses.append("candidate LIKE ? ESCAPE '\\'")
+            escaped = history_filter.candidate.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        return clauses, params
+
+    def page(
+        self,
+        history_filter: HistoryFilter = HistoryFilter(),
+        order: str = "newest",
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[HistoryEntry], Optional[Tuple[float, int]]]:
+        """
+        Fetch one page of history, highest sort key first.
+
+        Args:
+            history_filter: Rows to include
+            order: "newest" (timestamp) or "score" (match percentage)
+            limit: Rows per page
+            after: Cursor returned with the previous page (None for the first page)
+
+        Returns:
+            Tuple of (entries, cursor for the next page or None if this is the last)
+        """
+        column = ORDERS[order]
+        clauses, params = self._where(history_filter)
+        if after is not None:
+            clauses.append(f"({column}, id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM analyses {where} "
+                f"ORDER BY {column} DESC, id DESC LIMIT ?",
+                params + [limit + 1]
+            ).fetchall()
+        entries = [_entry(row) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return entries, None
+        last = entries[-1]
+        return entries, (getattr(last, column), last.id)
+
+    def count(self, history_filter: HistoryFilter = HistoryFilter()) -> int:
+        """Number of rows matching a filter."""
+        clauses, params = self._where(history_filter)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM analyses {where}", params).fetchone()[0]
+
+    def latest(self, jd_text: str, resume_text: str) -> Optional[HistoryEntry]:
+        """
+        The most recent analysis of this resume against this job description.
+
+        Returns:
+            HistoryEntry, or None if the pair was never analyzed
+        """
+        entries, _ = self.page(HistoryFilter(jd_hash=content_hash(jd_text),
+                                             resume_hash=content_hash(resume_text)), limit=1)
+        return entries[0] if entries else None
+
+    def requisitions(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """
+        Job descriptions in the history, most recently used first.
+
+        Returns:
+            List of dicts with keys: jd_hash, jd_title, analyses, last_analyzed
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT jd_hash, MAX(jd_title), COUNT(*), MAX(created_at) FROM analyses "
+                "GROUP BY jd_hash ORDER BY MAX(created_at) DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"jd_hash": jd_hash, "jd_title": title, "analyses": count, "last_analyzed": last}
+                for jd_hash, title, count, last in rows]
+
+    def iter_entries(self, history_filter: HistoryFilter = HistoryFilter(),
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[HistoryEntry]]:
+        """
+        Yield every matching row, newest first, in lists of up to batch_size.
+
+        Args:
+            history_filter: Rows to include
+            batch_size: Rows per yielded list
+        """
+        after = None
+        while True:
+            entries, after = self.page(history_filter, "newest", batch_size, after)
+            if entries:
+                yield entries
+            if after is None:
+                return
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+
+    def export_csv(self, output: IO[str], history_filter: HistoryFilter = HistoryFilter()) -> int:
+        """
+        Write matching rows as CSV (keywords joined with "; ", quality as JSON).
+
+        Args:
+            output: Text stream (open with newline="")
+            history_filter: Rows to include
+
+        Returns:
+            Number of rows written
+        """
+        writer = csv.writer(output)
+        writer.writerow(_COLUMNS)
+        written = 0
+        for entries in self.iter_entries(history_filter):
+            writer.writerows(
+                entry._replace(missing_keywords="; ".join(entry.missing_keywords),
+                               quality=json.dumps(entry.quality) if entry.quality else "")
+                for entry in entries
+            )
+            written += len(entries)
+        return written
+
+    def export_parquet(self, output: Any, history_filter: HistoryFilter = HistoryFilter()) -> int:
+        """
+        Write matching rows as Parquet, one row group per fetched batch.
+
+        Args:
+            output: File path or binary stream
+            history_filter: Rows to include
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("id", pa.int64()), ("created_at", pa.timestamp("ms")), ("jd_hash", pa.string()),
+            ("resume_hash", pa.string()), ("jd_title", pa.string()), ("candidate", pa.string()),
+            ("match_percentage", pa.int32()), ("missing_keywords", pa.list_(pa.string())),
+            ("profile_summary", pa.string()), ("source", pa.string()), ("model", pa.string()),
+            ("quality", pa.string()),
+        ])
+        written = 0
+        with pq.ParquetWriter(output, schema) as writer:
+            for entries in self.iter_entries(history_filter):
+                columns = {name: [getattr(entry, name) for entry in entries] for name in _COLUMNS}
+                columns["created_at"] = [int(value * 1000) for value in columns["created_at"]]
+                columns["quality"] = [json.dumps(value) if value else None for value in columns["quality"]]
+                writer.write_table(pa.table(columns, schema=schema))
+                written += len(entries)
+        return written
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[HistoryStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """
+    Return the process-wide history store, creating it on first use.
+
+    Returns:
+        Shared HistoryStore instance
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HistoryStore()
+        return _default_store
@@ -0,0 +1,216 @@
+"""
+================================================================================
+SmartMatch AI - Job Description Profiles
+================================================================================
+
+One job description is matched against many resumes, yet every analysis used
+to re-send the full JD. A JD profile is extracted once per requisition
+(title, seniority, minimum years, required/preferred skills, must-have
+requirements), cached by content hash, and rendered as a compact prompt block
+that replaces the full JD in later analyses. Profiles without a title or
+without must-have requirements (typically heading-less prose JDs) are
+incomplete; callers send the packed JD for those instead.
+================================================================================
+"""
+
+import functools
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from smartmatch.cache import DEFAULT_CACHE_DIR, ResultCache, make_cache_key
+from smartmatch.prescore import SYNONYMS, TECH_TERMS, display_term, tokenize
+from smartmatch.truncation import JD_HEADINGS, dedupe_lines, split_sections, strip_jd_boilerplate
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+PROFILE_VERSION = "jd-profile-v1"  # Bump when extraction changes to invalidate the cache
+PROFILE_CACHE_TTL_SECONDS = 90 * 24 * 60 * 60
+MAX_SKILLS = 20
+MAX_MUST_HAVES = 8
+MAX_MUST_HAVE_CHARS = 140
+
+SENIORITY_LEVELS = [
+    ("intern", r"\bintern(?:ship)?\b"),
+    ("junior", r"\b(?:junior|jr\.?|entry[- ]level|graduate)\b"),
+    ("mid", r"\b(?:mid[- ]level|intermediate)\b"),
+    ("senior", r"\b(?:senior|sr\.?)\b"),
+    ("staff", r"\bstaff\b"),
+    ("principal", r"\bprincipal\b"),
+    ("lead", r"\b(?:lead|team lead|tech lead)\b"),
+    ("manager", r"\b(?:manager|head of|director)\b"),
+]
+
+_YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*(?:-|to)?\s*(?:\d{1,2}\s*)?\+?\s*years?", re.IGNORECASE)
+_REQUIRED_TITLES = re.compile(r"requirement|qualification|must|skills|looking for|responsibilit|what you")
+_PREFERRED_TITLES = re.compile(r"preferred|nice to have|bonus|plus")
+_BULLET_PATTERN = re.compile(r"^\s*(?:[-*•●▪◦]|\d+[.)])\s+")
+
+
+class JDProfile(NamedTuple):
+    """Compact, structured summary of a job description."""
+    title: str
+    seniority: Optional[str]
+    min_years: Optional[int]
+    required_skills: List[str]
+    preferred_skills: List[str]
+    must_haves: List[str]
+
+    @property
+    def complete(self) -> bool:
+        """True if the profile can stand in for the JD (has a title and must-haves)."""
+        return bool(self.title and self.must_haves)
+
+    def to_prompt(self) -> str:
+        """
+        Render the profile as the compact JD block sent to the model.
+
+        Returns:
+            Multi-line prompt text
+        """
+        role = self.title or "Unspecified role"
+        details = [d for d in (self.seniority, f"{self.min_years}+ years" if self.min_years else None) if d]
+        lines = [f"Role: {role}" + (f" ({', '.join(details)})" if details else "")]
+        if self.required_skills:
+            lines.append("Required skills: " + ", ".join(self.required_skills))
+        if self.preferred_skills:
+            lines.append("Preferred skills: " + ", ".join(self.preferred_skills))
+        if self.must_haves:
+            lines.append("Key requirements:")
+            lines.extend(f"- {item}" for item in self.must_haves)
+        return "\n".join(lines)
+
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+def _surface_form(term: str, jd_text: str) -> str:
+    """How the JD itself spells a canonical term (falls back to display_term)."""
+    for alias in sorted(SYNONYMS.get(term, [term]), key=len, reverse=True):
+        match = re.search(r"(?<![\w+#.])" + re.escape(alias) + r"(?![\w+#])", jd_text, re.IGNORECASE)
+        if match:
+            return match.group(0)
+    return display_term(term)
+
+
+def _skills_in(text: str) -> List[str]:
+    """Technical terms in order of first appearance."""
+    seen = []
+    for term in tokenize(text):
+        if term in TECH_TERMS and term not in seen:
+            seen.append(term)
+    return seen
+
+
+def build_jd_profile(jd_text: str) -> JDProfile:
+    """
+    Extract a JD profile locally (no LLM call).
+
+    Args:
+        jd_text: The job description text
+
+    Returns:
+        JDProfile
+    """
+    cleaned = strip_jd_boilerplate(dedupe_lines(jd_text))
+    heading_pattern = re.compile(
+        r"^\s*(?:" + "|".join(re.escape(h) for h in JD_HEADINGS) + r"|preferred|bonus points)\s*:?\s*$",
+        re.IGNORECASE
+    )
+    sections = split_sections(cleaned, heading_pattern, window_fallback=False)
+
+    title = ""
+    for line in cleaned.splitlines():
+        line = line.strip()
+        if line:
+            title = line if len(line.split()) <= 10 else ""
+            break
+
+    seniority = None
+    for level, pattern in SENIORITY_LEVELS:
+        if re.search(pattern, title, re.IGNORECASE):
+            seniority = level
+            break
+    if seniority is None:
+        for level, pattern in SENIORITY_LEVELS:
+            if re.search(pattern, cleaned, re.IGNORECASE):
+                seniority = level
+                break
+
+    years = [int(match) for match in _YEARS_PATTERN.findall(cleaned) if 0 < int(match) <= 30]
+    min_years = max(years) if years else None
+
+    required_text, preferred_text, must_haves = [], [], []
+    for section in sections:
+        if _PREFERRED_TITLES.search(section.title):
+            preferred_text.append(section.text)
+            continue
+        required_text.append(section.text)
+        if section.index > 0 and _REQUIRED_TITLES.search(section.title):
+            for line in section.text.splitlines()[1:]:
+                item = _BULLET_PATTERN.sub("", line).strip()
+                if item and len(must_haves) < MAX_MUST_HAVES:
+                    must_haves.append(item[:MAX_MUST_HAVE_CHARS])
+
+    required = _skills_in("\n".join(required_text))
+    preferred = [term for term in _skills_in("\n".join(preferred_text)) if term not in required]
+
+    # Keep the must-have list from repeating what the skill lists already say
+    skill_names = {term for term in required + preferred}
+    must_haves = [item for item in must_haves if set(tokenize(item)) - skill_names]
+
+    return JDProfile(
+        title=title,
+        seniority=seniority,
+        min_years=min_years,
+        required_skills=[_surface_form(term, jd_text) for term in required[:MAX_SKILLS]],
+        preferred_skills=[_surface_form(term, jd_text) for term in preferred[:MAX_SKILLS]],
+        must_haves=must_haves,
+    )
+
+
+# =============================================================================
+# CACHING
+# =============================================================================
+
+_profile_cache: Optional[ResultCache] = None
+_profile_cache_lock = threading.Lock()
+
+
+def _get_profile_cache() -> ResultCache:
+    global _profile_cache
+    with _profile_cache_lock:
+        if _profile_cache is None:
+            _profile_cache = ResultCache(
+                os.path.join(DEFAULT_CACHE_DIR, "jd_profiles.sqlite3"),
+                ttl_seconds=PROFILE_CACHE_TTL_SECONDS
+            )
+        return _profile_cache
+
+
+@functools.lru_cache(maxsize=128)
+def get_jd_profile(jd_text: str) -> JDProfile:
+    """
+    Return the profile for a JD, extracting and caching it on first use.
+
+    Profiles are memoized in-process and persisted by content hash, so every
+    candidate screened for the same requisition reuses one extraction.
+
+    Args:
+        jd_text: The job description text
+
+    Returns:
+        JDProfile
+    """
+    cache = _get_profile_cache()
+    key = make_cache_key(PROFILE_VERSION, jd_text)
+    cached: Optional[Dict] = cache.get(key)
+    if cached is not None:
+        return JDProfile(**cached)
+
+    profile = build_jd_profile(jd_text)
+    cache.set(key, profile._asdict())
+    return profile
@@ -0,0 +1,310 @@
+"""
+================================================================================
+SmartMatch AI - Persistent Job Queue
+================================================================================
+
+SQLite-backed job queue for the headless service (`smartmatch.service`).
+
+Jobs survive restarts and are shared between the HTTP front end and any
+number of worker processes:
+
+- enqueue() stores a JSON payload with status "queued"
+- claim() atomically hands the oldest queued job to one worker (BEGIN
+  IMMEDIATE), and also reclaims jobs whose worker died mid-run
+- lease() keeps a claimed job's lease alive with a heartbeat while it runs,
+  so long jobs are not reclaimed and run twice
+- complete() / fail() record the outcome, only for the attempt that still
+  holds the job; get() reports status and result
+================================================================================
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+from smartmatch.cache import DEFAULT_CACHE_DIR
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_LEASE_SECONDS = 300.0  # A running job without a heartbeat is reclaimed after this long
+HEARTBEATS_PER_LEASE = 3
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 60 * 60  # Finished jobs are purged after a week
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class Job(NamedTuple):
+    """A claimed job."""
+    id: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue:
+    """
+    Multi-process safe job queue stored in one SQLite file.
+
+    Every process opens its own JobQueue on the same path; within a process
+    the instance is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS
+    ):
+        """
+        Open (or create) a job database.
+
+        Args:
+            path: SQLite file path, defaults to <cache dir>/jobs.sqlite3
+            lease_seconds: Seconds without a heartbeat before a running job is
+                considered abandoned
+            max_attempts: Claims per job before it is marked failed
+            retention_seconds: Age after which finished jobs are deleted
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly where needed
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "heartbeat_at" not in columns:
+            # Added after the first release; older rows fall back to started_at
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)"
+        )
+        # The retention purge runs on every finish
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at)")
+
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        """
+        Add a job.
+
+        Args:
+            payload: JSON-serializable job description
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, STATUS_QUEUED, json.dumps(payload), time.time())
+            )
+        return job_id
+
+    def claim(self) -> Optional[Job]:
+        """
+        Atomically take the oldest queued (or abandoned) job.
+
+        Returns:
+            The claimed Job, or None if nothing is waiting
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died are retried, up to max_attempts
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ? "
+                    "WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ? AND attempts >= ?",
+                    (STATUS_FAILED, now, "Worker did not finish the job.",
+                     STATUS_RUNNING, now - self.lease_seconds, self.max_attempts)
+                )
+                row = self._conn.execute(
+                    "SELECT id, payload, attempts FROM jobs "
+                    "WHERE status = ? OR (status = ? AND COALESCE(heartbeat_at, started_at) < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (STATUS_QUEUED, STATUS_RUNNING, now - self.lease_seconds)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                job_id, payload, attempts = row
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, attempts = ? WHERE id = ?",
+                    (STATUS_RUNNING, now, now, attempts + 1, job_id)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return Job(job_id, json.loads(payload), attempts + 1)
+
+    def renew(self, job: Job) -> bool:
+        """
+        Extend a running job's lease.
+
+        Args:
+            job: Job returned by claim()
+
+        Returns:
+            False if the job was reclaimed (or finished) in the meantime
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND attempts = ? AND status = ?",
+                (time.time(), job.id, job.attempts, STATUS_RUNNING)
+            )
+        return cursor.rowcount > 0
+
+    @contextlib.contextmanager
+    def lease(self, job: Job) -> Iterator[None]:
+        """
+        Renew the job's lease in the background while the block runs.
+
+        Args:
+            job: Job returned by claim()
+        """
+        stop = threading.Event()
+
+        def heartbeat() -> None:
+            while not stop.wait(self.lease_seconds / HEARTBEATS_PER_LEASE):
+                try:
+                    if not self.renew(job):
+                        return
+                except sqlite3.Error:
+                    pass  # Database busy; the next heartbeat tries again
+
+        thread = threading.Thread(target=heartbeat, name=f"job-lease-{job.id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _finish(self, job_id: str, attempt: Optional[int], status: str,
+                result: Optional[Dict], error: Optional[str]) -> bool:
+        now = time.time()
+        query = ("UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                 "payload = '{}' WHERE id = ?")
+        params = [status, json.dumps(result) if result is not None else None, error, now, job_id]
+        if attempt is not None:
+            # A stale worker must not overwrite the attempt that reclaimed the job
+            query += " AND attempts = ? AND status = ?"
+            params += [attempt, STATUS_RUNNING]
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at < ?", (now - self.retention_seconds,)
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, result: Dict[str, Any], attempt: Optional[int] = None) -> bool:
+        """
+        Record a successful job (its payload is dropped to save space).
+
+        Args:
+            job_id: Id returned by enqueue()
+            result: JSON-serializable result
+            attempt: Job.attempts of the claim; if given, the result is only
+                recorded while that attempt still holds the job
+
+        Returns:
+            True if the result was recorded
+        """
+        return self._finish(job_id, attempt, STATUS_DONE, result, None)
+
+    def fail(self, job_id: str, error: str, attempt: Optional[int] = None) -> bool:
+        """
+        Record a failed job.
+
+        Args:
+            job_id: Id returned by enqueue()
+            error: User-facing error message
+            attempt: Job.attempts of the claim (see complete())
+
+        Returns:
+            True if the failure was recorded
+        """
+        return self._finish(job_id, attempt, STATUS_FAILED, None, error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Report a job's status.
+
+        Args:
+            job_id: Id returned by enqueue()
+
+        Returns:
+            dict with keys: id, status, result, error, attempts, created_at,
+            started_at, finished_at; or None for an unknown id
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, result, error, attempts, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "status": row[1],
+            "result": json.loads(row[2]) if row[2] is not None else None,
+            "error": row[3],
+            "attempts": row[4],
+            "created_at": row[5],
+            "started_at": row[6],
+            "finished_at": row[7],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count jobs by status.
+
+        Returns:
+            dict with keys: queued, running, done, failed
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = {STATUS_QUEUED: 0, STATUS_RUNNING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,286 @@
+"""
+================================================================================
+SmartMatch AI - Multi-JD Matching
+================================================================================
+
+Routes one resume to the best of many open requisitions.
+
+1. Local prefilter: every JD is pre-scored against the resume (no LLM call)
+   and only the top-K requisitions are analyzed
+2. Batched prompts: the resume is sent once per group of JDs (each JD as its
+   compact cached profile, or packed text when the profile is incomplete)
+   and the model answers with one JSON object per JD
+3. Results are cached per resume/JD pair and returned as a ranked list with
+   the usual match_percentage / missing_keywords / profile_summary fields
+
+JDs the model leaves out of its array answer are re-analyzed individually.
+================================================================================
+"""
+
+import concurrent.futures
+import re
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from smartmatch.cache import get_default_cache, make_cache_key
+from smartmatch.core import (
+    RESUME_TOKEN_BUDGET, SYSTEM_PROMPT, TEMPERATURE, _describe_api_error, _fallback_result,
+    _jd_prompt, analyze_resume_with_llm, resolve_model
+)
+from smartmatch.prescore import PreScore, prescore_resume
+from smartmatch.providers import LLMProvider, get_provider
+from smartmatch.scheduler import PRIORITY_BATCH, get_scheduler
+from smartmatch.structured import StructuredOutputError, parse_json_lenient, validate_analysis
+from smartmatch.truncation import count_tokens, pack_resume
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_TOP_K = 10
+DEFAULT_JDS_PER_CALL = 5
+MAX_TOKENS_PER_JD = 220  # Completion budget per JD in a batched answer
+MAX_PARALLEL_CALLS = 4
+
+MULTI_JD_SYSTEM_PROMPT = SYSTEM_PROMPT.split("You MUST respond")[0] + """You will receive ONE resume and SEVERAL job descriptions, each labelled like [JD-1].
+Evaluate the resume against EACH job description independently, using the criteria above.
+
+You MUST respond with ONLY a valid JSON array, no markdown, no explanation, no code blocks,
+containing one object per job description in the order given:
+[
+  {
+    "jd": "<label, e.g. JD-1>",
+    "match_percentage": <integer 0-100>,
+    "missing_keywords": [<list of 3-8 critical missing skills/technologies>],
+    "profile_summary": "<2-3 sentence professional assessment of the candidate's fit for this specific role>"
+  }
+]"""
+
+INVALID_JSON_ERROR = "LLM returned invalid JSON. Please try again."
+
+_LABEL_PATTERN = re.compile(r"JD-(\d+)")
+_JD_SEPARATOR = re.compile(r"^\s*-{3,}\s*$", re.MULTILINE)
+
+
+def split_job_descriptions(text: str) -> Dict[str, str]:
+    """
+    Split pasted text holding several JDs separated by lines of "---".
+
+    Each JD is keyed by "<n>. <first line>" so requisitions stay recognizable.
+
+    Args:
+        text: One or more job descriptions
+
+    Returns:
+        Mapping of requisition id -> JD text, in input order
+    """
+    jds = {}
+    for block in _JD_SEPARATOR.split(text):
+        block = block.strip()
+        if block:
+            title = block.splitlines()[0].strip()[:60]
+            jds[f"{len(jds) + 1}. {title}"] = block
+    return jds
+
+
+# =============================================================================
+# PREFILTER
+# =============================================================================
+
+def prefilter_jds(resume_text: str, jds: Mapping[str, str],
+                  top_k: int = DEFAULT_TOP_K) -> List[Tuple[str, PreScore]]:
+    """
+    Rank JDs by local pre-score and keep the best `top_k`.
+
+    Args:
+        resume_text: Extracted resume text
+        jds: Mapping of requisition id -> JD text
+        top_k: Number of JDs to keep
+
+    Returns:
+        List of (jd_id, PreScore), best first
+    """
+    scored = [(jd_id, prescore_resume(resume_text, jd_text)) for jd_id, jd_text in jds.items()]
+    scored.sort(key=lambda item: -item[1].score)
+    return scored[:top_k]
+
+
+# =============================================================================
+# BATCHED ANALYSIS
+# =============================================================================
+
+def _build_multi_prompt(resume_excerpt: str, jd_prompts: List[str]) -> str:
+    blocks = "\n\n".join(
+        f"=== [JD-{index}] ===\n{prompt}" for index, prompt in enumerate(jd_prompts, start=1)
+    )
+    return f"""Analyze this resume against each of the {len(jd_prompts)} job descriptions.
+
+{blocks}
+
+=== RESUME ===
+{resume_excerpt}
+
+Respond with ONLY the JSON array, nothing else."""
+
+
+def _parse_multi_response(response_text: str, count: int) -> Dict[int, Dict]:
+    """
+    Map the model's array answer to JD positions (0-based).
+
+    Entries are matched by their "jd" label, falling back to array position.
+    A truncated array keeps its complete entries; entries that fail schema
+    validation are left out (and analyzed individually by the caller).
+
+    Raises:
+        StructuredOutputError: If the response contains no usable JSON
+    """
+    parsed, _ = parse_json_lenient(response_text, "[{")
+    if isinstance(parsed, dict):
+        # Some answers wrap the array, e.g. {"results": [...]}
+        parsed = next((value for value in parsed.values() if isinstance(value, list)), [parsed])
+
+    results = {}
+    for position, entry in enumerate(parsed):
+        if not isinstance(entry, dict):
+            continue
+        match = _LABEL_PATTERN.search(str(entry.get("jd", "")))
+        index = int(match.group(1)) - 1 if match else position
+        if 0 <= index < count and index not in results:
+            result, problems = validate_analysis(entry)
+            if problems:
+                continue
+            result.pop("jd", None)
+            results[index] = result
+    return results
+
+
+def _analyze_group(provider: LLMProvider, model: str, resume_excerpt: str, jd_prompts: List[str],
+                   priority: int) -> Tuple[Dict[int, Dict], Optional[str]]:
+    """One LLM call for a group of JDs. Returns (results by position, error_message)."""
+    messages = [
+        {"role": "system", "content": MULTI_JD_SYSTEM_PROMPT},
+        {"role": "user", "content": _build_multi_prompt(resume_excerpt, jd_prompts)}
+    ]
+    max_tokens = MAX_TOKENS_PER_JD * len(jd_prompts)
+    try:
+        completion = get_scheduler().run(
+            lambda: provider.complete(messages, model, TEMPERATURE, max_tokens, timeout=60.0),
+            tokens=sum(count_tokens(message["content"]) for message in messages) + max_tokens,
+            priority=priority
+        )
+        return _parse_multi_response(completion.content, len(jd_prompts)), None
+    except StructuredOutputError:
+        return {}, INVALID_JSON_ERROR
+    except Exception as e:
+        return {}, _describe_api_error(e)
+
+
+def match_resume_to_jds(
+    resume_text: str,
+    jds: Mapping[str, str],
+    api_key: str,
+    top_k: int = DEFAULT_TOP_K,
+    jds_per_call: int = DEFAULT_JDS_PER_CALL,
+    use_cache: bool = True,
+    priority: int = PRIORITY_BATCH,
+    model: Optional[str] = None
+) -> List[Dict]:
+    """
+    Score one resume against many job descriptions and rank them.
+
+    Args:
+        resume_text: Extracted resume text
+        jds: Mapping of requisition id -> JD text
+        api_key: The Groq API key
+        top_k: JDs kept by the local prefilter (the rest are not analyzed)
+        jds_per_call: JDs batched into one LLM prompt
+        use_cache: Serve and store per-JD results through the result cache
+        priority: Scheduler lane (PRIORITY_INTERACTIVE or PRIORITY_BATCH)
+        model: Route name ("accurate", "fast") or model id
+
+    Returns:
+        List of dicts, best match first, with keys: jd_id, match_percentage,
+        missing_keywords, profile_summary, error, cached, prescore
+    """
+    shortlisted = prefilter_jds(resume_text, jds, top_k)
+    if not shortlisted:
+        return []
+
+    # The resume is packed once, for the shortlisted JDs together
+    combined_jd = "\n\n".join(jds[jd_id] for jd_id, _ in shortlisted)
+    resume_excerpt = pack_resume(resume_text, combined_jd, RESUME_TOKEN_BUDGET)
+    # Compact profiles where complete, packed JD text otherwise
+    jd_prompts = {jd_id: _jd_prompt(jds[jd_id])[1] for jd_id, _ in shortlisted}
+
+    provider = get_provider(api_key)
+    model = resolve_model(model)
+    cache = get_default_cache() if use_cache else None
+    cache_keys = {
+        jd_id: make_cache_key("multi-jd", jd_prompts[jd_id], resume_excerpt,
+                              provider.name, model, TEMPERATURE, MULTI_JD_SYSTEM_PROMPT)
+        for jd_id, _ in shortlisted
+    }
+
+    results: Dict[str, Dict] = {}
+    pending: List[str] = []
+    for jd_id, _ in shortlisted:
+        cached_result = cache.get(cache_keys[jd_id]) if cache is not None else None
+        if cached_result is not None:
+            cached_result["error"] = None
+            cached_result["cached"] = True
+            results[jd_id] = cached_result
+        else:
+            pending.append(jd_id)
+
+    problem = provider.check() if pending else None
+    if problem:
+        for jd_id in pending:
+            fallback = _fallback_result()
+            fallback["error"] = problem
+            results[jd_id] = fallback
+        pending = []
+
+    groups = [pending[start:start + max(1, jds_per_call)]
+              for start in range(0, len(pending), max(1, jds_per_call))]
+    retry_individually: List[str] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_CALLS, len(groups) or 1)) as pool:
+        futures = {
+            pool.submit(_analyze_group, provider, model, resume_excerpt,
+                        [jd_prompts[jd_id] for jd_id in group], priority): group
+            for group in groups
+        }
+        for future in concurrent.futures.as_completed(futures):
+            group = futures[future]
+            group_results, error = future.result()
+            for position, jd_id in enumerate(group):
+                result = group_results.get(position)
+                if result is not None:
+                    results[jd_id] = result
+                    if cache is not None:
+                        cache.set(cache_keys[jd_id], {
+                            "match_percentage": result["match_percentage"],
+                            "missing_keywords": result["missing_keywords"],
+                            "profile_summary": result["profile_summary"]
+                        })
+                elif error and error != INVALID_JSON_ERROR:
+                    # The API call itself failed; retrying per JD would fail the same way
+                    fallback = _fallback_result()
+                    fallback["error"] = error
+                    results[jd_id] = fallback
+                else:
+                    retry_individually.append(jd_id)
+
+    # JDs missing from an array answer (or from an unparseable one) get a single-JD call
+    for jd_id in retry_individually:
+        results[jd_id] = analyze_resume_with_llm(
+            resume_text, jds[jd_id], api_key, use_cache=use_cache,
+            priority=priority, use_jd_profile=True, model=model
+        )
+
+    prescores = dict(shortlisted)
+    ranked = []
+    for jd_id, _ in shortlisted:
+        result = dict(results[jd_id])
+        result["jd_id"] = jd_id
+        result["prescore"] = round(prescores[jd_id].score, 1)
+        ranked.append(result)
+    ranked.sort(key=lambda r: (r["error"] is not None, -r["match_percentage"], -r["prescore"]))
+    return ranked
@@ -0,0 +1,364 @@
+"""
+================================================================================
+SmartMatch AI - OCR Fallback for Scanned Resumes
+================================================================================
+
+PDFs without a text layer (scans, photographed CVs) used to be rejected with
+"It might be a scanned image". They are now OCR'd locally:
+
+- Pages are rendered with Poppler's `pdftoppm` and read with the `tesseract`
+  binary, one page at a time, in background jobs. Both tools run as separate
+  processes, so OCR never holds the GIL or the Streamlit script thread;
+  a small pool of job threads only drives them
+- The queue is bounded: when it is full, interactive callers get an error
+  immediately and batch workers wait for a slot
+- Every document has a time budget; pages finished in time are returned
+  (the job is marked partial) but only complete text is cached
+- OCR text is cached by the PDF's SHA-256, and concurrent requests for the
+  same file share one job
+- Jobs expose pages done / page count, which the dashboard shows as progress
+
+OCR is skipped (and the old error returned) when the binaries are missing:
+    apt-get install tesseract-ocr poppler-utils   # or: brew install tesseract poppler
+================================================================================
+"""
+
+import concurrent.futures
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from smartmatch.cache import DEFAULT_CACHE_DIR, ResultCache
+from smartmatch.pdf_engine import DEFAULT_MAX_PAGES, NO_TEXT_ERROR, PdfSource, _digest, _open_stream
+from smartmatch.telemetry import get_telemetry
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+OCR_ENABLED = os.environ.get("SMARTMATCH_OCR", "1") != "0"
+DEFAULT_OCR_WORKERS = int(os.environ.get("SMARTMATCH_OCR_WORKERS", "2"))
+DEFAULT_OCR_QUEUE_SIZE = int(os.environ.get("SMARTMATCH_OCR_QUEUE_SIZE", "16"))  # Queued + running
+DEFAULT_OCR_TIME_BUDGET = float(os.environ.get("SMARTMATCH_OCR_TIME_BUDGET", "60"))  # Seconds per document
+OCR_LANGUAGE = os.environ.get("SMARTMATCH_OCR_LANGUAGE", "eng")
+OCR_DPI = 200
+COPY_CHUNK_BYTES = 1024 * 1024
+OCR_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+OCR_CACHE_MAX_ENTRIES = 20000
+
+# =============================================================================
+# USER-FACING ERRORS
+# =============================================================================
+OCR_QUEUE_FULL_ERROR = "⏳ Too many scanned resumes are being read right now. Please try again in a minute."
+OCR_TIMEOUT_ERROR = "❌ This scanned PDF could not be read within {budget:g} seconds."
+OCR_PARTIAL_WARNING = ("⚠️ Only {pages_done} of {page_count} pages of this scanned PDF could be read "
+                       "in time; the analysis covers those pages. Try again later for the full text.")
+
+
+def ocr_available() -> bool:
+    """Whether OCR is enabled and the pdftoppm and tesseract binaries are on PATH."""
+    return OCR_ENABLED and bool(shutil.which("pdftoppm")) and bool(shutil.which("tesseract"))
+
+
+# =============================================================================
+# JOBS
+# =============================================================================
+
+class OcrJob:
+    """One document being OCR'd; shared by every caller waiting for it."""
+
+    def __init__(self, digest: str):
+        self.digest = digest
+        self.state = "queued"  # queued | running | done
+        self.page_count = 0
+        self.pages_done = 0
+        self.text: Optional[str] = None
+        self.error: Optional[str] = None
+        self.partial = False  # Finished with text from only some pages (time budget ran out)
+        self._finished = threading.Event()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of pages done (0 while queued)."""
+        return self.pages_done / self.page_count if self.page_count else 0.0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def _finish(self, text: Optional[str], error: Optional[str], partial: bool = False) -> None:
+        self.text, self.error, self.partial = text, error, partial
+        self.state = "done"
+        self._finished.set()
+
+
+def _count_pages(path: str) -> int:
+    import PyPDF2
+
+    with open(path, "rb") as handle:
+        return len(PyPDF2.PdfReader(handle).pages)
+
+
+def _remaining(deadline: float, command: List[str]) -> float:
+    """Seconds left before `deadline` (time.monotonic()); raises TimeoutExpired if none."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise subprocess.TimeoutExpired(command, 0)
+    return remaining
+
+
+def _ocr_page(pdf_path: str, page_number: int, work_dir: str, deadline: float) -> str:
+    """
+    Render one page (1-based) and OCR it before `deadline` (time.monotonic()).
+
+    Each subprocess gets only the time still left, so the page never runs
+    past the document's deadline. Raises subprocess.TimeoutExpired.
+    """
+    prefix = os.path.join(work_dir, f"page-{page_number}")
+    render = ["pdftoppm", "-f", str(page_number), "-l", str(page_number), "-r", str(OCR_DPI),
+              "-gray", "-png", "-singlefile", pdf_path, prefix]
+    subprocess.run(render, check=True, capture_output=True, timeout=_remaining(deadline, render))
+    image_path = prefix + ".png"
+    try:
+        recognize = ["tesseract", image_path, "stdout", "-l", OCR_LANGUAGE]
+        completed = subprocess.run(recognize, check=True, capture_output=True,
+                                   timeout=_remaining(deadline, recognize))
+    finally:
+        os.remove(image_path)
+    return completed.stdout.decode("utf-8", "replace").strip()
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+class OcrPool:
+    """
+    Bounded background OCR queue with a text cache.
+
+    Safe to share between threads; the Streamlit sessions and batch workers
+    of one server process all submit to the same pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_OCR_WORKERS,
+        max_queue: int = DEFAULT_OCR_QUEUE_SIZE,
+        time_budget: float = DEFAULT_OCR_TIME_BUDGET,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        cache: Optional[ResultCache] = None
+    ):
+        """
+        Args:
+            max_workers: Documents OCR'd at the same time
+            max_queue: Documents queued or running before submissions are refused
+            time_budget: Seconds allowed per document, from the start of its OCR
+            max_pages: Only the first max_pages pages are read (0 = all)
+            cache: OCR text keyed by PDF SHA-256 (defaults to <cache dir>/ocr_text.sqlite3)
+        """
+        self.max_workers = max(1, max_workers)
+        self.time_budget = time_budget
+        self.max_pages = max_pages
+        self.cache = cache if cache is not None else ResultCache(
+            os.path.join(DEFAULT_CACHE_DIR, "ocr_text.sqlite3"),
+            ttl_seconds=OCR_CACHE_TTL_SECONDS,
+            max_entries=OCR_CACHE_MAX_ENTRIES
+        )
+        self._slots = threading.BoundedSemaphore(max(self.max_workers, max_queue))
+        self._jobs: Dict[str, OcrJob] = {}  # In-flight jobs by digest
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="smartmatch-ocr"
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Current load.
+
+        Returns:
+            dict with keys: queued, running
+        """
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {"queued": states.count("queued"), "running": states.count("running")}
+
+    def submit(self, data: PdfSource, block: bool = False) -> Tuple[Optional[OcrJob], Optional[str]]:
+        """
+        Queue a document for OCR (or join the job already reading it).
+
+        Args:
+            data: Raw PDF bytes or a seekable binary file; copied to a temp
+                file before returning, so the caller may close it
+            block: Wait for a queue slot instead of failing when the queue is full
+
+        Returns:
+            Tuple of (job, error_message); a cached document returns a
+            finished job
+        """
+        digest = _digest(data)
+        cached = self.cache.get(digest)
+        if cached is not None:
+            job = OcrJob(digest)
+            job._finish(cached["text"], None)
+            get_telemetry().increment("ocr_cache_hits")
+            return job, None
+
+        with self._lock:
+            job = self._jobs.get(digest)
+            if job is not None:
+                return job, None
+
+        if not self._slots.acquire(blocking=block):
+            get_telemetry().increment("ocr_rejected")
+            return None, OCR_QUEUE_FULL_ERROR
+
+        with self._lock:
+            job = self._jobs.get(digest)
+            if job is not None:
+                # Another caller queued it while we waited for the slot
+                self._slots.release()
+                return job, None
+            job = self._jobs[digest] = OcrJob(digest)
+
+        work_dir = None
+        try:
+            work_dir = tempfile.mkdtemp(prefix="smartmatch-ocr-")
+            pdf_path = os.path.join(work_dir, "document.pdf")
+            with open(pdf_path, "wb") as handle:
+                if isinstance(data, (bytes, bytearray)):
+                    handle.write(data)
+                else:
+                    source = _open_stream(data)
+                    for chunk in iter(lambda: source.read(COPY_CHUNK_BYTES), b""):
+                        handle.write(chunk)
+            self._executor.submit(self._run, job, pdf_path, work_dir)
+        except Exception as e:
+            # Callers that joined this job must not wait for it forever
+            error = f"❌ OCR failed: {str(e)}"
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            with self._lock:
+                self._jobs.pop(digest, None)
+            self._slots.release()
+            job._finish(None, error)
+            return None, error
+        return job, None
+
+    def _run(self, job: OcrJob, pdf_path: str, work_dir: str) -> None:
+        text, error, complete = None, None, False
+        try:
+            with get_telemetry().span("ocr") as span:
+                text, error, complete = self._ocr_document(job, pdf_path, work_dir)
+                span["pages"] = job.pages_done
+                span["ok"] = error is None
+        except Exception as e:
+            error = f"❌ OCR failed: {str(e)}"
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            if text and complete:
+                # Text cut short by the time budget (e.g. a busy server) is not cached
+                self.cache.set(job.digest, {"text": text})
+            with self._lock:
+                self._jobs.pop(job.digest, None)
+            self._slots.release()
+            job._finish(text, error, partial=bool(text) and not complete)
+
+    def _ocr_document(self, job: OcrJob, pdf_path: str,
+                      work_dir: str) -> Tuple[Optional[str], Optional[str], bool]:
+        """Returns (text, error, complete); complete is False when the time budget ran out."""
+        deadline = time.monotonic() + self.time_budget
+        job.state = "running"
+        page_count = _count_pages(pdf_path)
+        job.page_count = min(page_count, self.max_pages) if self.max_pages else page_count
+
+        pages = []
+        timed_out = False
+        for page_number in range(1, job.page_count + 1):
+            if time.monotonic() >= deadline:
+                timed_out = True
+                break
+            try:
+                page_text = _ocr_page(pdf_path, page_number, work_dir, deadline)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                break
+            except subprocess.CalledProcessError:
+                page_text = ""  # Unreadable page; keep going
+            if page_text:
+                pages.append(page_text)
+            job.pages_done = page_number
+
+        if pages:
+            # Pages read before the budget ran out are still worth analyzing
+            return "\n".join(pages), None, not timed_out
+        if timed_out:
+            return None, OCR_TIMEOUT_ERROR.format(budget=self.time_budget), False
+        return None, NO_TEXT_ERROR, True
+
+    def shutdown(self) -> None:
+        """Stop the job threads once queued work is done."""
+        self._executor.shutdown(wait=True)
+
+
+_default_pool: Optional[OcrPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> OcrPool:
+    """
+    Return the process-wide OCR pool, creating it on first use.
+
+    Returns:
+        Shared OcrPool instance
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = OcrPool()
+        return _default_pool
+
+
+# =============================================================================
+# EXTRACTION WITH FALLBACK
+# =============================================================================
+
+def extract_text_with_ocr(
+    pdf_file: PdfSource,
+    on_progress: Optional[Callable[[OcrJob], None]] = None,
+    block: bool = False,
+    poll_interval: float = 0.25
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    extract_text_from_pdf(), falling back to OCR for PDFs without a text layer.
+
+    Args:
+        pdf_file: Raw PDF bytes or a seekable binary file-like object
+        on_progress: Called with the OCR job every poll_interval while it
+            runs, and once more when it is done; check job.partial then
+            (text from only some pages, see OCR_PARTIAL_WARNING)
+        block: Wait for a queue slot when the OCR queue is full (batch
+            workers); otherwise fail fast (interactive requests)
+        poll_interval: Seconds between progress callbacks
+
+    Returns:
+        Tuple of (extracted_text, error_message)
+    """
+    from smartmatch.core import extract_text_from_pdf
+
+    if not isinstance(pdf_file, (bytes, bytearray)) and not pdf_file.seekable():
+        pdf_file = pdf_file.read()  # Read twice below (text layer, then OCR)
+    text, error = extract_text_from_pdf(pdf_file)
+    if error != NO_TEXT_ERROR or not ocr_available():
+        return text, error
+
+    job, error = get_ocr_pool().submit(pdf_file, block=block)
+    if job is None:
+        return None, error
+    while not job.wait(poll_interval if on_progress else None):
+        on_progress(job)
+    if on_progress:
+        on_progress(job)
+    return job.text, job.error
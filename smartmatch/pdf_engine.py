@@ -0,0 +1,418 @@
+"""
+================================================================================
+SmartMatch AI - PDF Extraction Engine
+================================================================================
+
+Page-level, parallel PDF text extraction.
+
+- Pages are extracted in worker processes, so multi-page CVs and batch intake
+  are not serialized behind the GIL
+- Extracted text is cached by the PDF's SHA-256, so a file is parsed only once
+- Every page has a timeout, for small documents too (they are read in one
+  worker task); a malformed page is skipped (and its worker recycled)
+  instead of stalling the whole batch. Only as many pages as there are
+  workers are in the pool at once, so the timeout measures work, not time
+  queued behind other documents. Pages lost when another document's stuck
+  worker was recycled are retried, and text with missing pages is never
+  cached
+- Uploads are checked as streams (hashing in chunks, PyPDF2 seeking in the
+  file), so per-file size and page-count limits reject oversized documents
+  before they are read into memory or any page is parsed
+================================================================================
+"""
+
+import concurrent.futures
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Tuple, Union
+
+from smartmatch.cache import DEFAULT_CACHE_DIR, ResultCache
+
+if TYPE_CHECKING:
+    import PyPDF2
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_PAGE_TIMEOUT = 10.0  # Seconds allowed per page
+# Below this page count a document is read in one worker task, not one per page
+DEFAULT_MIN_PAGES_FOR_POOL = 3
+# Rounds of resubmitting pages lost to a pool recycled by another document
+LOST_PAGE_RETRIES = 2
+# How often a document waiting for a free worker checks again
+CHUNK_POLL_SECONDS = 0.05
+TEXT_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+TEXT_CACHE_MAX_ENTRIES = 20000
+DEFAULT_MAX_FILE_BYTES = int(float(os.environ.get("SMARTMATCH_MAX_FILE_MB", "10")) * 1024 * 1024)
+DEFAULT_MAX_PAGES = int(os.environ.get("SMARTMATCH_MAX_PAGES", "50"))
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Raw bytes, or a seekable binary file (upload, spooled temp file, open file)
+PdfSource = Union[bytes, BinaryIO]
+
+# =============================================================================
+# USER-FACING ERRORS
+# =============================================================================
+ENCRYPTED_PDF_ERROR = "❌ This PDF is password-protected. Please upload an unencrypted resume."
+NO_TEXT_ERROR = "❌ Could not extract text from this PDF. It might be a scanned image."
+INVALID_PDF_ERROR = "❌ Invalid or corrupted PDF file. Please check the file and try again."
+FILE_TOO_LARGE_ERROR = "❌ This file is larger than the {limit_mb:g} MB limit. Please upload a smaller PDF."
+TOO_MANY_PAGES_ERROR = "❌ This PDF has {pages} pages; resumes are limited to {limit} pages."
+EXTRACTION_TIMEOUT_ERROR = "❌ Reading this PDF took too long. Please try again or upload a different file."
+
+
+# =============================================================================
+# STREAM HELPERS
+# =============================================================================
+
+def source_size(source: PdfSource) -> int:
+    """
+    Size of a PDF source in bytes, without reading it.
+
+    Args:
+        source: Raw bytes or a seekable binary file
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def file_too_large_error(max_bytes: int) -> str:
+    """User-facing error for a file above max_bytes."""
+    return FILE_TOO_LARGE_ERROR.format(limit_mb=round(max_bytes / (1024 * 1024), 1))
+
+
+def _digest(source: PdfSource) -> str:
+    """SHA-256 of a PDF source, hashing files in chunks."""
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+    sha = hashlib.sha256()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(HASH_CHUNK_BYTES), b""):
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _open_stream(source: PdfSource) -> BinaryIO:
+    """A stream PyPDF2 can read; files are used in place rather than copied."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+# =============================================================================
+# SERIAL EXTRACTION
+# =============================================================================
+
+def _extract_pages(pdf_reader: "PyPDF2.PdfReader") -> Tuple[Optional[str], Optional[str]]:
+    """Extract every page of an open reader; unreadable pages are skipped."""
+    text_content = []
+    for page in pdf_reader.pages:
+        try:
+            page_text = page.extract_text()
+            if page_text:
+                text_content.append(page_text)
+        except Exception:
+            continue
+
+    if not text_content:
+        return None, NO_TEXT_ERROR
+
+    return " ".join(text_content), None
+
+
+def extract_text_serial(data: PdfSource) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract text from every page in the calling thread (the original code path).
+
+    Args:
+        data: Raw PDF bytes or a seekable binary file
+
+    Returns:
+        Tuple of (extracted_text, error_message)
+    """
+    import PyPDF2  # Deferred: keeps `import smartmatch` fast
+
+    try:
+        pdf_reader = PyPDF2.PdfReader(_open_stream(data))
+
+        if pdf_reader.is_encrypted:
+            return None, ENCRYPTED_PDF_ERROR
+
+        return _extract_pages(pdf_reader)
+
+    except PyPDF2.errors.PdfReadError:
+        return None, INVALID_PDF_ERROR
+    except Exception as e:
+        return None, f"❌ An unexpected error occurred: {str(e)}"
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+# Each worker keeps the most recently parsed document, so the PDF structure is
+# parsed once per worker rather than once per page.
+_worker_document: Optional[Tuple[str, "PyPDF2.PdfReader"]] = None
+
+
+def _extract_page_range(digest: str, data: bytes, start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop) inside a worker process; unreadable pages are ""."""
+    import PyPDF2
+
+    global _worker_document
+    if _worker_document is None or _worker_document[0] != digest:
+        _worker_document = (digest, PyPDF2.PdfReader(io.BytesIO(data)))
+    pages = []
+    for page in _worker_document[1].pages[start:stop]:
+        try:
+            pages.append(page.extract_text() or "")
+        except Exception:
+            pages.append("")
+    return pages
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+class PdfExtractionEngine:
+    """
+    Parallel, cached PDF text extractor.
+
+    The engine is safe to share between threads; batch screening workers all
+    submit pages to the same process pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+        min_pages_for_pool: int = DEFAULT_MIN_PAGES_FOR_POOL,
+        cache: Optional[ResultCache] = None,
+        max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        max_pages: int = DEFAULT_MAX_PAGES
+    ):
+        """
+        Args:
+            max_workers: Worker processes (defaults to the CPU count)
+            page_timeout: Seconds allowed for any single page
+            min_pages_for_pool: Documents with fewer pages are extracted in one
+                worker task (timeout: page_timeout per page) instead of one per page
+            cache: Text cache keyed by PDF SHA-256 (defaults to <cache dir>/pdf_text.sqlite3)
+            max_bytes: Larger files are rejected without being read (0 = no limit)
+            max_pages: Documents with more pages are rejected (0 = no limit)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.page_timeout = page_timeout
+        self.min_pages_for_pool = min_pages_for_pool
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.cache = cache if cache is not None else ResultCache(
+            os.path.join(DEFAULT_CACHE_DIR, "pdf_text.sqlite3"),
+            ttl_seconds=TEXT_CACHE_TTL_SECONDS,
+            max_entries=TEXT_CACHE_MAX_ENTRIES
+        )
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # One slot per worker, shared by every document being extracted
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+    # -------------------------------------------------------------------------
+    # Process pool management
+    # -------------------------------------------------------------------------
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # "spawn" avoids forking a multi-threaded Streamlit server
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _recycle_executor(self, executor: concurrent.futures.ProcessPoolExecutor) -> None:
+        """Kill a pool whose worker is stuck on a page; a fresh pool is created lazily."""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # -------------------------------------------------------------------------
+    # Extraction
+    # -------------------------------------------------------------------------
+
+    def _run_ranges(self, digest: str, data: bytes, ranges: List[Tuple[int, int]],
+                    pages: List[str]) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Extract page ranges into `pages`, one task per free worker.
+
+        Across all documents at most max_workers tasks are in the pool, so a
+        task starts as soon as it is submitted and its deadline measures work,
+        not time spent queued behind other documents' pages. A task past its
+        deadline gets its pool recycled.
+
+        Returns:
+            Tuple of (ranges lost to pool recycles, pages that timed out)
+        """
+        waiting = list(reversed(ranges))
+        in_flight = {}  # future -> (start, stop, deadline, executor)
+        lost, timed_out = [], 0
+        while waiting or in_flight:
+            while waiting and self._slots.acquire(timeout=0 if in_flight else CHUNK_POLL_SECONDS):
+                start, stop = waiting.pop()
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(_extract_page_range, digest, data, start, stop)
+                except RuntimeError:
+                    # The pool was shut down by another document's recycle
+                    self._slots.release()
+                    lost.append((start, stop))
+                    continue
+                future.add_done_callback(lambda _: self._slots.release())
+                deadline = time.monotonic() + self.page_timeout * (stop - start)
+                in_flight[future] = (start, stop, deadline, executor)
+            if not in_flight:
+                continue
+
+            wait = min(deadline for _, _, deadline, _ in in_flight.values()) - time.monotonic()
+            if waiting:
+                # Wake up to submit more once another document frees a worker
+                wait = min(wait, CHUNK_POLL_SECONDS)
+            done, _ = concurrent.futures.wait(
+                in_flight, timeout=max(0.0, wait), return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                start, stop, _, _ = in_flight.pop(future)
+                try:
+                    pages[start:stop] = future.result()
+                except (concurrent.futures.CancelledError, concurrent.futures.BrokenExecutor):
+                    # Cancelled or killed when another document recycled the pool
+                    lost.append((start, stop))
+                except Exception:
+                    pass  # Unreadable document in the worker; its pages stay ""
+
+            now = time.monotonic()
+            for future, (start, stop, deadline, executor) in list(in_flight.items()):
+                if deadline <= now and not future.done():
+                    # Stuck on a page; the recycle also frees its slot
+                    del in_flight[future]
+                    timed_out += stop - start
+                    self._recycle_executor(executor)
+        return lost, timed_out
+
+    def _extract_pages_pooled(self, digest: str, data: bytes, page_count: int) -> Tuple[List[str], int]:
+        """
+        Extract every page in the process pool.
+
+        Returns:
+            Tuple of (page texts, missing page count); missing pages timed
+            out, or were lost to pool recycles in every retry round, and are ""
+        """
+        if page_count < self.min_pages_for_pool:
+            ranges = [(0, page_count)]
+        else:
+            ranges = [(index, index + 1) for index in range(page_count)]
+
+        pages = [""] * page_count
+        missing = 0
+        for _ in range(1 + LOST_PAGE_RETRIES):
+            ranges, timed_out = self._run_ranges(digest, data, ranges, pages)
+            missing += timed_out
+            if not ranges:
+                break
+        missing += sum(stop - start for start, stop in ranges)
+        return pages, missing
+
+    def extract(self, data: PdfSource) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract text from a PDF, using the cache and the process pool.
+
+        File objects are hashed and checked in place; only documents within
+        the size and page limits are read into memory for the worker
+        processes. Text is cached only when every page was extracted.
+
+        Args:
+            data: Raw PDF bytes or a seekable binary file
+
+        Returns:
+            Tuple of (extracted_text, error_message)
+        """
+        if self.max_bytes and source_size(data) > self.max_bytes:
+            return None, file_too_large_error(self.max_bytes)
+
+        digest = _digest(data)
+        cached = self.cache.get(digest)
+        if cached is not None:
+            return cached["text"], None
+
+        import PyPDF2
+
+        try:
+            pdf_reader = PyPDF2.PdfReader(_open_stream(data))
+            if pdf_reader.is_encrypted:
+                return None, ENCRYPTED_PDF_ERROR
+            page_count = len(pdf_reader.pages)
+            if self.max_pages and page_count > self.max_pages:
+                return None, TOO_MANY_PAGES_ERROR.format(pages=page_count, limit=self.max_pages)
+
+            if not isinstance(data, (bytes, bytearray)):
+                # Worker processes need the bytes
+                data = _open_stream(data).read()
+            # Even one-page documents go to the pool: only a worker process
+            # can be stopped when PyPDF2 hangs on a malformed page
+            pages, missing = self._extract_pages_pooled(digest, bytes(data), page_count)
+        except PyPDF2.errors.PdfReadError:
+            return None, INVALID_PDF_ERROR
+        except Exception as e:
+            return None, f"❌ An unexpected error occurred: {str(e)}"
+
+        text_content = [page for page in pages if page]
+        if text_content:
+            text, error = " ".join(text_content), None
+        else:
+            text, error = None, EXTRACTION_TIMEOUT_ERROR if missing else NO_TEXT_ERROR
+
+        if text and not missing:
+            self.cache.set(digest, {"text": text})
+        return text, error
+
+
+_default_engine: Optional[PdfExtractionEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_pdf_engine() -> PdfExtractionEngine:
+    """
+    Return the process-wide extraction engine, creating it on first use.
+
+    Returns:
+        Shared PdfExtractionEngine instance
+    """
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = PdfExtractionEngine()
+        return _default_engine
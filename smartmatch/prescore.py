@@ -0,0 +1,282 @@
+"""
+================================================================================
+SmartMatch AI - Local Pre-Scorer
+================================================================================
+
+Deterministic fast path that scores a resume against a job description without
+calling the LLM. It is used to short-circuit obvious mismatches: resumes that
+share almost no vocabulary with the JD get a local result instead of a 70B
+model call.
+
+Scoring:
+- Text is lowercased and normalized through a synonym table (the same
+  abbreviations SYSTEM_PROMPT asks the model to recognize: ML, JS, K8s, ...)
+- The JD's key terms are weighted TF-IDF style (technical terms boosted,
+  generic recruiting vocabulary removed)
+- Each key term found in the resume contributes with BM25 term-frequency
+  saturation and length normalization
+- The score is the weighted share of JD key terms covered (0-100)
+================================================================================
+"""
+
+import functools
+import math
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+# Resumes scoring below this are not sent to the LLM (when skipping is enabled)
+DEFAULT_PRESCORE_THRESHOLD = 10.0
+# Maximum local score reported for a skipped resume ("Poor match" band)
+MAX_LOCAL_MATCH_PERCENTAGE = 29
+
+MAX_JD_TERMS = 60
+TECH_TERM_BOOST = 2.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+AVERAGE_RESUME_TOKENS = 600
+
+# =============================================================================
+# SYNONYM TABLE
+# =============================================================================
+# Canonical term -> surface forms. Multi-word and punctuated forms are folded
+# into the canonical token before tokenization.
+SYNONYMS: Dict[str, List[str]] = {
+    "machine_learning": ["machine learning", "ml"],
+    "deep_learning": ["deep learning", "dl"],
+    "artificial_intelligence": ["artificial intelligence", "ai"],
+    "natural_language_processing": ["natural language processing", "nlp"],
+    "computer_vision": ["computer vision"],
+    "large_language_models": ["large language models", "large language model", "llms", "llm"],
+    "javascript": ["javascript", "js", "ecmascript", "es6"],
+    "typescript": ["typescript", "ts"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "nodejs": ["node.js", "nodejs", "node"],
+    "reactjs": ["react.js", "reactjs", "react"],
+    "vuejs": ["vue.js", "vuejs", "vue"],
+    "golang": ["golang"],
+    "postgresql": ["postgresql", "postgres", "psql"],
+    "mongodb": ["mongodb", "mongo"],
+    "ci_cd": ["ci/cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud platform", "google cloud"],
+    "azure": ["azure", "microsoft azure"],
+    "csharp": ["c#", "csharp"],
+    "cpp": ["c++", "cpp"],
+    "dotnet": [".net", "dotnet"],
+    "rest_api": ["rest apis", "rest api", "restful"],
+    "sql": ["sql"],
+    "nosql": ["nosql"],
+    "scikit_learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "tensorflow": ["tensorflow", "tf"],
+    "pytorch": ["pytorch", "torch"],
+    "spring_boot": ["spring boot", "springboot"],
+    "product_management": ["product management"],
+    "user_experience": ["user experience", "ux"],
+    "user_interface": ["user interface", "ui"],
+}
+
+# Additional single-token technical terms that deserve a weight boost
+TECH_TERMS = {
+    "python", "java", "scala", "rust", "kotlin", "swift", "ruby", "php", "perl",
+    "django", "flask", "fastapi", "rails", "angular", "svelte", "graphql",
+    "mysql", "redis", "kafka", "rabbitmq", "elasticsearch", "cassandra",
+    "snowflake", "bigquery", "spark", "hadoop", "airflow", "dbt", "pandas",
+    "numpy", "docker", "terraform", "ansible", "jenkins", "linux", "git",
+    "microservices", "devops", "mlops", "etl", "tableau", "excel", "figma",
+    "html", "css", "sass", "webpack", "jira", "agile", "scrum",
+} | set(SYNONYMS)
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "our", "that", "the", "their", "this",
+    "to", "we", "will", "with", "you", "your", "who", "what", "which", "can", "all",
+    "any", "into", "other", "than", "they", "them", "us", "was", "were", "not", "but",
+    "also", "etc", "e.g", "i.e", "per", "plus", "able", "about", "across", "more",
+    # Generic recruiting vocabulary that carries no signal
+    "experience", "experienced", "years", "year", "work", "working", "team", "teams",
+    "strong", "ability", "skills", "skill", "requirements", "required", "requirement",
+    "responsibilities", "preferred", "including", "knowledge", "role", "position",
+    "candidate", "candidates", "job", "company", "looking", "join", "must", "should",
+    "nice", "good", "excellent", "great", "understanding", "familiarity",
+    "proficiency", "proficient", "bonus", "opportunity", "environment",
+    "senior", "junior", "engineer", "engineering", "developer", "development",
+    "new", "using", "use", "build", "building", "help", "within", "well", "like",
+    # Benefits and equal-opportunity boilerplate
+    "benefits", "insurance", "equal", "employer", "diversity", "inclusion", "include",
+    "includes", "flexible", "hours", "salary", "compensation", "vacation", "pto",
+    "matching", "value", "values",
+}
+
+# =============================================================================
+# NORMALIZATION
+# =============================================================================
+_ALIAS_TO_CANONICAL = {
+    alias: canonical
+    for canonical, aliases in SYNONYMS.items()
+    for alias in aliases
+}
+# Aliases that are not plain single tokens are folded with one regex pass
+_PHRASE_ALIASES = sorted(
+    (alias for alias in _ALIAS_TO_CANONICAL if not re.fullmatch(r"[a-z0-9]+", alias)),
+    key=len,
+    reverse=True
+)
+_PHRASE_PATTERN = re.compile(
+    r"(?<![a-z0-9])(" + "|".join(re.escape(alias) for alias in _PHRASE_ALIASES) + r")(?![a-z0-9+#])"
+)
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase, fold synonyms and split text into canonical terms.
+
+    Args:
+        text: Resume or job description text
+
+    Returns:
+        List of canonical tokens (stopwords removed)
+    """
+    text = _PHRASE_PATTERN.sub(lambda m: " " + _ALIAS_TO_CANONICAL[m.group(1)] + " ", text.lower())
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text):
+        token = _ALIAS_TO_CANONICAL.get(token, token)
+        if token in STOPWORDS or len(token) < 2 or token.rstrip("+#").isdigit():
+            continue
+        tokens.append(token)
+    return tokens
+
+
+def display_term(term: str) -> str:
+    """Human-readable form of a canonical term (e.g. 'machine_learning' -> 'Machine Learning')."""
+    aliases = SYNONYMS.get(term)
+    if aliases:
+        return aliases[0].title() if " " in aliases[0] else aliases[0]
+    return term
+
+
+# =============================================================================
+# SCORING
+# =============================================================================
+
+class PreScore(NamedTuple):
+    """Result of a local pre-score."""
+    score: float
+    matched_terms: List[str]
+    missing_terms: List[str]
+
+
+class JDTermModel:
+    """
+    Weighted key-term model of a job description.
+
+    Build it once per JD (see get_jd_term_model) and score any number of
+    resumes against it.
+    """
+
+    def __init__(self, jd_text: str, idf: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            jd_text: The job description text
+            idf: Optional corpus IDF values; technical terms are boosted otherwise
+        """
+        counts = Counter(tokenize(jd_text))
+        weights = {}
+        for term, tf in counts.items():
+            if idf is not None:
+                term_weight = idf.get(term, 1.0)
+            else:
+                term_weight = TECH_TERM_BOOST if term in TECH_TERMS else 1.0
+            weights[term] = (1.0 + math.log(tf)) * term_weight
+
+        top_terms = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:MAX_JD_TERMS]
+        self.weights: Dict[str, float] = dict(top_terms)
+        self.total_weight = sum(self.weights.values())
+
+    def score(self, resume_text: str) -> PreScore:
+        """
+        Score a resume against the JD's key terms.
+
+        Args:
+            resume_text: Extracted resume text
+
+        Returns:
+            PreScore with a 0-100 score and matched/missing terms (heaviest first)
+        """
+        if not self.total_weight:
+            return PreScore(0.0, [], [])
+
+        tokens = tokenize(resume_text)
+        counts = Counter(tokens)
+        length_norm = 1.0 - BM25_B + BM25_B * (len(tokens) / AVERAGE_RESUME_TOKENS)
+
+        covered = 0.0
+        matched, missing = [], []
+        for term, weight in self.weights.items():
+            tf = counts.get(term, 0)
+            if tf:
+                saturation = tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+                # A single mention in an average-length resume earns full credit
+                covered += weight * min(1.0, saturation)
+                matched.append(term)
+            else:
+                missing.append(term)
+
+        return PreScore(round(100.0 * covered / self.total_weight, 1), matched, missing)
+
+
+@functools.lru_cache(maxsize=64)
+def get_jd_term_model(jd_text: str) -> JDTermModel:
+    """
+    Return a (memoized) term model for a job description.
+
+    Args:
+        jd_text: The job description text
+
+    Returns:
+        JDTermModel shared by every resume screened against this JD
+    """
+    return JDTermModel(jd_text)
+
+
+def prescore_resume(resume_text: str, jd_text: str) -> PreScore:
+    """
+    Score a resume against a job description locally.
+
+    Args:
+        resume_text: Extracted resume text
+        jd_text: The job description text
+
+    Returns:
+        PreScore (score 0-100)
+    """
+    return get_jd_term_model(jd_text).score(resume_text)
+
+
+def local_result(prescore: PreScore) -> Dict:
+    """
+    Build an analysis result for a resume that was not sent to the LLM.
+
+    Args:
+        prescore: The local pre-score
+
+    Returns:
+        dict with the same keys as analyze_resume_with_llm(), plus prescreened=True
+    """
+    # Prefer technical terms when listing what is missing
+    missing = sorted(prescore.missing_terms, key=lambda term: term not in TECH_TERMS)
+    return {
+        "match_percentage": int(min(MAX_LOCAL_MATCH_PERCENTAGE, round(prescore.score))),
+        "missing_keywords": [display_term(term) for term in missing[:8]],
+        "profile_summary": (
+            f"Local pre-screen: the resume covers only {prescore.score:.0f}% of the job "
+            "description's key terms, so it was not sent for AI analysis."
+        ),
+        "error": None,
+        "cached": False,
+        "prescreened": True
+    }
@@ -0,0 +1,481 @@
+"""
+================================================================================
+SmartMatch AI - LLM Providers
+================================================================================
+
+Pluggable chat-completion backends behind one small interface:
+
+- GroqProvider: the hosted Groq API, using the pooled clients from
+  smartmatch.client
+- MockProvider: deterministic and offline. Answers are realistic analysis
+  JSON derived from the prompt itself (local term overlap between resume and
+  JD), with configurable latency and error injection, so benchmarks and CI
+  need neither network nor quota
+
+The analysis core asks get_provider() for a backend; select one with the
+SMARTMATCH_PROVIDER environment variable ("groq" or "mock") or install any
+LLMProvider with set_default_provider().
+================================================================================
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Union
+
+from smartmatch.client import GROQ_AVAILABLE, get_client_manager
+from smartmatch.prescore import TECH_TERMS, display_term, prescore_resume, tokenize
+from smartmatch.truncation import count_tokens
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_PROVIDER = os.environ.get("SMARTMATCH_PROVIDER", "groq")
+
+# MockProvider defaults (SMARTMATCH_PROVIDER=mock)
+MOCK_LATENCY = float(os.environ.get("SMARTMATCH_MOCK_LATENCY", "0"))
+MOCK_ERROR_RATE = float(os.environ.get("SMARTMATCH_MOCK_ERROR_RATE", "0"))
+MOCK_SEED = int(os.environ.get("SMARTMATCH_MOCK_SEED", "0"))
+MOCK_STREAM_CHUNK_CHARS = 8
+
+
+class Completion(NamedTuple):
+    """One chat completion, as returned by LLMProvider.complete()."""
+    content: str
+    model: str
+    usage: Dict[str, int]  # prompt_tokens, completion_tokens, total_tokens
+    headers: Optional[Mapping[str, str]]  # Read by the scheduler for x-ratelimit-*
+
+
+class CompletionStream:
+    """
+    A streamed chat completion: iterate it for text deltas.
+
+    `headers` is available before iteration, so the scheduler can learn rate
+    limits as soon as the call is admitted.
+    """
+
+    def __init__(self, deltas: Iterator[str], headers: Optional[Mapping[str, str]] = None):
+        self.headers = headers
+        self._deltas = deltas
+
+    def __iter__(self) -> Iterator[str]:
+        return self._deltas
+
+
+class ProviderError(Exception):
+    """An API-level failure with an HTTP-like status (429 and 5xx are retried)."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# =============================================================================
+# INTERFACE
+# =============================================================================
+
+class LLMProvider:
+    """
+    Chat-completion backend used by the analysis core.
+
+    Subclasses implement complete(), acomplete() and stream(); check() reports
+    configuration problems before any call is made.
+    """
+
+    name = "provider"
+
+    def check(self) -> Optional[str]:
+        """
+        Returns:
+            A user-facing error message if the provider cannot be used, else None
+        """
+        return None
+
+    def complete(self, messages: List[Dict[str, str]], model: str, temperature: float,
+                 max_tokens: int, timeout: float = 30.0, json_mode: bool = False) -> Completion:
+        """
+        Run one chat completion.
+
+        Args:
+            messages: Chat messages ({"role", "content"})
+            model: Model id
+            temperature: Sampling temperature
+            max_tokens: Completion budget
+            timeout: Request timeout in seconds
+            json_mode: Ask the backend to constrain the answer to one JSON
+                object, where it supports that (ignored otherwise)
+
+        Returns:
+            Completion
+        """
+        raise NotImplementedError
+
+    async def acomplete(self, messages: List[Dict[str, str]], model: str, temperature: float,
+                        max_tokens: int, timeout: float = 30.0, json_mode: bool = False) -> Completion:
+        """Async counterpart of complete(); by default runs it in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.complete(messages, model, temperature, max_tokens, timeout, json_mode)
+        )
+
+    def stream(self, messages: List[Dict[str, str]], model: str, temperature: float,
+               max_tokens: int, timeout: float = 30.0, json_mode: bool = False) -> CompletionStream:
+        """Like complete(), but yields the answer text incrementally."""
+        raise NotImplementedError
+
+
+# =============================================================================
+# GROQ
+# =============================================================================
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+
+
+def _response_format(json_mode: bool) -> Dict[str, Any]:
+    """Extra create() arguments for Groq's JSON mode."""
+    return {"response_format": {"type": "json_object"}} if json_mode else {}
+
+
+class GroqProvider(LLMProvider):
+    """The hosted Groq API (shared pooled clients, see smartmatch.client)."""
+
+    name = "groq"
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Args:
+            api_key: The Groq API key
+            base_url: Optional API base URL (the SDK also reads GROQ_BASE_URL)
+        """
+        self.api_key = (api_key or "").strip()
+        self.base_url = base_url
+
+    def check(self) -> Optional[str]:
+        if not GROQ_AVAILABLE:
+            return "Groq library not installed. Run: pip install groq"
+        if not self.api_key:
+            return "Please enter your Groq API key in the sidebar."
+        return None
+
+    def _client(self):
+        client = get_client_manager().get_client(self.api_key, self.base_url)
+        if client is None:
+            raise ProviderError("Could not create the Groq client.", 400)
+        return client
+
+    def complete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> Completion:
+        raw_response = self._client().chat.completions.with_raw_response.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            **_response_format(json_mode)
+        )
+        chat_completion = raw_response.parse()
+        return Completion(
+            chat_completion.choices[0].message.content or "",
+            chat_completion.model or model,
+            _usage_dict(chat_completion.usage),
+            raw_response.headers
+        )
+
+    async def acomplete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> Completion:
+        client = get_client_manager().get_async_client(self.api_key, self.base_url)
+        if client is None:
+            raise ProviderError("Could not create the Groq client.", 400)
+        raw_response = await client.chat.completions.with_raw_response.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            **_response_format(json_mode)
+        )
+        chat_completion = await raw_response.parse()
+        return Completion(
+            chat_completion.choices[0].message.content or "",
+            chat_completion.model or model,
+            _usage_dict(chat_completion.usage),
+            raw_response.headers
+        )
+
+    def stream(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> CompletionStream:
+        # Groq's JSON mode does not support streaming; the tolerant parser covers it
+        raw_response = self._client().chat.completions.with_raw_response.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            stream=True
+        )
+
+        def deltas() -> Iterator[str]:
+            for chunk in raw_response.parse():
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        return CompletionStream(deltas(), raw_response.headers)
+
+
+# =============================================================================
+# MOCK
+# =============================================================================
+
+_PROMPT_SECTION = re.compile(r"^=== (.+?) ===$", re.MULTILINE)
+_JD_LABEL = re.compile(r"^\[(JD-\d+)\]$")
+
+
+def _split_prompt(prompt: str):
+    """Return (resume_text, [(label or None, jd_text)], previous_result) from an analysis prompt."""
+    parts = _PROMPT_SECTION.split(prompt)
+    resume_text, jds, previous = "", [], None
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        # Drop the closing instruction ("Respond with ONLY ...", "All other sections ...")
+        body = re.split(r"\n\n(?:Respond with ONLY|All other sections)", body, maxsplit=1)[0].strip()
+        label = _JD_LABEL.match(heading)
+        if heading == "RESUME" or heading.startswith("CHANGED SECTIONS"):
+            resume_text = body
+        elif heading == "PREVIOUS RESULT":
+            previous = json.loads(body)
+        elif label or heading.startswith("JOB"):
+            jds.append((label.group(1) if label else None, body))
+    return resume_text, jds, previous
+
+
+def mock_analysis(resume_text: str, jd_text: str, model: str = "") -> Dict[str, Any]:
+    """
+    Deterministic analysis of a resume against a JD, shaped like a model answer.
+
+    The score follows the local term overlap (see smartmatch.prescore) plus a
+    fixed per-input offset that is wider for small models, so a fast and an
+    accurate model disagree somewhat, as real ones do.
+
+    Args:
+        resume_text: Resume text (as it appears in the prompt)
+        jd_text: JD text or compact JD profile
+        model: Model id the answer is attributed to
+
+    Returns:
+        dict with match_percentage, missing_keywords and profile_summary
+    """
+    prescore = prescore_resume(resume_text, jd_text)
+    digest = int(hashlib.sha256(f"{model}\n{jd_text}\n{resume_text}".encode("utf-8")).hexdigest(), 16)
+    spread = 8 if ("8b" in model or "instant" in model) else 3
+    score = int(min(100, max(0, round(prescore.score) + digest % (2 * spread + 1) - spread)))
+
+    missing = sorted(prescore.missing_terms, key=lambda term: term not in TECH_TERMS)
+    missing_keywords = [display_term(term) for term in missing[:6]]
+    matched = ", ".join(display_term(term) for term in prescore.matched_terms[:3]) or "few of the required skills"
+    if score >= 85:
+        verdict = "is an excellent fit and meets nearly all requirements"
+    elif score >= 70:
+        verdict = "is a strong fit with minor gaps"
+    elif score >= 50:
+        verdict = "is a partial fit with some relevant experience"
+    else:
+        verdict = "is a weak fit with significant gaps"
+    gaps = f" Missing: {', '.join(missing_keywords[:3])}." if missing_keywords else ""
+    return {
+        "match_percentage": score,
+        "missing_keywords": missing_keywords,
+        "profile_summary": f"The candidate {verdict}. Relevant experience includes {matched}.{gaps}",
+    }
+
+
+def mock_revision_analysis(previous: Dict[str, Any], changed_text: str) -> Dict[str, Any]:
+    """
+    Deterministic delta re-score (see smartmatch.revisions): previously missing
+    JD terms that now appear in the changed sections raise the score.
+
+    Args:
+        previous: The previous analysis
+        changed_text: Text of the changed sections
+
+    Returns:
+        dict with match_percentage, missing_keywords and profile_summary
+    """
+    now_present = set(tokenize(changed_text))
+    missing = [keyword for keyword in previous["missing_keywords"]
+               if not set(tokenize(keyword)) or not set(tokenize(keyword)) <= now_present]
+    gained = len(previous["missing_keywords"]) - len(missing)
+    score = int(min(100, previous["match_percentage"] + 4 * gained))
+    summary = previous["profile_summary"].split(" Missing:")[0]
+    return {
+        "match_percentage": score,
+        "missing_keywords": missing,
+        "profile_summary": summary + (f" Missing: {', '.join(missing[:3])}." if missing else ""),
+    }
+
+
+def mock_answer(prompt: str, model: str = "") -> str:
+    """
+    Answer text for an analysis prompt: one JSON object, or a JSON array for
+    multi-JD prompts with [JD-1], [JD-2], ... sections.
+
+    Args:
+        prompt: The concatenated chat messages
+        model: Model id
+
+    Returns:
+        JSON text
+    """
+    resume_text, jds, previous = _split_prompt(prompt)
+    if not jds:
+        jds = [(None, prompt)]
+    if previous is not None:
+        return json.dumps(mock_revision_analysis(previous, resume_text))
+    if jds[0][0] is None:
+        return json.dumps(mock_analysis(resume_text, jds[0][1], model))
+    return json.dumps([dict(mock_analysis(resume_text, jd_text, model), jd=label) for label, jd_text in jds])
+
+
+class MockProvider(LLMProvider):
+    """
+    Offline provider with deterministic answers, latency and error injection.
+
+    Given the same seed and call order, the same calls fail, so benchmark
+    runs are reproducible.
+    """
+
+    name = "mock"
+
+    def __init__(self, latency: Union[float, Mapping[str, float]] = MOCK_LATENCY,
+                 error_rate: float = MOCK_ERROR_RATE,
+                 error_status: int = 503, seed: int = MOCK_SEED):
+        """
+        Args:
+            latency: Seconds each call takes (streams spread it over the chunks),
+                or a mapping of model id -> seconds (unlisted models take 0)
+            error_rate: Fraction of calls that raise ProviderError
+            error_status: Status of injected errors (429/5xx are retried by the scheduler)
+            seed: Seed for the error-injection sequence
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.call_count = 0
+        self.error_count = 0
+
+    def _latency(self, model: str) -> float:
+        if isinstance(self.latency, Mapping):
+            return self.latency.get(model, 0.0)
+        return self.latency
+
+    def _begin_call(self) -> None:
+        with self._lock:
+            self.call_count += 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        if failed:
+            message = "rate_limit_exceeded (injected)" if self.error_status == 429 else "Injected mock error"
+            raise ProviderError(message, self.error_status)
+
+    def _completion(self, messages: List[Dict[str, str]], model: str) -> Completion:
+        prompt = "\n".join(message["content"] for message in messages)
+        content = mock_answer(prompt, model)
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content)
+        return Completion(content, model, {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }, None)
+
+    def complete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> Completion:
+        self._begin_call()
+        latency = self._latency(model)
+        if latency:
+            time.sleep(latency)
+        return self._completion(messages, model)
+
+    async def acomplete(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> Completion:
+        self._begin_call()
+        latency = self._latency(model)
+        if latency:
+            await asyncio.sleep(latency)
+        return self._completion(messages, model)
+
+    def stream(self, messages, model, temperature, max_tokens, timeout=30.0, json_mode=False) -> CompletionStream:
+        self._begin_call()
+        content = self._completion(messages, model).content
+        chunks = [content[i:i + MOCK_STREAM_CHUNK_CHARS]
+                  for i in range(0, len(content), MOCK_STREAM_CHUNK_CHARS)]
+
+        latency = self._latency(model)
+
+        def deltas() -> Iterator[str]:
+            for chunk in chunks:
+                if latency:
+                    time.sleep(latency / len(chunks))
+                yield chunk
+
+        return CompletionStream(deltas())
+
+
+# =============================================================================
+# SELECTION
+# =============================================================================
+
+_default_provider: Optional[LLMProvider] = None
+_mock_provider: Optional[MockProvider] = None
+_provider_lock = threading.Lock()
+
+
+def set_default_provider(provider: Optional[LLMProvider]) -> None:
+    """
+    Install a provider for every analysis in this process.
+
+    Args:
+        provider: Any LLMProvider, or None to go back to SMARTMATCH_PROVIDER
+    """
+    global _default_provider
+    with _provider_lock:
+        _default_provider = provider
+
+
+def get_provider(api_key: str = "", name: Optional[str] = None) -> LLMProvider:
+    """
+    Return the provider to use for an analysis.
+
+    Args:
+        api_key: The Groq API key (ignored by the mock provider)
+        name: "groq" or "mock"; defaults to the installed provider, then
+            SMARTMATCH_PROVIDER
+
+    Returns:
+        LLMProvider
+
+    Raises:
+        ValueError: For an unknown provider name
+    """
+    global _mock_provider
+    with _provider_lock:
+        if name is None and _default_provider is not None:
+            return _default_provider
+        name = (name or DEFAULT_PROVIDER).lower()
+        if name == "groq":
+            return GroqProvider(api_key)
+        if name == "mock":
+            # One shared instance, so call counts and the error sequence are process-wide
+            if _mock_provider is None:
+                _mock_provider = MockProvider()
+            return _mock_provider
+    raise ValueError(f"Unknown LLM provider: {name!r} (expected 'groq' or 'mock')")
@@ -0,0 +1,213 @@
+"""
+================================================================================
+SmartMatch AI - Resume Quality Checks
+================================================================================
+
+Resume hygiene checks (length, email, phone, section headers) for one resume
+or for whole archives:
+
+- check_resume_quality(text): per-resume dict used by the dashboard and service
+- check_quality_batch(texts): columnar results (one NumPy array per check) for
+  re-auditing large archives, computed in a process pool
+
+Both share the same precompiled patterns and the same single scan per
+document, so a batch row always agrees with check_resume_quality.
+================================================================================
+"""
+
+import concurrent.futures
+import os
+import re
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from smartmatch.telemetry import get_telemetry
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+MIN_WORDS = 150
+MAX_WORDS = 1500
+MIN_SECTIONS = 3
+SECTION_NAMES = ('experience', 'education', 'skills', 'projects', 'summary')
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[0-9]{3,4}[-\s\.]?[0-9]{4,6}')
+
+BATCH_CHUNK_SIZE = 2000  # Resumes per worker task
+MIN_PARALLEL_BATCH = 10000  # Smaller batches are scanned in-process
+
+
+class QualitySignals(NamedTuple):
+    """Everything the quality checks need from one resume."""
+    word_count: int
+    email: Optional[str]
+    phone: Optional[str]
+    sections: Tuple[str, ...]
+
+
+def scan_resume(resume_text: str) -> QualitySignals:
+    """
+    Collect the quality signals of one resume.
+
+    Only the first email/phone is reported, so each pattern stops at its
+    first hit instead of collecting every match.
+
+    Args:
+        resume_text: The extracted resume text
+
+    Returns:
+        QualitySignals
+    """
+    email = EMAIL_PATTERN.search(resume_text) if '@' in resume_text else None
+    phone = PHONE_PATTERN.search(resume_text)
+    lowered = resume_text.lower()
+    return QualitySignals(
+        len(resume_text.split()),
+        email.group() if email else None,
+        phone.group() if phone else None,
+        tuple(s for s in SECTION_NAMES if s in lowered)
+    )
+
+
+# =============================================================================
+# SINGLE RESUME
+# =============================================================================
+
+def _word_count_status(word_count: int) -> str:
+    if word_count < MIN_WORDS:
+        return 'fail'
+    if word_count > MAX_WORDS:
+        return 'warning'
+    return 'pass'
+
+
+def check_resume_quality(resume_text: str) -> Dict[str, dict]:
+    """
+    Perform resume hygiene and quality checks.
+
+    Args:
+        resume_text: The extracted resume text
+
+    Returns:
+        Dictionary with quality check results
+    """
+    with get_telemetry().span("quality_check"):
+        signals = scan_resume(resume_text)
+    results = {}
+
+    # Word Count Analysis
+    word_count = signals.word_count
+    status = _word_count_status(word_count)
+    if status == 'fail':
+        message = f'Too brief ({word_count} words). Aim for 300-800 words.'
+    elif status == 'warning':
+        message = f'Lengthy ({word_count} words). Consider condensing.'
+    else:
+        message = f'Good length ({word_count} words).'
+    results['word_count'] = {'status': status, 'message': message, 'value': word_count}
+
+    # Email Detection
+    email = signals.email
+    results['email'] = {
+        'status': 'pass' if email else 'fail',
+        'message': f'Email: {email}' if email else 'No email found.',
+        'value': email
+    }
+
+    # Phone Detection
+    phone = signals.phone
+    results['phone'] = {
+        'status': 'pass' if phone else 'warning',
+        'message': 'Phone detected.' if phone else 'No phone detected.',
+        'value': phone
+    }
+
+    # Key Sections Detection
+    found_sections = list(signals.sections)
+    results['sections'] = {
+        'status': 'pass' if len(found_sections) >= MIN_SECTIONS else 'warning',
+        'message': f'Sections: {", ".join(found_sections).title()}' if found_sections else 'Add clear section headers.',
+        'value': found_sections
+    }
+
+    return results
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+
+def _scan_chunk(texts: Sequence[str]) -> Tuple[List[int], List[Optional[str]], List[Optional[str]], List[int]]:
+    """Scan a chunk of resumes into columns (sections as a bitmask)."""
+    word_counts, emails, phones, section_masks = [], [], [], []
+    for text in texts:
+        signals = scan_resume(text)
+        word_counts.append(signals.word_count)
+        emails.append(signals.email)
+        phones.append(signals.phone)
+        section_masks.append(sum(1 << SECTION_NAMES.index(s) for s in signals.sections))
+    return word_counts, emails, phones, section_masks
+
+
+def check_quality_batch(
+    texts: Sequence[str],
+    max_workers: Optional[int] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE
+) -> Dict[str, "np.ndarray"]:
+    """
+    Run the quality checks over many resumes.
+
+    Scanning is spread over worker processes for large batches; statuses are
+    then derived column-wise with NumPy. Row i agrees with
+    check_resume_quality(texts[i]).
+
+    Args:
+        texts: Extracted resume texts
+        max_workers: Worker processes (default: CPU count; 1 scans in-process)
+        chunk_size: Resumes sent to a worker per task
+
+    Returns:
+        dict of equal-length arrays (ready for pandas.DataFrame): word_count,
+        word_count_status, email, email_status, phone, phone_status,
+        section_<name> for each of SECTION_NAMES, section_count, sections_status
+    """
+    import multiprocessing
+
+    import numpy as np
+
+    workers = max_workers or os.cpu_count() or 1
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    if workers > 1 and len(texts) >= MIN_PARALLEL_BATCH:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            scanned = list(pool.map(_scan_chunk, chunks))
+    else:
+        scanned = [_scan_chunk(chunk) for chunk in chunks]
+
+    word_counts = np.fromiter((n for chunk in scanned for n in chunk[0]), dtype=np.int64, count=len(texts))
+    emails = np.array([e for chunk in scanned for e in chunk[1]], dtype=object)
+    phones = np.array([p for chunk in scanned for p in chunk[2]], dtype=object)
+    masks = np.fromiter((m for chunk in scanned for m in chunk[3]), dtype=np.int64, count=len(texts))
+
+    columns = {
+        "word_count": word_counts,
+        "word_count_status": np.where(
+            word_counts < MIN_WORDS, "fail", np.where(word_counts > MAX_WORDS, "warning", "pass")
+        ).astype(object),
+        "email": emails,
+        "email_status": np.where(emails.astype(bool), "pass", "fail").astype(object),
+        "phone": phones,
+        "phone_status": np.where(phones.astype(bool), "pass", "warning").astype(object),
+    }
+    section_count = np.zeros(len(texts), dtype=np.int64)
+    for bit, name in enumerate(SECTION_NAMES):
+        found = (masks >> bit) & 1 == 1
+        columns[f"section_{name}"] = found
+        section_count += found
+    columns["section_count"] = section_count
+    columns["sections_status"] = np.where(section_count >= MIN_SECTIONS, "pass", "warning").astype(object)
+    return columns
@@ -0,0 +1,153 @@
+"""
+================================================================================
+SmartMatch AI - Rate Budgets
+================================================================================
+
+Client-side budgets that keep concurrent LLM traffic under the provider's
+per-minute quotas (requests per minute, tokens per minute).
+
+A budget can also be scoped to a block of code with call_budget(): every
+model call the scheduler admits inside it is charged to that budget, while
+cache and duplicate hits, which never reach the scheduler, are not.
+================================================================================
+"""
+
+import collections
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Deque, Iterator, Optional, Tuple
+
+# Rough characters-per-token ratio for English prose with Llama tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheaply estimate how many tokens a piece of text will consume.
+
+    Args:
+        text: Prompt or completion text
+
+    Returns:
+        Approximate token count (at least 1 for non-empty text)
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class SlidingWindowBudget:
+    """
+    Thread-safe budget of `limit` units per rolling `window` seconds.
+
+    Callers block in acquire() until enough of the budget has rolled out of the
+    window. A single request larger than the whole budget is admitted on its
+    own once the window is empty, so it can never deadlock.
+    """
+
+    def __init__(self, limit: float, window: float = 60.0):
+        """
+        Args:
+            limit: Units allowed per window (e.g. tokens per minute)
+            window: Window length in seconds
+        """
+        self.limit = limit
+        self.window = window
+        self._events: Deque[Tuple[float, float]] = collections.deque()
+        self._used = 0.0
+        self._cond = threading.Condition()
+
+    def _expire(self, now: float) -> None:
+        while self._events and now - self._events[0][0] >= self.window:
+            _, amount = self._events.popleft()
+            self._used -= amount
+
+    def _wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` fits in the window (0 if it fits now)."""
+        self._expire(now)
+        if self._used + amount <= self.limit or not self._events:
+            return 0.0
+        # Walk forward through the window until enough budget has been freed
+        freed = 0.0
+        for timestamp, used in self._events:
+            freed += used
+            if self._used - freed + amount <= self.limit:
+                return max(1e-3, timestamp + self.window - now)
+        return max(1e-3, self._events[-1][0] + self.window - now)
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """
+        Seconds until `amount` units would fit in the window, without consuming them.
+
+        Args:
+            amount: Units the caller intends to consume
+
+        Returns:
+            0.0 if the units fit right now
+        """
+        with self._cond:
+            return self._wait_time(amount, time.monotonic())
+
+    def acquire(self, amount: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until `amount` units are available, then consume them.
+
+        Args:
+            amount: Units to consume
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the budget was consumed, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(amount, now)
+                if wait == 0.0:
+                    self._events.append((now, amount))
+                    self._used += amount
+                    return True
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def used(self) -> float:
+        """Units consumed within the current window."""
+        with self._cond:
+            self._expire(time.monotonic())
+            return self._used
+
+
+# =============================================================================
+# SCOPED CALL BUDGETS
+# =============================================================================
+
+_call_budget: contextvars.ContextVar[Optional[SlidingWindowBudget]] = contextvars.ContextVar(
+    "smartmatch_call_budget", default=None
+)
+
+
+@contextlib.contextmanager
+def call_budget(budget: Optional[SlidingWindowBudget]) -> Iterator[None]:
+    """
+    Charge the model calls made inside the block to `budget`.
+
+    Args:
+        budget: Token budget (None charges nothing)
+    """
+    token = _call_budget.set(budget)
+    try:
+        yield
+    finally:
+        _call_budget.reset(token)
+
+
+def current_call_budget() -> Optional[SlidingWindowBudget]:
+    """The budget set by the innermost call_budget() block, if any."""
+    return _call_budget.get()
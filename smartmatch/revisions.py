@@ -0,0 +1,308 @@
+"""
+================================================================================
+SmartMatch AI - Incremental Re-analysis
+================================================================================
+
+Candidates often re-upload the same CV with small edits. Instead of a full
+analysis per upload, the last analyzed version of each candidate (per JD and
+model) is kept as section-level text together with its result:
+
+1. The new upload is split into sections (smartmatch.truncation) and diffed
+   section by section against the stored version
+2. No material change (only formatting, or a few words that touch no JD
+   term): the stored result is returned without an LLM call
+3. Small material change: only the changed sections plus the previous result
+   are sent for a delta re-score (a fraction of the full prompt)
+4. Large change, or no stored version: a regular full analysis
+
+Candidates are identified by an explicit key (e.g. an ATS candidate id) or,
+by default, by the email address or phone number found in the resume. A
+resume with neither is always analyzed in full.
+================================================================================
+"""
+
+import difflib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from smartmatch.cache import DEFAULT_CACHE_DIR, ResultCache, make_cache_key
+from smartmatch.core import (
+    SYSTEM_PROMPT, _call_model, _describe_api_error, _fallback_result, _jd_prompt,
+    _parse_llm_response, _retry_messages, analyze_resume_with_llm, resolve_model
+)
+from smartmatch.history import content_hash
+from smartmatch.prescore import get_jd_term_model, tokenize
+from smartmatch.providers import get_provider
+from smartmatch.quality import scan_resume
+from smartmatch.scheduler import PRIORITY_INTERACTIVE
+from smartmatch.structured import StructuredOutputError
+from smartmatch.telemetry import get_telemetry
+from smartmatch.truncation import Section, split_sections
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+REVISION_VERSION = "revision-v1"  # Bump when diffing or the delta prompt changes
+REVISION_TTL_SECONDS = 180 * 24 * 60 * 60
+REVISION_MAX_ENTRIES = 50000
+MIN_MATERIAL_WORDS = 5  # Smaller edits count only if they touch a JD term
+MAX_DELTA_FRACTION = 0.5  # Above this share of changed words, re-analyze in full
+MIN_PHONE_DIGITS = 7  # Shorter matches are too ambiguous to identify a candidate
+
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+DELTA_PROMPT = """Re-score a REVISED version of a resume you already analyzed against this job.
+
+=== {jd_heading} ===
+{jd_excerpt}
+
+=== PREVIOUS RESULT ===
+{previous}
+
+=== CHANGED SECTIONS (new text) ===
+{changed}
+
+=== REMOVED SECTIONS ===
+{removed}
+
+All other sections are unchanged. Adjust the previous result only for what changed.
+Respond with ONLY the JSON object, nothing else."""
+
+
+class RevisionDiff(NamedTuple):
+    """Section-level difference between two versions of a resume."""
+    changed: List[Section]  # New or edited sections (new text)
+    removed: List[str]  # Titles of sections that disappeared
+    changed_words: int
+    total_words: int
+    jd_terms: List[str]  # JD key terms added or removed by the edit
+
+    @property
+    def material(self) -> bool:
+        """Whether the edit can change the analysis."""
+        return bool(self.jd_terms) or self.changed_words >= MIN_MATERIAL_WORDS
+
+    @property
+    def changed_fraction(self) -> float:
+        return self.changed_words / self.total_words if self.total_words else 1.0
+
+
+# =============================================================================
+# DIFFING
+# =============================================================================
+
+def _words(text: str) -> List[str]:
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def _keyed(sections: List[Section]) -> Dict[str, Section]:
+    """Sections by title, with repeated titles numbered in document order."""
+    keyed, seen = {}, {}
+    for section in sections:
+        seen[section.title] = seen.get(section.title, 0) + 1
+        key = section.title if seen[section.title] == 1 else f"{section.title} ({seen[section.title]})"
+        keyed[key] = section
+    return keyed
+
+
+def diff_sections(old_sections: List[Section], new_sections: List[Section], jd_text: str) -> RevisionDiff:
+    """
+    Compare two versions of a resume section by section.
+
+    Sections are matched by title; within a matched pair, words are diffed
+    (case, punctuation and layout are ignored).
+
+    Args:
+        old_sections: Sections of the previously analyzed version
+        new_sections: Sections of the new upload
+        jd_text: The job description, for spotting edits to key terms
+
+    Returns:
+        RevisionDiff
+    """
+    old, new = _keyed(old_sections), _keyed(new_sections)
+    changed, edited_words = [], []
+    changed_words = 0
+    for key, section in new.items():
+        before = _words(old[key].text) if key in old else []
+        after = _words(section.text)
+        if before == after:
+            continue
+        matcher = difflib.SequenceMatcher(None, before, after, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != "equal":
+                changed_words += max(i2 - i1, j2 - j1)
+                edited_words += before[i1:i2] + after[j1:j2]
+        changed.append(section)
+
+    removed = [key for key in old if key not in new]
+    for key in removed:
+        removed_words = _words(old[key].text)
+        changed_words += len(removed_words)
+        edited_words += removed_words
+
+    jd_weights = get_jd_term_model(jd_text).weights
+    jd_terms = sorted({term for term in tokenize(" ".join(edited_words)) if term in jd_weights})
+    total_words = max(sum(len(_words(s.text)) for s in new_sections),
+                      sum(len(_words(s.text)) for s in old_sections))
+    return RevisionDiff(changed, removed, changed_words, total_words, jd_terms)
+
+
+def candidate_key(resume_text: str) -> Optional[str]:
+    """
+    Identify the candidate behind a resume: the email address, else the phone number.
+
+    The first line is deliberately not used: headers such as "Resume" or
+    "Curriculum Vitae" are shared by unrelated candidates, whose uploads
+    would then be diffed as revisions of each other.
+
+    Returns:
+        Lowercased email, "phone:<digits>", or None when the resume has neither
+    """
+    signals = scan_resume(resume_text)
+    if signals.email:
+        return signals.email.lower()
+    digits = re.sub(r"\D", "", signals.phone or "")
+    if len(digits) >= MIN_PHONE_DIGITS:
+        return f"phone:{digits}"
+    return None
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+_revision_store: Optional[ResultCache] = None
+_revision_store_lock = threading.Lock()
+
+
+def _get_revision_store() -> ResultCache:
+    global _revision_store
+    with _revision_store_lock:
+        if _revision_store is None:
+            _revision_store = ResultCache(
+                os.path.join(DEFAULT_CACHE_DIR, "revisions.sqlite3"),
+                ttl_seconds=REVISION_TTL_SECONDS,
+                max_entries=REVISION_MAX_ENTRIES
+            )
+        return _revision_store
+
+
+def _remember(store_key: str, sections: List[Section], result: Dict, version: int) -> None:
+    _get_revision_store().set(store_key, {
+        "version": version,
+        "sections": [[section.title, section.text] for section in sections],
+        "result": {
+            "match_percentage": result["match_percentage"],
+            "missing_keywords": result["missing_keywords"],
+            "profile_summary": result["profile_summary"]
+        }
+    })
+
+
+def _build_delta_prompt(jd_text: str, previous: Dict, diff: RevisionDiff) -> str:
+    changed = "\n\n".join(f"--- {section.title} ---\n{section.text}" for section in diff.changed)
+    jd_heading, jd_excerpt = _jd_prompt(jd_text)
+    return DELTA_PROMPT.format(
+        jd_heading=jd_heading,
+        jd_excerpt=jd_excerpt,
+        previous=json.dumps(previous),
+        changed=changed or "(none)",
+        removed=", ".join(diff.removed) or "(none)"
+    )
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+def analyze_resume_revision(resume_text: str, jd_text: str, api_key: str,
+                            candidate: Optional[str] = None,
+                            use_cache: bool = True,
+                            priority: int = PRIORITY_INTERACTIVE,
+                            model: Optional[str] = None) -> Dict:
+    """
+    Analyze a resume, re-scoring only what changed since the candidate's last version.
+
+    Args:
+        resume_text: Extracted text of the new upload
+        jd_text: The job description text
+        api_key: The Groq API key
+        candidate: Stable candidate id; defaults to candidate_key(resume_text)
+        use_cache: Serve and store full analyses through the result cache
+        priority: Scheduler lane (PRIORITY_INTERACTIVE or PRIORITY_BATCH)
+        model: Route name ("accurate", "fast") or model id
+
+    Returns:
+        Same dict as analyze_resume_with_llm(), plus revision ("first",
+        "unchanged", "delta" or "full"), revision_version and changed_sections
+    """
+    telemetry = get_telemetry()
+    model = resolve_model(model)
+    provider = get_provider(api_key)
+    sections = split_sections(resume_text)
+    key = candidate or candidate_key(resume_text)
+    store_key = make_cache_key(REVISION_VERSION, key, content_hash(jd_text), provider.name, model)
+    stored = _get_revision_store().get(store_key) if key else None
+
+    diff = None
+    if stored is not None:
+        previous_sections = [Section(index, title, text) for index, (title, text) in enumerate(stored["sections"])]
+        diff = diff_sections(previous_sections, sections, jd_text)
+        if not diff.material:
+            telemetry.increment("revisions_unchanged")
+            return dict(stored["result"], error=None, cached=True, revision="unchanged",
+                        revision_version=stored["version"], changed_sections=[s.title for s in diff.changed])
+
+    if diff is None or diff.changed_fraction > MAX_DELTA_FRACTION:
+        result = analyze_resume_with_llm(resume_text, jd_text, api_key, use_cache=use_cache,
+                                         priority=priority, model=model)
+        mode = "first" if diff is None else "full"
+    else:
+        result = _delta_rescore(provider, model, jd_text, stored["result"], diff, priority)
+        mode = "delta"
+
+    telemetry.increment(f"revisions_{mode}")
+    version = stored["version"] + 1 if stored is not None else 1
+    if not result.get("error") and key:
+        # The new upload becomes the baseline for the next revision
+        _remember(store_key, sections, result, version)
+    result["revision"] = mode
+    result["revision_version"] = version
+    result["changed_sections"] = [section.title for section in diff.changed] if diff else []
+    return result
+
+
+def _delta_rescore(provider, model: str, jd_text: str, previous: Dict, diff: RevisionDiff,
+                   priority: int) -> Dict:
+    """One model call with the previous result and the changed sections only."""
+    problem = provider.check()
+    if problem:
+        result = _fallback_result()
+        result["error"] = problem
+        return result
+
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _build_delta_prompt(jd_text, previous, diff)}
+    ]
+    with get_telemetry().span("analysis", model=model, delta=True) as span:
+        try:
+            completion = _call_model(provider, messages, model, priority)
+            try:
+                result = _parse_llm_response(completion.content)
+            except StructuredOutputError as error:
+                completion = _call_model(provider, _retry_messages(messages, completion.content, error),
+                                         model, priority)
+                result = _parse_llm_response(completion.content, retried=True)
+        except StructuredOutputError:
+            result = _fallback_result()
+            result["error"] = "LLM returned invalid JSON. Please try again."
+        except Exception as e:
+            result = _fallback_result()
+            result["error"] = _describe_api_error(e)
+        span["outcome"] = "error" if result["error"] else "ok"
+    return result
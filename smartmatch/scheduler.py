@@ -0,0 +1,509 @@
+"""
+================================================================================
+SmartMatch AI - Rate-Limit Aware Scheduler
+================================================================================
+
+Client-side scheduler placed in front of every LLM call.
+
+- Tracks requests-per-minute and tokens-per-minute budgets locally
+- Learns the account's limits from the provider's `x-ratelimit-*` headers and
+  pauses all traffic when the provider reports an exhausted budget
+- Queues requests instead of failing them, with jittered exponential backoff
+  (or the server's `retry-after`) on 429s, timeouts and transient 5xx errors
+- Priority lanes: interactive single analyses jump ahead of bulk batch jobs,
+  and a retried request keeps its original place in its lane
+- Threads use run(); asyncio code uses run_async(), which shares the same
+  queue and budgets
+================================================================================
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+
+from smartmatch.ratelimit import SlidingWindowBudget, current_call_budget
+
+T = TypeVar("T")
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+# 0 means "no local budget" (limits are then learned from response headers)
+DEFAULT_REQUESTS_PER_MINUTE = int(os.environ.get("SMARTMATCH_RPM", "0"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.environ.get("SMARTMATCH_TPM", "0"))
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|h|m|s)")
+
+
+# =============================================================================
+# HEADER HELPERS
+# =============================================================================
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset value ("7.66s", "2m59.56s", "120ms", "3") into seconds.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if headers is None:
+        return None
+    try:
+        return headers.get(name)
+    except Exception:
+        return None
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def _error_headers(error: Exception) -> Optional[Mapping[str, str]]:
+    return getattr(getattr(error, "response", None), "headers", None)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True if the provider rejected the call with HTTP 429."""
+    return _error_status(error) == 429 or "rate_limit" in str(error).lower()
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for 429s, timeouts, connection failures and transient server errors."""
+    if _error_status(error) in RETRYABLE_STATUS_CODES or is_rate_limit_error(error):
+        return True
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class RateLimitScheduler:
+    """
+    Admission queue with budgets, priority lanes and retry/backoff.
+
+    Thread-safe: every Streamlit session and batch worker in the process can
+    share one instance (see get_scheduler()).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        learn_limits: bool = True,
+        window: float = 60.0
+    ):
+        """
+        Args:
+            requests_per_minute: Local RPM budget (0 = none)
+            tokens_per_minute: Local TPM budget (0 = learn from headers)
+            max_retries: Retries per request before the error is raised
+            base_delay: First backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+            learn_limits: Adopt the TPM limit reported by x-ratelimit-limit-tokens
+            window: Budget window in seconds; the limits above apply per window
+                (shorter windows let benchmarks build contention quickly)
+        """
+        self.window = window
+        self._requests = SlidingWindowBudget(requests_per_minute, window) if requests_per_minute else None
+        self._tokens = SlidingWindowBudget(tokens_per_minute, window) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.learn_limits = learn_limits
+
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        # Queued async tickets -> (event loop, future to resolve, tokens)
+        self._async_waiters: Dict[Tuple[int, int], Tuple[asyncio.AbstractEventLoop, asyncio.Future, int]] = {}
+        self._dispatcher: Optional[threading.Thread] = None
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "queue_wait_seconds": 0.0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Admission
+    # -------------------------------------------------------------------------
+
+    def _admission_wait(self, tokens: int) -> float:
+        """Seconds the head of the queue must still wait (0 = admit now)."""
+        wait = self._paused_until - time.monotonic()
+        if self._requests is not None:
+            wait = max(wait, self._requests.wait_time(1))
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.wait_time(tokens))
+        return wait
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Admit the head of the queue if the budgets allow it (caller holds _cond).
+
+        Returns:
+            0 once admitted, otherwise the seconds still to wait
+        """
+        wait = self._admission_wait(tokens)
+        if wait > 0:
+            return wait
+        heapq.heappop(self._queue)
+        if self._requests is not None:
+            self._requests.acquire(1)
+        if self._tokens is not None:
+            self._tokens.acquire(tokens)
+        self._in_flight += 1
+        self._cond.notify_all()
+        return 0.0
+
+    def _remove_queued(self, ticket: Tuple[int, int]) -> None:
+        # Caller holds _cond
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        self._cond.notify_all()
+
+    def _admit(self, ticket: Tuple[int, int], tokens: int) -> None:
+        """Block until `ticket` is at the head of the queue and fits the budgets."""
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self._cond.notify_all()
+            try:
+                while True:
+                    if self._queue[0] == ticket:
+                        wait = self._try_acquire(tokens)
+                        if wait <= 0:
+                            return
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                self._remove_queued(ticket)
+                raise
+
+    def _enqueue_async(self, ticket: Tuple[int, int], tokens: int,
+                       loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+        """
+        Queue an async ticket; the returned future resolves once it is admitted.
+
+        The ticket is on the heap before this returns, so it competes for its
+        place immediately instead of behind other async admissions.
+        """
+        admitted = loop.create_future()
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self._async_waiters[ticket] = (loop, admitted, tokens)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_async, name="scheduler-admit", daemon=True
+                )
+                self._dispatcher.start()
+            self._cond.notify_all()
+        return admitted
+
+    def _withdraw_async(self, ticket: Tuple[int, int]) -> None:
+        """Drop a cancelled async ticket, giving its slot back if it was already admitted."""
+        with self._cond:
+            if self._async_waiters.pop(ticket, None) is not None:
+                self._remove_queued(ticket)
+            else:
+                self._in_flight -= 1
+
+    def _dispatch_async(self) -> None:
+        """Admit async tickets whenever one reaches the head of the queue (runs forever)."""
+        with self._cond:
+            while True:
+                head = self._queue[0] if self._queue else None
+                waiter = self._async_waiters.get(head)
+                if waiter is None:
+                    # Empty queue, or a thread's ticket, which admits itself
+                    self._cond.wait()
+                    continue
+                loop, admitted, tokens = waiter
+                wait = self._try_acquire(tokens)
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                del self._async_waiters[head]
+                try:
+                    loop.call_soon_threadsafe(_resolve_admission, admitted)
+                except RuntimeError:
+                    # The event loop is closed; nobody will run the call
+                    self._in_flight -= 1
+
+    def _release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all admissions for `seconds` (e.g. after a 429)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    # -------------------------------------------------------------------------
+    # Feedback from the provider
+    # -------------------------------------------------------------------------
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Update budgets from x-ratelimit-* response headers.
+
+        Args:
+            headers: Response headers (any mapping with .get)
+        """
+        if headers is None:
+            return
+
+        limit_tokens = _header(headers, "x-ratelimit-limit-tokens")
+        if self.learn_limits and limit_tokens:
+            try:
+                limit = int(float(limit_tokens))
+            except ValueError:
+                limit = 0
+            if limit > 0:
+                with self._cond:
+                    if self._tokens is None:
+                        self._tokens = SlidingWindowBudget(limit, self.window)
+                    else:
+                        self._tokens.limit = limit
+
+        for kind in ("requests", "tokens"):
+            remaining = _header(headers, f"x-ratelimit-remaining-{kind}")
+            try:
+                exhausted = remaining is not None and float(remaining) <= 0
+            except ValueError:
+                exhausted = False
+            if exhausted:
+                reset = parse_duration(_header(headers, f"x-ratelimit-reset-{kind}"))
+                self.pause(reset if reset is not None else self.base_delay)
+
+    def _backoff_delay(self, error: Exception, attempt: int) -> float:
+        retry_after = parse_duration(_header(_error_headers(error), "retry-after"))
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        # Exponential backoff with "equal jitter"
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    def run(self, fn: Callable[[], T], tokens: int = 1,
+            priority: int = PRIORITY_BATCH) -> T:
+        """
+        Run `fn` once admitted, retrying transient failures with backoff.
+
+        If the returned object has a `headers` attribute (e.g. a raw API
+        response) it is fed to observe_headers().
+
+        Args:
+            fn: Zero-argument callable that performs the API call
+            tokens: Estimated tokens the call will consume (prompt + completion)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH (lower runs first)
+
+        Returns:
+            Whatever `fn` returns
+
+        Raises:
+            The last error once retries are exhausted, or any non-retryable error
+        """
+        budget = current_call_budget()
+        if budget is not None:
+            # Charged once per call (not per retry), see ratelimit.call_budget()
+            budget.acquire(tokens)
+
+        # The sequence number is kept across retries so a request never loses its place
+        ticket = self._submit(priority)
+
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            self._admit(ticket, tokens)
+            self._record_wait(queued_at)
+
+            try:
+                result = fn()
+            except Exception as error:
+                time.sleep(self._on_error(error, attempt))
+                attempt += 1
+                continue
+
+            return self._on_success(result)
+
+    async def run_async(self, fn: Callable[[], Awaitable[T]], tokens: int = 1,
+                        priority: int = PRIORITY_BATCH) -> T:
+        """
+        Async counterpart of run(): await `fn()` once admitted.
+
+        The ticket joins the shared queue right away and the coroutine awaits
+        its own admission, so the event loop is never blocked and an
+        interactive request is not held up behind a batch request waiting for
+        budget. Async and threaded callers share one queue and one budget.
+
+        Args:
+            fn: Zero-argument callable returning an awaitable API call
+            tokens: Estimated tokens the call will consume (prompt + completion)
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH (lower runs first)
+
+        Returns:
+            Whatever `fn()` resolves to
+
+        Raises:
+            The last error once retries are exhausted, or any non-retryable error
+        """
+        budget = current_call_budget()
+        if budget is not None:
+            while not budget.acquire(tokens, timeout=0):
+                await asyncio.sleep(budget.wait_time(tokens))
+
+        ticket = self._submit(priority)
+        loop = asyncio.get_running_loop()
+
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            admitted = self._enqueue_async(ticket, tokens, loop)
+            try:
+                await admitted
+            except asyncio.CancelledError:
+                self._withdraw_async(ticket)
+                raise
+            self._record_wait(queued_at)
+
+            try:
+                result = await fn()
+            except Exception as error:
+                await asyncio.sleep(self._on_error(error, attempt))
+                attempt += 1
+                continue
+
+            return self._on_success(result)
+
+    def _submit(self, priority: int) -> Tuple[int, int]:
+        with self._cond:
+            self._counters["submitted"] += 1
+        return (priority, next(self._sequence))
+
+    def _record_wait(self, queued_at: float) -> None:
+        with self._cond:
+            self._counters["queue_wait_seconds"] += time.monotonic() - queued_at
+
+    def _on_error(self, error: Exception, attempt: int) -> float:
+        """
+        Book-keep a failed attempt.
+
+        Returns:
+            Seconds the caller should sleep before retrying
+
+        Raises:
+            `error` itself when it is not retryable or retries are exhausted
+        """
+        self._release()
+        if not is_retryable_error(error) or attempt >= self.max_retries:
+            with self._cond:
+                self._counters["failed"] += 1
+            raise error
+
+        delay = self._backoff_delay(error, attempt)
+        with self._cond:
+            self._counters["retries"] += 1
+        if is_rate_limit_error(error):
+            with self._cond:
+                self._counters["rate_limited"] += 1
+            # The whole account is throttled, so every lane backs off
+            self.pause(delay)
+            self.observe_headers(_error_headers(error))
+            return 0.0
+        return delay
+
+    def _on_success(self, result: T) -> T:
+        self._release()
+        self.observe_headers(getattr(result, "headers", None))
+        with self._cond:
+            self._counters["completed"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of scheduler activity.
+
+        Returns:
+            dict with keys: submitted, completed, failed, retries, rate_limited,
+            queue_wait_seconds, queued, in_flight, paused_seconds
+        """
+        with self._cond:
+            snapshot = dict(self._counters)
+            snapshot["queued"] = len(self._queue)
+            snapshot["in_flight"] = self._in_flight
+            snapshot["paused_seconds"] = max(0.0, self._paused_until - time.monotonic())
+            return snapshot
+
+
+def _resolve_admission(admitted: asyncio.Future) -> None:
+    # Runs on the ticket's event loop; the waiter may have been cancelled meanwhile
+    if not admitted.done():
+        admitted.set_result(None)
+
+
+_default_scheduler: Optional[RateLimitScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """
+    Return the process-wide scheduler, creating it on first use.
+
+    Returns:
+        Shared RateLimitScheduler instance
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RateLimitScheduler()
+        return _default_scheduler
@@ -0,0 +1,463 @@
+"""
+================================================================================
+SmartMatch AI - Semantic Resume Index
+================================================================================
+
+Offline vector index for instant candidate search: given a job description,
+return the top-N resumes without any LLM (or network) call.
+
+- Embeddings: a local sentence-transformers model when one is configured
+  (SMARTMATCH_EMBEDDING_MODEL, loaded with local_files_only), otherwise a
+  hashed n-gram embedder that needs no model at all. The hashing embedder
+  folds synonyms first (ML = Machine Learning) and weights query terms by
+  inverse document frequency learned incrementally from the corpus.
+- Storage: vectors live in a memory-mapped float32 NumPy file that grows by
+  doubling, so adds are appends and never rebuild the index; document ids
+  and tombstones live in SQLite.
+- Search: exact brute-force inner product in blocks (unit vectors, so this is
+  cosine similarity); 100k resumes x 384 dims is a few tens of milliseconds.
+
+Usage:
+    python -m smartmatch.semantic_index add resumes/*.pdf archive.zip
+    python -m smartmatch.semantic_index search --jd job.txt [--top 20]
+
+Requires numpy.
+================================================================================
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from smartmatch.cache import DEFAULT_CACHE_DIR
+from smartmatch.prescore import tokenize
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_INDEX_DIR = os.path.join(DEFAULT_CACHE_DIR, "semantic_index")
+DEFAULT_HASH_DIM = 384
+DEFAULT_EMBEDDING_MODEL = os.environ.get("SMARTMATCH_EMBEDDING_MODEL", "")
+INITIAL_CAPACITY = 1024
+SEARCH_BLOCK_ROWS = 65536  # Rows scored per matrix-vector product
+BIGRAM_WEIGHT = 0.5
+
+
+class SearchHit(NamedTuple):
+    """One search result."""
+    doc_id: str
+    score: float
+
+
+# =============================================================================
+# EMBEDDERS
+# =============================================================================
+
+class HashingEmbedder:
+    """
+    Deterministic hashed bag-of-n-grams embedder (no model, no network).
+
+    Canonical terms (see prescore.tokenize) and adjacent-term bigrams are
+    hashed into `dim` signed buckets with sublinear term frequency, then
+    L2-normalized.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = DEFAULT_HASH_DIM):
+        self.dim = dim
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        cached = self._buckets.get(feature)
+        if cached is None:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            cached = (digest % self.dim, 1.0 if (digest >> 31) & 1 else -1.0)
+            if len(self._buckets) < 500_000:
+                self._buckets[feature] = cached
+        return cached
+
+    def features(self, text: str) -> Counter:
+        """Weighted n-gram features of a text."""
+        terms = tokenize(text)
+        counts = Counter(terms)
+        for first, second in zip(terms, terms[1:]):
+            counts[f"{first} {second}"] += BIGRAM_WEIGHT
+        return counts
+
+    def embed(self, text: str, bucket_weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Embed one text.
+
+        Args:
+            text: Resume or job description text
+            bucket_weights: Optional per-bucket multipliers (e.g. IDF for queries)
+
+        Returns:
+            Unit-length float32 vector (all zeros for empty text)
+        """
+        features = self.features(text)
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if features:
+            buckets, signs = zip(*(self._bucket(feature) for feature in features))
+            counts = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+            weights = np.where(counts >= 1, 1.0 + np.log(np.maximum(counts, 1)), counts)
+            np.add.at(vector, np.array(buckets), np.array(signs, dtype=np.float32) * weights)
+        if bucket_weights is not None:
+            vector *= bucket_weights
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (must already be on disk)."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu", local_files_only=True)
+        self.name = f"st:{model_name}"
+        self.dim = int(self._model.get_sentence_embedding_dimension())
+
+    def embed(self, text: str, bucket_weights: Optional[np.ndarray] = None) -> np.ndarray:
+        vector = self._model.encode([text], normalize_embeddings=True)[0]
+        return np.asarray(vector, dtype=np.float32)
+
+
+def get_embedder(model_name: Optional[str] = None):
+    """
+    Return the configured local embedding model, or the hashing embedder.
+
+    Args:
+        model_name: sentence-transformers model name or path (default
+            SMARTMATCH_EMBEDDING_MODEL); ignored if it cannot be loaded offline
+
+    Returns:
+        Embedder with .name, .dim and .embed(text)
+    """
+    model_name = DEFAULT_EMBEDDING_MODEL if model_name is None else model_name
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception:
+            pass
+    return HashingEmbedder()
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class SemanticIndex:
+    """
+    Append-only, memory-mapped vector index of resumes.
+
+    Safe to share between threads of one process; use a single writer process.
+    """
+
+    def __init__(self, path: Optional[str] = None, embedder=None):
+        """
+        Open (or create) an index directory.
+
+        Args:
+            path: Index directory, defaults to <cache dir>/semantic_index
+            embedder: Embedder to use (default get_embedder()); must match the
+                one the index was built with
+
+        Raises:
+            ValueError: If the index was built with a different embedder
+        """
+        self.path = path or DEFAULT_INDEX_DIR
+        os.makedirs(self.path, exist_ok=True)
+        self.embedder = embedder or get_embedder()
+        self.dim = self.embedder.dim
+
+        self._lock = threading.RLock()
+        self._meta_path = os.path.join(self.path, "meta.json")
+        self._vectors_path = os.path.join(self.path, "vectors.f32")
+        self._df_path = os.path.join(self.path, "df.npy")
+
+        meta = {"embedder": self.embedder.name, "dim": self.dim, "count": 0, "capacity": 0}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as handle:
+                meta = json.load(handle)
+            if meta["embedder"] != self.embedder.name or meta["dim"] != self.dim:
+                raise ValueError(
+                    f"Index at {self.path} was built with {meta['embedder']} ({meta['dim']} dims)"
+                )
+        self.count = meta["count"]
+        self._capacity = meta["capacity"]
+        self._vectors: Optional[np.memmap] = None
+        if self._capacity:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+",
+                                      shape=(self._capacity, self.dim))
+        self._df = np.load(self._df_path) if os.path.exists(self._df_path) else np.zeros(self.dim, np.int64)
+
+        self._conn = sqlite3.connect(os.path.join(self.path, "docs.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS docs (
+                row INTEGER PRIMARY KEY,
+                doc_id TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                added_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_doc_id ON docs (doc_id)")
+        self._conn.commit()
+        # Rows beyond `count` were written by an interrupted add and are ignored
+        self._conn.execute("DELETE FROM docs WHERE row >= ?", (self.count,))
+        self._conn.commit()
+        self._ids: List[str] = [""] * self.count
+        self._live = np.zeros(max(self._capacity, self.count), dtype=bool)
+        for row, doc_id, deleted in self._conn.execute("SELECT row, doc_id, deleted FROM docs"):
+            self._ids[row] = doc_id
+            self._live[row] = not deleted
+        self._rows_by_id = {doc_id: row for row, doc_id in enumerate(self._ids) if self._live[row]}
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = max(INITIAL_CAPACITY, self._capacity)
+        while capacity < needed:
+            capacity *= 2
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        with open(self._vectors_path, "ab") as handle:
+            handle.truncate(capacity * self.dim * 4)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+",
+                                  shape=(capacity, self.dim))
+        self._capacity = capacity
+        self._live = np.concatenate([self._live, np.zeros(capacity - len(self._live), dtype=bool)])
+
+    def _save_meta(self) -> None:
+        meta = {"embedder": self.embedder.name, "dim": self.dim,
+                "count": self.count, "capacity": self._capacity}
+        temp_path = self._meta_path + ".tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(meta, handle)
+        os.replace(temp_path, self._meta_path)
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """
+        Append documents; re-adding a doc_id replaces its previous vector.
+
+        Args:
+            documents: Iterable of (doc_id, resume_text)
+
+        Returns:
+            Number of documents added
+        """
+        counts_df = isinstance(self.embedder, HashingEmbedder)
+        added = 0
+        with self._lock:
+            rows = []
+            replaced: List[Tuple[str, Optional[int]]] = []
+            df_before = self._df.copy()
+            try:
+                for doc_id, text in documents:
+                    row = self.count + added
+                    self._ensure_capacity(row + 1)
+                    vector = self.embedder.embed(text)
+                    self._vectors[row] = vector
+                    if counts_df:
+                        # Buckets the document touches, for query-side IDF
+                        self._df[vector != 0] += 1
+                    previous = self._rows_by_id.get(doc_id)
+                    replaced.append((doc_id, previous))
+                    if previous is not None:
+                        self._tombstone(previous)
+                    self._live[row] = True
+                    self._rows_by_id[doc_id] = row
+                    self._ids.append(doc_id)
+                    rows.append((row, doc_id, time.time()))
+                    added += 1
+                if not added:
+                    return 0
+                self._vectors.flush()
+                self._conn.executemany("INSERT INTO docs (row, doc_id, added_at) VALUES (?, ?, ?)", rows)
+                self._conn.commit()
+                if counts_df:
+                    np.save(self._df_path, self._df)
+            except BaseException:
+                # Undo the in-memory changes; rows past `count` are ignored on disk
+                self._conn.rollback()
+                for offset, (doc_id, previous) in reversed(list(enumerate(replaced))):
+                    self._live[self.count + offset] = False
+                    if previous is None:
+                        self._rows_by_id.pop(doc_id, None)
+                    else:
+                        self._live[previous] = True
+                        self._rows_by_id[doc_id] = previous
+                del self._ids[self.count:]
+                self._df[:] = df_before
+                raise
+            # Publishing the new count last makes an interrupted add invisible
+            self.count += added
+            self._save_meta()
+        return added
+
+    def add(self, doc_id: str, text: str) -> None:
+        """
+        Append one document.
+
+        Args:
+            doc_id: Caller-chosen identifier (e.g. file name or candidate id)
+            text: Resume text (e.g. from extract_text_from_pdf)
+        """
+        self.add_many([(doc_id, text)])
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Tombstone a document so it no longer appears in results.
+
+        Returns:
+            True if the document was present
+        """
+        with self._lock:
+            row = self._rows_by_id.pop(doc_id, None)
+            if row is None:
+                return False
+            self._tombstone(row)
+            self._conn.commit()
+            if isinstance(self.embedder, HashingEmbedder):
+                np.save(self._df_path, self._df)
+            return True
+
+    def _tombstone(self, row: int) -> None:
+        """Mark a row deleted and take its buckets out of the document frequencies (uncommitted)."""
+        self._live[row] = False
+        self._conn.execute("UPDATE docs SET deleted = 1 WHERE row = ?", (row,))
+        if isinstance(self.embedder, HashingEmbedder):
+            # The replaced or removed vector is still in its memmap row
+            touched = self._vectors[row] != 0
+            self._df[touched] = np.maximum(self._df[touched] - 1, 0)
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def _query_vector(self, text: str) -> np.ndarray:
+        if isinstance(self.embedder, HashingEmbedder):
+            # Rare buckets say more about a match than ubiquitous ones
+            live = max(1, len(self._rows_by_id))
+            # Clamped so a bucket never gets a negative weight, even with stale counts
+            idf = np.maximum(np.log((1 + live) / (1 + self._df)), 0).astype(np.float32) + 1.0
+            return self.embedder.embed(text, idf)
+        return self.embedder.embed(text)
+
+    def search(self, query_text: str, top_n: int = 10) -> List[SearchHit]:
+        """
+        Find the resumes most similar to a job description.
+
+        Args:
+            query_text: Job description (or any free-text query)
+            top_n: Number of hits to return
+
+        Returns:
+            SearchHits, best first (cosine similarity)
+        """
+        with self._lock:
+            count = self.count
+            vectors = self._vectors
+            live = self._live[:count]
+            ids = self._ids
+        if count == 0 or top_n <= 0:
+            return []
+
+        query = self._query_vector(query_text)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SEARCH_BLOCK_ROWS):
+            stop = min(count, start + SEARCH_BLOCK_ROWS)
+            np.dot(vectors[start:stop], query, out=scores[start:stop])
+        scores[~live] = -np.inf
+
+        top_n = min(top_n, int(live.sum()))
+        if top_n == 0:
+            return []
+        best = np.argpartition(-scores, top_n - 1)[:top_n]
+        best = best[np.argsort(-scores[best])]
+        return [SearchHit(ids[row], float(scores[row])) for row in best]
+
+    def __len__(self) -> int:
+        return len(self._rows_by_id)
+
+    def close(self) -> None:
+        """Flush vectors and close the database."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._conn.close()
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def _iter_paths(paths: List[str]):
+    from smartmatch.batch import iter_resume_files
+
+    for path in paths:
+        files = ([os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+                 if os.path.isdir(path) else [path])
+        for file_path in sorted(files):
+            if file_path.lower().endswith((".pdf", ".zip")):
+                # Files are read in place; archive members are spooled one at a time
+                with open(file_path, "rb") as handle:
+                    yield from iter_resume_files([handle])
+
+
+def main() -> None:
+    from smartmatch.core import extract_text_from_pdf
+
+    parser = argparse.ArgumentParser(description="SmartMatch AI semantic resume index")
+    parser.add_argument("--index", default=None, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="Index PDF resumes (files, directories or ZIPs)")
+    add_parser.add_argument("paths", nargs="+")
+    search_parser = commands.add_parser("search", help="Find the best resumes for a JD")
+    search_parser.add_argument("--jd", required=True, help="Text file holding the job description")
+    search_parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    index = SemanticIndex(args.index)
+    if args.command == "add":
+        def documents():
+            for resume in _iter_paths(args.paths):
+                text, error = None, resume.error
+                if not error:
+                    text, error = extract_text_from_pdf(resume.data)
+                resume.close()
+                if error:
+                    print(f"skipped {resume.name}: {error}")
+                    continue
+                yield resume.name, text
+        added = index.add_many(documents())
+        print(f"added {added} resumes ({len(index)} indexed)")
+    else:
+        with open(args.jd, encoding="utf-8") as handle:
+            jd_text = handle.read()
+        started = time.perf_counter()
+        hits = index.search(jd_text, args.top)
+        elapsed = (time.perf_counter() - started) * 1000
+        for rank, hit in enumerate(hits, start=1):
+            print(f"{rank:3d}. {hit.score:6.3f}  {hit.doc_id}")
+        print(f"{len(hits)} hits from {len(index)} resumes in {elapsed:.1f} ms")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
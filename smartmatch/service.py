@@ -0,0 +1,497 @@
+"""
+================================================================================
+SmartMatch AI - Headless HTTP Service
+================================================================================
+
+JSON-over-HTTP front end for ATS integrations, built on the standard library
+(no web framework needed).
+
+Usage:
+    GROQ_API_KEY=gsk_... python -m smartmatch.service [--port 8080] [--workers 2]
+
+Endpoints:
+    GET  /healthz          Liveness plus job queue counts
+    GET  /metrics          Prometheus metrics: per-stage latency histograms, tokens
+                           (front end plus job workers, which report every few seconds)
+    POST /v1/analyze       Analyze one resume and wait for the result
+    POST /v1/jobs          Enqueue an analysis, returns 202 with a job id
+    GET  /v1/jobs/<id>     Job status and, once done, its result
+
+Request body (both POST endpoints):
+    {
+      "jd_text": "...",                     required
+      "resume_text": "..."                  one of resume_text /
+      "resume_pdf_base64": "...",           resume_pdf_base64
+      "candidate": "jane.pdf",              optional label echoed back
+      "use_cache": true,                    optional
+      "prescore_threshold": 10,             optional (null = always call the LLM)
+      "use_jd_profile": false,              optional
+      "model": "fast",                      optional route ("accurate", "fast") or model id
+      "cascade": false,                     optional, fast model first (ignores "model")
+      "incremental": false,                 optional, re-score only what changed since
+      "candidate_id": "ats-1234",           the candidate's last upload (id defaults
+                                            to the resume's email address)
+      "dedup": false,                       optional, reuse the result of a duplicate
+                                            resume for this JD (near-duplicates only
+                                            if the edit does not touch JD terms)
+      "quality": true                       optional, include quality checks
+    }
+
+Synchronous requests run on the HTTP server's threads (interactive lane);
+queued jobs are processed by a pool of worker processes sharing one SQLite
+job queue (batch lane). The Groq key comes from GROQ_API_KEY and never
+enters the job database. Set SMARTMATCH_SERVICE_TOKEN to require
+`Authorization: Bearer <token>` on /v1 endpoints, and SMARTMATCH_PROVIDER=mock
+to serve offline mock answers (no key or network needed). Scanned PDFs are
+OCR'd when tesseract and pdftoppm are installed (see smartmatch.ocr).
+================================================================================
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import logging
+import multiprocessing
+import os
+import re
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from smartmatch.core import analyze_resume_cascade, analyze_resume_with_llm, check_resume_quality
+from smartmatch.dedup import analyze_with_dedup
+from smartmatch.jobs import JobQueue
+from smartmatch.ocr import extract_text_with_ocr
+from smartmatch.revisions import analyze_resume_revision
+from smartmatch.scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from smartmatch.telemetry import configure_json_logging, get_telemetry, load_states, write_state
+
+logger = logging.getLogger("smartmatch.service")
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = int(os.environ.get("SMARTMATCH_WORKERS", "2"))
+# LLM calls are I/O bound, so each worker process runs several jobs at once
+DEFAULT_THREADS_PER_WORKER = int(os.environ.get("SMARTMATCH_WORKER_THREADS", "8"))
+MAX_BODY_BYTES = 20 * 1024 * 1024
+WORKER_POLL_INTERVAL = 0.05  # Seconds an idle worker waits before polling again
+TELEMETRY_FLUSH_SECONDS = 2.0  # How often workers save their metrics for /metrics
+
+_JOB_PATH = re.compile(r"^/v1/jobs/([0-9a-f]{32})$")
+
+
+# =============================================================================
+# REQUEST PROCESSING
+# =============================================================================
+
+def validate_request(payload: Any) -> Optional[str]:
+    """
+    Check an analysis request body.
+
+    Args:
+        payload: Decoded JSON body
+
+    Returns:
+        Error message, or None if the request is valid
+    """
+    if not isinstance(payload, dict):
+        return "Request body must be a JSON object."
+    jd_text = payload.get("jd_text")
+    if not isinstance(jd_text, str) or not jd_text.strip():
+        return "jd_text is required."
+    has_text = isinstance(payload.get("resume_text"), str) and payload["resume_text"].strip()
+    has_pdf = isinstance(payload.get("resume_pdf_base64"), str) and payload["resume_pdf_base64"]
+    if bool(has_text) == bool(has_pdf):
+        return "Provide exactly one of resume_text or resume_pdf_base64."
+    threshold = payload.get("prescore_threshold")
+    if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, (int, float))):
+        return "prescore_threshold must be a number or null."
+    model = payload.get("model")
+    if model is not None and (not isinstance(model, str) or not model.strip()):
+        return "model must be a non-empty string or null."
+    candidate_id = payload.get("candidate_id")
+    if candidate_id is not None and (not isinstance(candidate_id, str) or not candidate_id.strip()):
+        return "candidate_id must be a non-empty string or null."
+    if payload.get("incremental") and payload.get("cascade"):
+        return "incremental and cascade cannot be combined."
+    return None
+
+
+def run_analysis(payload: Dict[str, Any],
+                 priority: int = PRIORITY_INTERACTIVE) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Extract (if needed), analyze and quality-check one resume.
+
+    Args:
+        payload: Request body accepted by validate_request()
+        priority: Scheduler lane for the LLM call
+
+    Returns:
+        Tuple of (response_dict, error_message). Input problems (bad PDF,
+        invalid request) are returned as error_message; LLM failures are
+        reported in response_dict["analysis"]["error"], as in the dashboard.
+    """
+    error = validate_request(payload)
+    if error:
+        return None, error
+
+    started = time.perf_counter()
+    resume_text = payload.get("resume_text")
+    ocr_jobs = []
+    if not resume_text:
+        try:
+            data = base64.b64decode(payload["resume_pdf_base64"], validate=True)
+        except (binascii.Error, ValueError):
+            return None, "resume_pdf_base64 is not valid base64."
+        # Scanned PDFs are OCR'd; queued jobs wait for an OCR slot, synchronous requests fail fast
+        resume_text, error = extract_text_with_ocr(data, on_progress=ocr_jobs.append,
+                                                   block=priority == PRIORITY_BATCH)
+        if error:
+            return None, error
+
+    options = dict(
+        use_cache=bool(payload.get("use_cache", True)),
+        prescore_threshold=payload.get("prescore_threshold"),
+        priority=priority,
+        use_jd_profile=bool(payload.get("use_jd_profile", False))
+    )
+    api_key = os.environ.get("GROQ_API_KEY", "")
+
+    def analyze(resume_text: str, jd_text: str) -> Dict:
+        if payload.get("cascade"):
+            return analyze_resume_cascade(resume_text, jd_text, api_key, **options)
+        if payload.get("incremental"):
+            return analyze_resume_revision(resume_text, jd_text, api_key,
+                                           candidate=payload.get("candidate_id"),
+                                           use_cache=options["use_cache"], priority=priority,
+                                           model=payload.get("model"))
+        return analyze_resume_with_llm(resume_text, jd_text, api_key,
+                                       model=payload.get("model"), **options)
+
+    if payload.get("dedup"):
+        analysis = analyze_with_dedup(resume_text, payload["jd_text"], analyze,
+                                      label=payload.get("candidate_id") or payload.get("candidate"))
+    else:
+        analysis = analyze(resume_text, payload["jd_text"])
+    quality = check_resume_quality(resume_text) if payload.get("quality", True) else None
+    return {
+        "candidate": payload.get("candidate"),
+        "analysis": analysis,
+        "quality": quality,
+        # True when OCR ran out of time and only some pages were analyzed
+        "ocr_partial": bool(ocr_jobs) and ocr_jobs[-1].partial,
+        "seconds": round(time.perf_counter() - started, 3),
+    }, None
+
+
+# =============================================================================
+# WORKER POOL
+# =============================================================================
+
+def _worker_loop(queue: JobQueue, stop_event, poll_interval: float, parent_pid: int) -> None:
+    """Claim, run and record jobs until stopped."""
+    # Also exit if the service process died without stopping the pool
+    while not stop_event.is_set() and os.getppid() == parent_pid:
+        job = queue.claim()
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        try:
+            with queue.lease(job):
+                response, error = run_analysis(job.payload, priority=PRIORITY_BATCH)
+        except Exception as e:
+            logger.exception("Job %s crashed", job.id)
+            response, error = None, f"Unexpected error: {str(e)[:200]}"
+        if error:
+            recorded = queue.fail(job.id, error, attempt=job.attempts)
+        else:
+            recorded = queue.complete(job.id, response, attempt=job.attempts)
+        if not recorded:
+            logger.warning("Job %s was reclaimed by another worker; attempt %d dropped",
+                           job.id, job.attempts)
+
+
+def telemetry_dir(queue_path: str) -> str:
+    """Directory where the workers of a job queue save their metrics."""
+    return queue_path + ".telemetry"
+
+
+def _flush_telemetry(directory: str, stop_event) -> None:
+    """Save this worker's metrics every few seconds until stopped."""
+    while not stop_event.wait(TELEMETRY_FLUSH_SECONDS):
+        try:
+            write_state(directory)
+        except OSError:
+            logger.exception("Could not save worker metrics")
+
+
+def _worker_main(queue_path: str, stop_event, poll_interval: float, threads: int) -> None:
+    """Worker process entry point: run `threads` job loops over one queue connection."""
+    # Ctrl-C is handled by the parent, which then sets stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if os.environ.get("SMARTMATCH_JSON_LOGS") == "1":
+        configure_json_logging()
+    parent_pid = os.getppid()
+    queue = JobQueue(queue_path)
+    loops = [
+        threading.Thread(target=_worker_loop, args=(queue, stop_event, poll_interval, parent_pid),
+                         name=f"job-loop-{index}")
+        for index in range(threads)
+    ]
+    # Analyses run here, so /metrics in the front end needs this process's numbers
+    flusher = threading.Thread(target=_flush_telemetry, args=(telemetry_dir(queue_path), stop_event),
+                               name="telemetry-flush", daemon=True)
+    flusher.start()
+    for loop in loops:
+        loop.start()
+    for loop in loops:
+        loop.join()
+    queue.close()
+    write_state(telemetry_dir(queue_path))
+
+
+class WorkerPool:
+    """
+    Supervised pool of job worker processes.
+
+    Workers are regular (non-daemon) processes so each can run its own PDF
+    extraction process pool; dead workers are restarted.
+    """
+
+    def __init__(self, queue_path: str, workers: int = DEFAULT_WORKERS,
+                 threads_per_worker: int = DEFAULT_THREADS_PER_WORKER,
+                 poll_interval: float = WORKER_POLL_INTERVAL):
+        """
+        Args:
+            queue_path: SQLite job queue shared with the HTTP front end
+            workers: Number of worker processes
+            threads_per_worker: Jobs each worker process runs concurrently
+            poll_interval: Seconds an idle worker sleeps between polls
+        """
+        self.queue_path = queue_path
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes: List[multiprocessing.Process] = []
+        self._supervisor: Optional[threading.Thread] = None
+
+    def _spawn(self) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.queue_path, self._stop_event, self.poll_interval, self.threads_per_worker),
+            name="smartmatch-worker"
+        )
+        process.start()
+        return process
+
+    def _supervise(self) -> None:
+        while not self._stop_event.wait(1.0):
+            for index, process in enumerate(self._processes):
+                if not process.is_alive():
+                    logger.warning("Worker %s exited (code %s); restarting", process.pid, process.exitcode)
+                    self._processes[index] = self._spawn()
+
+    def start(self) -> None:
+        """Start the worker processes and their supervisor thread."""
+        # Metrics left by a previous run of the service start from zero again
+        directory = telemetry_dir(self.queue_path)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.startswith("telemetry-"):
+                    os.remove(os.path.join(directory, name))
+        self._processes = [self._spawn() for _ in range(self.workers)]
+        self._supervisor = threading.Thread(target=self._supervise, name="worker-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask workers to finish their current job, then stop them."""
+        self._stop_event.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+
+
+# =============================================================================
+# HTTP FRONT END
+# =============================================================================
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Routes requests to the analysis core and the job queue."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive for high-volume clients
+    disable_nagle_algorithm = True
+    server_version = "SmartMatch/1.0"
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, status: int, text: str, content_type: str) -> None:
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token or not self.path.startswith("/v1/"):
+            return True
+        if self.headers.get("Authorization", "") == f"Bearer {token}":
+            return True
+        self._send_json(401, {"error": "Missing or invalid bearer token."})
+        return False
+
+    def _read_json(self) -> Tuple[Any, Optional[str]]:
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            return None, "Invalid Content-Length."
+        if length > MAX_BODY_BYTES:
+            return None, "Request body too large."
+        try:
+            return json.loads(self.rfile.read(length) or b"null"), None
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None, "Request body is not valid JSON."
+
+    # -------------------------------------------------------------------------
+    # Routes
+    # -------------------------------------------------------------------------
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok", "jobs": self.server.queue.stats()})
+            return
+        if self.path == "/metrics":
+            worker_states = load_states(telemetry_dir(self.server.queue.path))
+            self._send_text(200, get_telemetry().render_prometheus(worker_states),
+                            "text/plain; version=0.0.4")
+            return
+        match = _JOB_PATH.match(self.path)
+        if match:
+            job = self.server.queue.get(match.group(1))
+            if job is None:
+                self._send_json(404, {"error": "Unknown job id."})
+            else:
+                self._send_json(200, job)
+            return
+        self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return
+        if self.path not in ("/v1/analyze", "/v1/jobs"):
+            self._send_json(404, {"error": "Not found."})
+            return
+
+        payload, error = self._read_json()
+        if error:
+            status = 413 if error == "Request body too large." else 400
+            self.close_connection = True
+            self._send_json(status, {"error": error})
+            return
+
+        if self.path == "/v1/jobs":
+            error = validate_request(payload)
+            if error:
+                self._send_json(400, {"error": error})
+                return
+            job_id = self.server.queue.enqueue(payload)
+            self._send_json(202, {"job_id": job_id, "status": "queued", "url": f"/v1/jobs/{job_id}"})
+            return
+
+        response, error = run_analysis(payload, priority=PRIORITY_INTERACTIVE)
+        if error:
+            self._send_json(400, {"error": error})
+        else:
+            self._send_json(200, response)
+
+
+class SmartMatchServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the shared job queue."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], queue: JobQueue, token: Optional[str] = None):
+        super().__init__(address, ServiceHandler)
+        self.queue = queue
+        self.token = token
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def _raise_keyboard_interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SmartMatch AI headless service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Job worker processes (0 = only serve /v1/analyze and enqueue)")
+    parser.add_argument("--threads-per-worker", type=int, default=DEFAULT_THREADS_PER_WORKER)
+    parser.add_argument("--queue", default=None, help="Job queue SQLite path")
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--json-logs", action="store_true",
+                        default=os.environ.get("SMARTMATCH_JSON_LOGS") == "1",
+                        help="Log every pipeline span as a JSON line on stderr")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.json_logs:
+        configure_json_logging()
+        os.environ["SMARTMATCH_JSON_LOGS"] = "1"  # Inherited by the spawned workers
+    if not os.environ.get("GROQ_API_KEY"):
+        logger.warning("GROQ_API_KEY is not set; analyses will return a configuration error")
+
+    queue = JobQueue(args.queue)
+    pool = WorkerPool(queue.path, args.workers, args.threads_per_worker)
+    server = SmartMatchServer((args.host, args.port), queue, os.environ.get("SMARTMATCH_SERVICE_TOKEN"))
+    pool.start()
+    # Shut down the same way on SIGTERM (e.g. from a process manager) as on Ctrl-C
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    logger.info("Listening on http://%s:%d with %d worker process(es) x %d thread(s)",
+                args.host, server.server_address[1], args.workers, args.threads_per_worker)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.stop()
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+================================================================================
+SmartMatch AI - Incremental JSON Parsing
+================================================================================
+
+Parses the model's JSON answer while it is still streaming, so the UI can show
+`match_percentage` as soon as it arrives and render `missing_keywords` and
+`profile_summary` progressively instead of waiting for the full completion.
+
+Only the top-level object is tracked field by field:
+- Completed values are exposed in `fields`
+- In-progress strings are exposed as their decoded prefix in `partial`
+- In-progress arrays are exposed as the list of completed items in `partial`
+
+Text before the opening brace (e.g. a markdown fence) and after the closing
+brace is ignored.
+================================================================================
+"""
+
+import json
+from typing import Any, Dict, Optional, Set
+
+
+def _decode_partial_string(raw: str) -> str:
+    """Decode the body of an unterminated JSON string, dropping a dangling escape."""
+    for cut in range(0, 6):
+        candidate = raw[:len(raw) - cut] if cut else raw
+        try:
+            return json.loads('"' + candidate + '"')
+        except ValueError:
+            continue
+    return raw
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for a flat JSON object whose values may be arrays.
+
+    Usage:
+        parser = IncrementalJSONParser()
+        for chunk in stream:
+            updated = parser.feed(chunk)
+            if "match_percentage" in parser.fields: ...
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.partial: Dict[str, Any] = {}
+        self.done = False
+
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"         # key | colon | value | comma
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._value_kind: Optional[str] = None  # string | array | object | scalar
+        self._item_start: Optional[int] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the completed value for `key`, else its partial value, else default."""
+        if key in self.fields:
+            return self.fields[key]
+        return self.partial.get(key, default)
+
+    # -------------------------------------------------------------------------
+    # Value bookkeeping
+    # -------------------------------------------------------------------------
+
+    def _complete_value(self, raw: str, updated: Set[str]) -> None:
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw.strip()
+        self.fields[self._key] = value
+        self.partial.pop(self._key, None)
+        updated.add(self._key)
+        self._expect = "comma"
+        self._value_start = None
+        self._value_kind = None
+        self._item_start = None
+
+    def _complete_item(self, raw: str, updated: Set[str]) -> None:
+        raw = raw.strip()
+        self._item_start = None
+        if not raw:
+            return
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            item = raw
+        self.partial.setdefault(self._key, []).append(item)
+        updated.add(self._key)
+
+    # -------------------------------------------------------------------------
+    # Feeding
+    # -------------------------------------------------------------------------
+
+    def feed(self, chunk: str) -> Set[str]:
+        """
+        Consume the next piece of streamed text.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Set of top-level keys whose completed or partial value changed
+        """
+        updated: Set[str] = set()
+        if self.done or not chunk:
+            return updated
+
+        self._text += chunk
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._on_string_end(i, updated)
+                continue
+
+            if self._depth == 0:
+                if c == "{":
+                    self._depth = 1
+                    self._expect = "key"
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = i
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._value_kind = "string"
+                    self.partial[self._key] = ""
+                elif self._depth == 2 and self._value_kind == "array" and self._item_start is None:
+                    self._item_start = i
+            elif c in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._value_kind = "array" if c == "[" else "object"
+                    if c == "[":
+                        self.partial[self._key] = []
+                elif self._depth == 2 and self._value_kind == "array" and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+            elif c in "}]":
+                if self._depth == 1:
+                    # Closing the top-level object
+                    if self._value_kind == "scalar":
+                        self._complete_value(text[self._value_start:i], updated)
+                    self._depth = 0
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 1:
+                    if self._value_kind == "array" and self._item_start is not None:
+                        self._complete_item(text[self._item_start:i], updated)
+                    self._complete_value(text[self._value_start:i + 1], updated)
+                elif self._depth == 2 and self._value_kind == "array" and self._item_start is not None:
+                    self._complete_item(text[self._item_start:i + 1], updated)
+            elif c == ":" and self._depth == 1:
+                self._expect = "value"
+            elif c == ",":
+                if self._depth == 1:
+                    if self._value_kind == "scalar":
+                        self._complete_value(text[self._value_start:i], updated)
+                    self._expect = "key"
+                elif self._depth == 2 and self._value_kind == "array" and self._item_start is not None:
+                    self._complete_item(text[self._item_start:i], updated)
+            elif not c.isspace():
+                if self._depth == 1 and self._expect == "value" and self._value_start is None:
+                    self._value_start = i
+                    self._value_kind = "scalar"
+                elif self._depth == 2 and self._value_kind == "array" and self._item_start is None:
+                    self._item_start = i
+
+        self._pos = len(text)
+
+        # Expose the decoded prefix of a string value that is still streaming
+        if self._in_string and self._depth == 1 and self._value_kind == "string":
+            prefix = _decode_partial_string(text[self._value_start + 1:])
+            if prefix != self.partial.get(self._key):
+                self.partial[self._key] = prefix
+                updated.add(self._key)
+
+        return updated
+
+    def _on_string_end(self, i: int, updated: Set[str]) -> None:
+        text = self._text
+        if self._depth == 1 and self._expect == "key":
+            try:
+                self._key = json.loads(text[self._key_start:i + 1])
+            except ValueError:
+                self._key = text[self._key_start + 1:i]
+            self._expect = "colon"
+        elif self._depth == 1 and self._value_kind == "string":
+            self._complete_value(text[self._value_start:i + 1], updated)
+        elif self._depth == 2 and self._value_kind == "array" and self._item_start is not None:
+            self._complete_item(text[self._item_start:i + 1], updated)
@@ -0,0 +1,309 @@
+"""
+================================================================================
+SmartMatch AI - Structured Output
+================================================================================
+
+Parsing and validation of the model's JSON answers:
+
+- parse_json_lenient(text): strict `json` fast path (text around the value,
+  such as a markdown fence or a trailing remark, is skipped); otherwise a
+  single-pass tolerant parser that accepts single-quoted strings, Python
+  literals, trailing commas and bare words, and closes strings, arrays and
+  objects left open by a truncated (e.g. max_tokens) completion
+- validate(value, schema): checks and coerces one object against a small
+  declarative schema (ANALYSIS_SCHEMA for analysis answers)
+- parse_analysis(text): both; raises StructuredOutputError listing what is
+  wrong (including a truncated answer), which the core turns into one
+  targeted retry prompt
+================================================================================
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from smartmatch.streaming import _decode_partial_string
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+# Field -> rules; "required" fields make the answer unusable when missing
+ANALYSIS_SCHEMA: Dict[str, Dict[str, Any]] = {
+    "match_percentage": {"type": "integer", "required": True, "minimum": 0, "maximum": 100},
+    "missing_keywords": {"type": "array", "default": [], "max_items": 10},
+    "profile_summary": {"type": "string", "default": "Analysis completed.", "max_length": 500},
+}
+
+_DECODER = json.JSONDecoder()
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_BARE_WORD_END = ",:}]\n"
+
+
+class StructuredOutputError(ValueError):
+    """The model's answer could not be turned into a valid result."""
+
+    def __init__(self, problems: List[str]):
+        """
+        Args:
+            problems: Human-readable problems (also sent back in the retry prompt)
+        """
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+# =============================================================================
+# TOLERANT PARSING
+# =============================================================================
+
+class _LenientParser:
+    """Recursive-descent parser for almost-JSON; never backtracks."""
+
+    def __init__(self, text: str, pos: int):
+        self.text = text
+        self.pos = pos
+        self.truncated = False
+
+    def _skip_whitespace(self) -> None:
+        text = self.text
+        while self.pos < len(text) and text[self.pos].isspace():
+            self.pos += 1
+
+    def _at_end(self) -> bool:
+        self._skip_whitespace()
+        return self.pos >= len(self.text)
+
+    def value(self) -> Any:
+        if self._at_end():
+            self.truncated = True
+            return None
+        c = self.text[self.pos]
+        if c == "{":
+            return self._object()
+        if c == "[":
+            return self._array()
+        if c in "\"'":
+            return self._string(c)
+        return self._scalar()
+
+    def _string(self, quote: str) -> str:
+        text = self.text
+        start = self.pos + 1
+        i = start
+        while i < len(text):
+            if text[i] == "\\":
+                i += 2
+                continue
+            if text[i] == quote:
+                break
+            i += 1
+        body = text[start:min(i, len(text))]
+        if quote == "'":
+            body = body.replace("\\'", "'").replace('"', '\\"')
+        if i >= len(text):
+            # Unterminated: keep the decodable prefix
+            self.truncated = True
+            self.pos = len(text)
+            return _decode_partial_string(body)
+        self.pos = i + 1
+        try:
+            return json.loads('"' + body + '"')
+        except ValueError:
+            return body
+
+    def _scalar(self) -> Any:
+        text = self.text
+        number = _NUMBER.match(text, self.pos)
+        if number:
+            self.pos = number.end()
+            raw = number.group()
+            return float(raw) if any(c in raw for c in ".eE") else int(raw)
+        end = self.pos
+        while end < len(text) and text[end] not in _BARE_WORD_END:
+            end += 1
+        word = text[self.pos:end].strip()
+        if not word:
+            raise ValueError(f"unexpected {text[self.pos]!r} at position {self.pos}")
+        self.pos = end
+        return _LITERALS.get(word, word)
+
+    def _object(self) -> Dict[str, Any]:
+        self.pos += 1
+        result: Dict[str, Any] = {}
+        while not self._at_end():
+            c = self.text[self.pos]
+            if c == "}":
+                self.pos += 1
+                return result
+            if c == ",":
+                self.pos += 1
+                continue
+            key = self._string(c) if c in "\"'" else self._scalar()
+            if self._at_end() or self.truncated:
+                break
+            if self.text[self.pos] != ":":
+                raise ValueError(f"expected ':' after key {key!r}")
+            self.pos += 1
+            if self._at_end():
+                break
+            result[str(key)] = self.value()
+            if self.truncated:
+                return result
+        self.truncated = True
+        return result
+
+    def _array(self) -> List[Any]:
+        self.pos += 1
+        items: List[Any] = []
+        while not self._at_end():
+            c = self.text[self.pos]
+            if c == "]":
+                self.pos += 1
+                return items
+            if c == ",":
+                self.pos += 1
+                continue
+            item = self.value()
+            if self.truncated:
+                # A cut-off item (e.g. half a keyword) is dropped
+                if isinstance(item, (dict, list)):
+                    items.append(item)
+                return items
+            items.append(item)
+        self.truncated = True
+        return items
+
+
+def parse_json_lenient(text: str, openers: str = "{[",
+                       allow_truncated: bool = True) -> Tuple[Any, bool]:
+    """
+    Parse the first JSON value in a model answer.
+
+    Args:
+        text: Raw model output
+        openers: Characters that may start the value, e.g. "{" for an object
+        allow_truncated: Close values left open by a cut-off answer; if False
+            such an answer is rejected instead
+
+    Returns:
+        Tuple of (value, repaired); repaired is True if the strict parser
+        failed and the tolerant one was needed
+
+    Raises:
+        StructuredOutputError: If no value can be recovered
+    """
+    positions = [index for index in (text.find(opener) for opener in openers) if index >= 0]
+    if not positions:
+        raise StructuredOutputError(["the answer contains no JSON"])
+    start = min(positions)
+    try:
+        return _DECODER.raw_decode(text, start)[0], False
+    except ValueError:
+        pass
+    parser = _LenientParser(text, start)
+    try:
+        value = parser.value()
+    except ValueError as error:
+        raise StructuredOutputError([f"the answer is not valid JSON ({error})"])
+    if parser.truncated and not allow_truncated:
+        raise StructuredOutputError(["the answer was cut off before the JSON object was complete"])
+    return value, True
+
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+def _coerce_integer(value: Any, rules: Dict[str, Any]) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        number = _NUMBER.search(value)
+        value = float(number.group()) if number else None
+    if not isinstance(value, (int, float)):
+        return None
+    return int(min(rules.get("maximum", value), max(rules.get("minimum", value), value)))
+
+
+def _coerce_array(value: Any, rules: Dict[str, Any]) -> Optional[List[str]]:
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(",") if part.strip()]
+    if not isinstance(value, (list, tuple)):
+        return None
+    return [str(item) for item in value if item is not None][:rules.get("max_items")]
+
+
+def _coerce_string(value: Any, rules: Dict[str, Any]) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return str(value)[:rules.get("max_length")]
+
+
+_COERCERS = {"integer": _coerce_integer, "array": _coerce_array, "string": _coerce_string}
+
+
+def validate(value: Any, schema: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Check one object against a schema, coercing near-misses (e.g. "85%").
+
+    Keys not in the schema are kept as they are. An invalid optional field
+    falls back to its default; an invalid required field is a problem.
+
+    Args:
+        value: Parsed answer
+        schema: Field -> rules (type, required, default, minimum, maximum,
+            max_items, max_length)
+
+    Returns:
+        Tuple of (validated dict, problems); the answer is usable if problems is empty
+    """
+    if not isinstance(value, dict):
+        return {}, [f"expected a JSON object, got {type(value).__name__}"]
+    result = dict(value)
+    problems = []
+    for field, rules in schema.items():
+        coerced = None
+        if field in value:
+            coerced = _COERCERS[rules["type"]](value[field], rules)
+        if coerced is not None:
+            result[field] = coerced
+        elif rules.get("required"):
+            state = "missing" if field not in value else f"not a valid {rules['type']}"
+            problems.append(f'"{field}" is {state}')
+        else:
+            result[field] = list(rules["default"]) if isinstance(rules["default"], list) else rules["default"]
+    return result, problems
+
+
+def validate_analysis(value: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Validate one analysis object against ANALYSIS_SCHEMA.
+
+    Returns:
+        Tuple of (result with error=None and cached=False, problems)
+    """
+    result, problems = validate(value, ANALYSIS_SCHEMA)
+    result["error"] = None
+    result["cached"] = False
+    return result, problems
+
+
+def parse_analysis(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Parse and validate the model's analysis answer.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Tuple of (result, repaired)
+
+    Raises:
+        StructuredOutputError: If the answer is unusable
+    """
+    # A cut-off answer may have lost fields; reject it so the caller retries
+    value, repaired = parse_json_lenient(text, "{", allow_truncated=False)
+    result, problems = validate_analysis(value)
+    if problems:
+        raise StructuredOutputError(problems)
+    return result, repaired
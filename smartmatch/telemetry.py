@@ -0,0 +1,359 @@
+"""
+================================================================================
+SmartMatch AI - Telemetry
+================================================================================
+
+Per-stage timing spans for the analysis pipeline, kept in-process:
+
+- Stages: pdf_extract, prepare (pre-score, prompt packing, cache lookup),
+  queue_wait (rate-limit scheduler, incl. retry backoff), llm_call (provider
+  round trip incl. generation), ttfb (first streamed token), parse, analysis
+  (end to end) and quality_check
+- Every span updates a Prometheus-style histogram and a rolling window used
+  for p50/p95 (dashboard admin panel, GET /metrics on the headless service)
+- Spans are also logged as one JSON object per line on the
+  "smartmatch.telemetry" logger (DEBUG); see configure_json_logging()
+
+Numbers are kept per process. Service worker processes periodically write
+theirs to a shared directory (write_state()), and the front end's /metrics
+adds them to its own (load_states()), so queued jobs are exported too.
+================================================================================
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+ROLLING_WINDOW = 1000  # Recent samples per stage kept for percentiles
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = "smartmatch"
+
+logger = logging.getLogger("smartmatch.telemetry")
+
+
+class _StageStats:
+    """Counters and recent samples for one stage."""
+
+    __slots__ = ("count", "errors", "total_seconds", "bucket_counts", "recent")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * len(HISTOGRAM_BUCKETS)
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Telemetry:
+    """Thread-safe registry of stage timings and token counts."""
+
+    def __init__(self, window: int = ROLLING_WINDOW):
+        """
+        Args:
+            window: Recent samples per stage used for p50/p95
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageStats] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}  # (model, kind) -> tokens
+        self._counters: Dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float, error: bool = False, **attributes: Any) -> None:
+        """
+        Record one completed stage.
+
+        Args:
+            stage: Stage name (e.g. "llm_call")
+            seconds: Duration
+            error: Whether the stage failed
+            **attributes: Extra fields for the JSON log line (model, tokens, ...)
+        """
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats(self.window)
+            stats.count += 1
+            stats.errors += bool(error)
+            stats.total_seconds += seconds
+            for index, bound in enumerate(HISTOGRAM_BUCKETS):
+                if seconds <= bound:
+                    stats.bucket_counts[index] += 1
+                    break
+            stats.recent.append(seconds)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            event = {"ts": round(time.time(), 3), "stage": stage, "ms": round(seconds * 1000, 2)}
+            if error:
+                event["error"] = True
+            event.update(attributes)
+            logger.debug(json.dumps(event, default=str))
+
+    @contextlib.contextmanager
+    def span(self, stage: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block as one stage.
+
+        The yielded dict can be filled with attributes while the block runs;
+        an exception marks the span as failed and is re-raised.
+
+        Args:
+            stage: Stage name
+            **attributes: Initial attributes for the JSON log line
+        """
+        started = time.perf_counter()
+        error = False
+        try:
+            yield attributes
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - started, error=error, **attributes)
+
+    def add_tokens(self, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """Count tokens used by one model call."""
+        with self._lock:
+            for kind, tokens in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                key = (model, kind)
+                self._tokens[key] = self._tokens.get(key, 0) + int(tokens or 0)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Bump a plain counter (exported as <prefix>_<name>_total)."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counters(self) -> Dict[str, int]:
+        """Current values of the plain counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Rolling statistics per stage.
+
+        Returns:
+            dict of stage -> {count, errors, p50_ms, p95_ms, mean_ms}; count and
+            errors are totals, the timings cover the rolling window
+        """
+        with self._lock:
+            stages = {name: (stats.count, stats.errors, sorted(stats.recent))
+                      for name, stats in self._stages.items()}
+        report = {}
+        for name, (count, errors, ordered) in sorted(stages.items()):
+            if not ordered:
+                continue
+            report[name] = {
+                "count": count,
+                "errors": errors,
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            }
+        return report
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Cumulative histograms and counters as a JSON-serializable dict.
+
+        Returns:
+            dict with keys: stages (name -> count, errors, sum, buckets),
+            tokens ([model, kind, count] triples) and counters
+        """
+        with self._lock:
+            return {
+                "stages": {name: {"count": stats.count, "errors": stats.errors,
+                                  "sum": stats.total_seconds, "buckets": list(stats.bucket_counts)}
+                           for name, stats in self._stages.items()},
+                "tokens": [[model, kind, count] for (model, kind), count in self._tokens.items()],
+                "counters": dict(self._counters),
+            }
+
+    def render_prometheus(self, other_states: Iterable[Dict[str, Any]] = ()) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            other_states: export_state() dicts of other processes (e.g. service
+                workers) to add to this process's numbers
+
+        Returns:
+            Text for a /metrics response
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        tokens: Dict[Tuple[str, str], int] = {}
+        counters: Dict[str, int] = {}
+        for state in [self.export_state(), *other_states]:
+            for stage, stats in state["stages"].items():
+                total = stages.setdefault(stage, {"count": 0, "errors": 0, "sum": 0.0,
+                                                  "buckets": [0] * len(HISTOGRAM_BUCKETS)})
+                total["count"] += stats["count"]
+                total["errors"] += stats["errors"]
+                total["sum"] += stats["sum"]
+                total["buckets"] = [a + b for a, b in zip(total["buckets"], stats["buckets"])]
+            for model, kind, count in state["tokens"]:
+                tokens[(model, kind)] = tokens.get((model, kind), 0) + count
+            for counter, value in state["counters"].items():
+                counters[counter] = counters.get(counter, 0) + value
+
+        name = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines = [f"# HELP {name} Duration of analysis pipeline stages.", f"# TYPE {name} histogram"]
+        for stage, stats in sorted(stages.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(HISTOGRAM_BUCKETS, stats["buckets"]):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+
+        errors_name = f"{METRIC_PREFIX}_stage_errors_total"
+        lines += [f"# HELP {errors_name} Failed pipeline stages.", f"# TYPE {errors_name} counter"]
+        lines += [f'{errors_name}{{stage="{stage}"}} {stats["errors"]}' for stage, stats in sorted(stages.items())]
+
+        tokens_name = f"{METRIC_PREFIX}_llm_tokens_total"
+        lines += [f"# HELP {tokens_name} Tokens used by LLM calls.", f"# TYPE {tokens_name} counter"]
+        lines += [f'{tokens_name}{{model="{model}",kind="{kind}"}} {count}'
+                  for (model, kind), count in sorted(tokens.items())]
+
+        for counter, value in sorted(counters.items()):
+            counter_name = f"{METRIC_PREFIX}_{counter}_total"
+            lines += [f"# TYPE {counter_name} counter", f"{counter_name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded data."""
+        with self._lock:
+            self._stages.clear()
+            self._tokens.clear()
+            self._counters.clear()
+
+
+class CallTimer:
+    """
+    Splits a scheduled model call into queue wait and call time.
+
+    Usage:
+        timer = CallTimer()
+        result = scheduler.run(timer.wrap(lambda: provider.complete(...)), ...)
+        timer.finish(model=...)
+    """
+
+    def __init__(self, telemetry: "Telemetry"):
+        self.telemetry = telemetry
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished = False
+
+    def wrap(self, fn):
+        """Return `fn` instrumented to note when each attempt starts."""
+        def timed():
+            self.started = time.perf_counter()
+            return fn()
+        return timed
+
+    def finish(self, error: bool = False, **attributes: Any) -> None:
+        """Record queue_wait (until the last attempt started) and llm_call, once."""
+        if self.finished:
+            return
+        self.finished = True
+        now = time.perf_counter()
+        started = self.started if self.started is not None else now
+        self.telemetry.record("queue_wait", started - self.submitted)
+        if self.started is not None:
+            self.telemetry.record("llm_call", now - started, error=error, **attributes)
+
+
+_default_telemetry: Optional[Telemetry] = None
+_default_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """
+    Return the process-wide telemetry registry, creating it on first use.
+
+    Returns:
+        Shared Telemetry instance
+    """
+    global _default_telemetry
+    with _default_telemetry_lock:
+        if _default_telemetry is None:
+            _default_telemetry = Telemetry()
+        return _default_telemetry
+
+
+# =============================================================================
+# MULTI-PROCESS EXPORT
+# =============================================================================
+
+def write_state(directory: str, telemetry: Optional[Telemetry] = None) -> None:
+    """
+    Save this process's cumulative metrics as <directory>/telemetry-<pid>.json.
+
+    Args:
+        directory: Directory shared with the process serving /metrics
+        telemetry: Registry to save, defaults to get_telemetry()
+    """
+    os.makedirs(directory, exist_ok=True)
+    state = (telemetry or get_telemetry()).export_state()
+    path = os.path.join(directory, f"telemetry-{os.getpid()}.json")
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle)
+    os.replace(temp_path, path)
+
+
+def load_states(directory: str) -> List[Dict[str, Any]]:
+    """
+    Metrics saved by other processes with write_state().
+
+    Files of exited processes are kept, so their counts never go backwards.
+
+    Args:
+        directory: Directory the worker processes write to
+
+    Returns:
+        export_state() dicts (this process's own file is skipped)
+    """
+    states = []
+    own = f"telemetry-{os.getpid()}.json"
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return states
+    for name in sorted(names):
+        if not name.startswith("telemetry-") or not name.endswith(".json") or name == own:
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as handle:
+                states.append(json.load(handle))
+        except (OSError, ValueError):
+            continue  # Removed or being replaced right now
+    return states
+
+
+def configure_json_logging(stream: Optional[TextIO] = None) -> None:
+    """
+    Write every span as a bare JSON line (no log prefix) to `stream`.
+
+    Args:
+        stream: Output stream, defaults to stderr
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
